@@ -3,6 +3,35 @@ import os
 import sys
 import time
 import json
+import math
+import itertools
+import bisect
+import calendar
+import csv
+import argparse
+import ast
+import atexit
+import cProfile
+import pstats
+import io
+import hashlib
+import gzip
+import lzma
+import tempfile
+import marshal
+import mmap
+import re
+import textwrap
+import select
+import threading
+import signal
+import shutil
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
 from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, font as tkFont, scrolledtext # Import scrolledtext
@@ -81,34 +110,184 @@ except ImportError:
     COLOR_WELCOME_BORDER, COLOR_WELCOME_TEXT, COLOR_WELCOME_TITLE = "", "", ""
     COLOR_RESET = ""
 
+# --- NumPy Setup (Trend Analytics) ---
+try:
+    import numpy as np
+except ImportError:
+    np = None # Trend analytics are skipped; the rest of the game does not need NumPy
+
+# --- Raw Terminal Setup (Single-Keypress CLI Input) ---
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = tty = None # Not available on Windows; the CLI keeps using input()
+
+# --- Curses Setup (Full-Screen CLI) ---
+try:
+    import curses
+except ImportError:
+    curses = None # e.g. Windows without windows-curses; the 'curses' interface is unavailable
+
 # --- Constants ---
-HISTORY_FILE = "linux_plus_history.json"
+HISTORY_FILE = "linux_plus_history.jsonl"
+# Streaming history layout: one JSON header line (totals, categories, review list, record index), then one line per question
+HISTORY_STREAM_FORMAT = "linux_plus_history_stream"
+HISTORY_STREAM_VERSION = 1
+HISTORY_STREAM_PREFIX = ('{"format":"%s"' % HISTORY_STREAM_FORMAT).encode('utf-8') # Start of every header save_history writes
+# Single-document history that d2.py-dV7 read and write with json.load/json.dump: imported, never overwritten
+LEGACY_HISTORY_FILE = "linux_plus_history.json"
+# ID-keyed history layout written by --migrate-history --migrate-schema ids (same line layout, keyed by hash ID)
+HISTORY_IDS_FORMAT = "linux_plus_history_ids"
+HISTORY_IDS_VERSION = 1
+MIGRATE_SCHEMAS = ["current", "ids"]
+MIGRATE_CHUNK_CHARS = 1 << 20 # Characters read per step while streaming a single-document JSON history
+# Compressed history/export files: codec chosen by setting or extension, detected by magic bytes on read
+HISTORY_CODECS = {"none": None, "gzip": gzip, "lzma": lzma}
+HISTORY_CODEC_EXTENSIONS = {".gz": "gzip", ".xz": "lzma", ".lzma": "lzma"}
+HISTORY_CODEC_LEVELS = {"gzip": 6, "lzma": 1} # Save speed matters more than the last few percent of size
+CODEC_MAGIC = {b"\x1f\x8b": "gzip", b"\xfd7zXZ\x00": "lzma"}
+CODEC_BENCHMARK_QUESTIONS = 20000 # Synthetic history size for --codec-benchmark
+CODEC_BENCHMARK_ATTEMPTS = 25 # Attempts recorded per synthetic question
+# Attempt-log export: one row per recorded attempt, as CSV or a chunked columnar binary file
+ATTEMPT_EXPORT_COLUMNS = ("question_id", "category", "timestamp", "correct", "time")
+ATTEMPT_EXPORT_CHUNK_ROWS = 50000 # Rows built and written per step; the full table is never held in memory
+ATTEMPT_LOG_EXTENSION = ".lpxcol"
+ATTEMPT_LOG_MAGIC = b"LPXATTS\n"
+ATTEMPT_LOG_VERSION = 1
+ATTEMPT_LOG_DTYPES = ("<i4", "<u2", "<i8", "u1", "<f4") # Per column of a chunk; IDs and categories index the footer tables
+ATTEMPT_EXPORT_EXTENSIONS = (".csv", ".csv.gz", ".csv.xz", ATTEMPT_LOG_EXTENSION)
 QUIZ_MODE_STANDARD = "standard"
 QUIZ_MODE_VERIFY = "verify"
+QUIZ_MODE_WEAK = "weak" # Draws only from the weak-spot index, with immediate feedback like the standard mode
+QUIZ_MODE_UNSEEN = "unseen" # Draws only from questions never attempted (attempted-question bitset)
+# Weak spots: a question is weak below this accuracy, or when one of its last few answers was wrong
+WEAK_SPOT_ACCURACY = 0.6
+WEAK_SPOT_RECENT_ATTEMPTS = 3 # 0 = accuracy threshold only
+WEAK_SPOT_MASK_BITS = 16 # Recent answers kept per question (history index) for the recency threshold
+WEAK_SPOT_BANDS = 10 # Accuracy buckets of the index; weaker buckets are drawn from more often
+PROFILE_REPORT_FILE = "linux_plus_profile_report.txt"
+REPLAY_LOG_FILE = "linux_plus_replay.jsonl" # One JSON line per finished quiz session
+REPLAY_LOG_MAX_BYTES = 2 * 1024 * 1024 # A full log is rotated to FILE.1 (replacing the previous one) before the next append
+PROFILE_TOP_FUNCTIONS = 25 # Number of functions listed from cProfile data
+# Methods wrapped with timers when --profile is active
+ENGINE_PROFILED_METHODS = ["select_question", "update_history", "save_history", "display_question"]
+# Response-time histogram: upper bounds (seconds) of each bucket, the last bucket is open-ended
+ANSWER_TIME_BUCKETS = [2, 5, 10, 20, 40, 60]
+ANSWER_TIME_BUCKET_LABELS = ["<2s", "2-5s", "5-10s", "10-20s", "20-40s", "40-60s", "60s+"]
+# Question packs: extra JSON question files merged in at startup, one namespace per pack
+QUESTION_PACKS_DIR = "question_packs"
+QUESTION_PACK_EXTENSION = ".json"
+PACK_CACHE_DIR = ".linux_plus_pack_cache" # Parsed packs keyed by SHA-256 of the pack file
+# Segmented question bank: a small manifest plus one file per category, loaded on first use
+QUESTION_BANK_DIR = "question_bank"
+BANK_MANIFEST_FILE = "manifest.json"
+BANK_FORMAT_VERSION = 1
+# Compiled bank (--compile-bank): one marshal artifact with the question table and its indexes, mapped at startup
+COMPILED_BANK_FILE = "linux_plus_bank.marshal"
+COMPILED_BANK_MAGIC = b"LPXBANK\n" # Precedes the marshal payload
+COMPILED_BANK_VERSION = 1
+BANK_COMPILE_CHUNK = 2000 # Entries validated per worker job
+# Question extraction (--extract-questions): literal banks harvested from the older game versions via ast
+EXTRACT_OUTPUT_FILE = "extracted_questions.json" # Same layout as a pack, usable with --compile-source
+EXTRACT_FUNCTION_NAMES = ("load_questions", "builtin_questions") # Functions whose literal lists are read
+EXTRACT_SOURCE_PATTERN = re.compile(r"(test)?d(?:V)?(\d*)\.py") # d.py, d2.py, dV3-dV8.py, testd*.py
+# Categories the compiler accepts: an exam domain, or "Commands (<topic>)" / "Concepts & Terms (<topic>)"
+KNOWN_CATEGORY_TOPICS = {
+    "Automation", "Containers", "General", "Networking", "Scripting", "Security",
+    "System Management", "Troubleshooting", "Version Control",
+}
+# Categories only older versions used, renamed on extraction so the compiler accepts them
+EXTRACT_CATEGORY_ALIASES = {
+    "Filesystems": "Concepts & Terms (System Management)",
+    "Commands (Navigation)": "Commands (System Management)",
+    "Commands (Permissions)": "Commands (System Management)",
+    "Commands (Archiving)": "Commands (System Management)",
+    "Concepts & Terms (Filesystems)": "Concepts & Terms (System Management)",
+    "Concepts & Terms (System Structure)": "Concepts & Terms (System Management)",
+}
+# Trend analytics (requires NumPy)
+ANALYTICS_ROLLING_WINDOW = 50 # Attempts per rolling-accuracy window
+ANALYTICS_CURVE_BLOCK = 20 # Attempts per point on a category learning curve
+ANALYTICS_CURVE_POINTS = 8 # Most recent learning-curve points shown per category
+EXAM_READY_ACCURACY = 0.80 # Target accuracy for the "exam-ready" forecast
+# Session history: history["sessions"] holds one list per column, one entry per finished quiz session
+SESSION_COLUMNS = ("started", "duration", "mode", "category", "answered", "correct") # Epoch s, seconds, mode, category or None, counts
+SESSION_TREND_BLOCK = 10 # Sessions per point of the score / pace trends
+SESSION_REPORT_RECENT = 10 # Sessions listed individually in the session-history view
+RETENTION_GAP_EDGES = [3600, 86400, 3 * 86400, 7 * 86400, 30 * 86400] # Seconds since the previous attempt of a question
+RETENTION_GAP_LABELS = ["<1h", "1h-1d", "1-3d", "3-7d", "7-30d", "30d+"]
+# CLI text layout: wrap to the terminal width, within these bounds
+CLI_MIN_WIDTH = 40
+CLI_MAX_WIDTH = 100 # Wider lines are harder to read than wrapped ones
+TEXT_WRAP_CACHE_SIZE = 4096 # Wrapped paragraphs kept (LRU)
+KEYPRESS_ESCAPE_WAIT = 0.05 # Seconds to wait after Esc for the rest of an arrow/function-key sequence
+VERIFY_RESULTS_PAGE_SIZE = 10 # Questions per page in the verify-mode results viewers
+# Named pauses used by the Pacer (seconds at --pace 1); --fast sets them all to zero
+PACER_DELAYS = {
+    "verify_next": 1.0, # After recording a verify-mode answer
+    "short": 1.0, # Acknowledgements such as "Clear cancelled"
+    "notice": 1.5, # Invalid input and similar notices
+    "error": 2.0, # Errors the user should have time to read
+    "session_end": 3.0, # Session ended / empty filter
+}
+# Mock exam forms (CompTIA Linux+ XK0-005 domain weights)
+EXAM_DOMAIN_WEIGHTS = {
+    "System Management": 0.32,
+    "Security": 0.21,
+    "Scripting, Containers, and Automation": 0.19,
+    "Troubleshooting": 0.28,
+}
+EXAM_FORM_SIZE = 90
+EXAM_FORMS_DIR = "exam_forms"
+GUI_PROFILED_COMMANDS = [
+    "_start_quiz_dialog", "_start_from_dialog_gui", "_start_weak_spots_gui", "_start_quiz_session", "_next_question_gui",
+    "_display_question_gui", "_submit_answer_gui", "_show_stats_gui", "_show_verify_results_gui",
+    "_review_incorrect_gui", "_clear_stats_gui", "_export_data_gui", "_export_questions_answers_gui",
+]
+# Tk stall monitor (--stall-monitor): a heartbeat runs on the event loop and late beats are stalls
+STALL_REPORT_FILE = "linux_plus_stall_report.txt"
+STALL_HEARTBEAT_MS = 50 # Heartbeat interval
+STALL_THRESHOLD_MS = 100 # A beat this much later than scheduled is recorded as a stall
+STALL_REPORT_WORST = 20 # Longest stalls listed individually in the report
+# Handlers timed by the stall monitor: GUI commands and scheduled callbacks, plus engine work they call
+STALL_MONITORED_COMMANDS = GUI_PROFILED_COMMANDS + [
+    "_auto_advance_gui", "_clear_review_item_gui", "_close_review_gui", "_close_verify_results_gui", "_quit_app",
+]
+STALL_MONITORED_ENGINE_METHODS = ["save_history", "prefetch", "select_question", "update_history",
+                                  "ensure_category_loaded", "count_questions"]
 
 # --- CLI Helper Functions ---
+def cli_separator(char='-', length=60, color=COLOR_BORDER):
+    """Returns a colored separator line (for building output ahead of printing)."""
+    return f"{color}{char * length}{COLOR_RESET}"
+
 def cli_print_separator(char='-', length=60, color=COLOR_BORDER):
     """Prints a colored separator line."""
-    print(f"{color}{char * length}{COLOR_RESET}")
+    print(cli_separator(char, length, color))
 
-def cli_print_header(text, char='=', length=60, color=COLOR_HEADER):
-    """Prints a centered header with separators."""
+def cli_header(text, char='=', length=60, color=COLOR_HEADER):
+    """Returns a centered header with separators."""
     # Ensure text is a string
     text_str = str(text)
     padding = (length - len(text_str) - 2) // 2
     if padding < 0: padding = 0 # Prevent negative padding
-    print(f"{color}{char * padding} {text_str} {char * (length - len(text_str) - 2 - padding)}{COLOR_RESET}")
+    return f"{color}{char * padding} {text_str} {char * (length - len(text_str) - 2 - padding)}{COLOR_RESET}"
 
+def cli_print_header(text, char='=', length=60, color=COLOR_HEADER):
+    """Prints a centered header with separators."""
+    print(cli_header(text, char, length, color))
 
-def cli_print_box(lines, title="", width=60, border_color=COLOR_BORDER, title_color=COLOR_HEADER, text_color=COLOR_WELCOME_TEXT):
-    """Prints text within a colored box."""
+
+def cli_box(lines, title="", width=60, border_color=COLOR_BORDER, title_color=COLOR_HEADER, text_color=COLOR_WELCOME_TEXT):
+    """Returns text within a colored box as one string."""
     border = f"{border_color}{'=' * width}{COLOR_RESET}"
-    print(border)
+    rows = [border]
     if title:
         padding = (width - len(title) - 4) // 2
         if padding < 0: padding = 0
-        print(f"{border_color}* { ' ' * padding }{title_color}{title}{border_color}{ ' ' * (width - len(title) - 4 - padding)} *{COLOR_RESET}")
-        print(border)
+        rows.append(f"{border_color}* { ' ' * padding }{title_color}{title}{border_color}{ ' ' * (width - len(title) - 4 - padding)} *{COLOR_RESET}")
+        rows.append(border)
 
     for line in lines:
         # Basic way to estimate length without color codes (might be inaccurate with complex chars)
@@ -124,29 +303,2182 @@ def cli_print_box(lines, title="", width=60, border_color=COLOR_BORDER, title_co
 
         padding_right = width - line_len_no_color - 4
         if padding_right < 0: padding_right = 0
-        print(f"{border_color}* {text_color}{line}{' ' * padding_right}{border_color} *{COLOR_RESET}")
-    print(border)
+        rows.append(f"{border_color}* {text_color}{line}{' ' * padding_right}{border_color} *{COLOR_RESET}")
+    rows.append(border)
+    return "\n".join(rows)
+
+
+def cli_print_box(lines, title="", width=60, border_color=COLOR_BORDER, title_color=COLOR_HEADER, text_color=COLOR_WELCOME_TEXT):
+    """Prints text within a colored box."""
+    print(cli_box(lines, title, width, border_color, title_color, text_color))
+
+
+# --- CLI Frame Cache ---
+ANSI_CLEAR_SCREEN = "\x1b[H\x1b[2J\x1b[3J" # Home, clear screen, clear scrollback
+
+
+def ansi_terminal():
+    """True when stdout is a POSIX terminal that takes ANSI control sequences directly."""
+    return os.name != 'nt' and sys.stdout.isatty()
+
+
+class FrameCache:
+    """Fully composed ANSI frames for static CLI screens (welcome box, menus).
+
+    Frames are keyed by screen name, terminal width and color mode, and written with one write call.
+    A terminal resize (SIGWINCH) drops every frame. Without SIGWINCH the width is re-read on each
+    show, so a resized terminal still gets new frames.
+    """
+
+    def __init__(self):
+        self.frames = {}
+        self.hits = 0
+        self.misses = 0
+        self.build_seconds = 0.0
+        self._width = None
+        self._resize_hooked = None # None = not attempted yet; hooked lazily so curses can own SIGWINCH
+
+    def _hook_resize(self):
+        self._resize_hooked = False
+        if not hasattr(signal, "SIGWINCH") or threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGWINCH)
+
+        def on_resize(signum, frame):
+            self.invalidate()
+            if callable(previous):
+                previous(signum, frame)
+
+        try:
+            signal.signal(signal.SIGWINCH, on_resize)
+            self._resize_hooked = True
+        except (ValueError, OSError):
+            pass
+
+    def invalidate(self):
+        """Forget every frame (called on terminal resize)."""
+        self.frames.clear()
+        self._width = None
+
+    def width(self):
+        if self._width is None or not self._resize_hooked:
+            self._width = shutil.get_terminal_size().columns
+        return self._width
+
+    def show(self, name, build, clear_screen=None):
+        """Write the frame for name, building it with build() on a miss.
+
+        clear_screen: the caller's screen-clear function. On an ANSI terminal the clear sequence is
+        folded into the frame instead, so clearing and drawing is a single write.
+        """
+        if self._resize_hooked is None:
+            self._hook_resize()
+        direct = ansi_terminal()
+        key = (name, self.width(), bool(COLOR_RESET), direct, clear_screen is not None)
+        frame = self.frames.get(key)
+        if frame is None:
+            self.misses += 1
+            start = time.perf_counter()
+            text = build() + "\n"
+            if clear_screen is not None and direct:
+                text = ANSI_CLEAR_SCREEN + text
+            frame = self.frames[key] = text.encode(sys.stdout.encoding or 'utf-8', 'replace') if direct else text
+            self.build_seconds += time.perf_counter() - start
+        else:
+            self.hits += 1
+        if clear_screen is not None and not direct:
+            clear_screen()
+        if direct:
+            sys.stdout.flush() # Keep ordering with anything already buffered
+            view = memoryview(frame)
+            while view:
+                view = view[os.write(sys.stdout.fileno(), view):]
+        else:
+            sys.stdout.write(frame)
+            sys.stdout.flush()
+
+    def stats(self):
+        """Counters for the profile report."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.frames), "seconds": self.build_seconds}
+
+
+class TextLayout:
+    """Wraps and indents CLI text to the terminal width.
+
+    Wrapped lines are memoized per (text, width, indents), so showing the same question or
+    explanation again costs a dictionary lookup. A resize changes the width and so the key.
+    """
+
+    def __init__(self, width_source=None):
+        self.width_source = width_source # e.g. FrameCache.width (cached until SIGWINCH)
+        self.cache = OrderedDict() # LRU of wrapped line tuples
+        self.lock = threading.Lock() # The CLI prefetch thread renders while the main thread prints feedback
+        self.hits = 0
+        self.misses = 0
+        self.wrap_seconds = 0.0
+
+    def width(self):
+        columns = self.width_source() if self.width_source else shutil.get_terminal_size().columns
+        return max(CLI_MIN_WIDTH, min(CLI_MAX_WIDTH, columns))
+
+    def rule(self, fraction=1.0):
+        """Separator length as a fraction of the layout width."""
+        return max(10, int(self.width() * fraction))
+
+    def wrap(self, text, initial_indent="", subsequent_indent=""):
+        """Wrapped lines (tuple) of text; embedded newlines start new paragraphs."""
+        with self.lock:
+            return self._wrap(text, initial_indent, subsequent_indent)
+
+    def _wrap(self, text, initial_indent, subsequent_indent):
+        width = self.width()
+        key = (text, width, initial_indent, subsequent_indent)
+        lines = self.cache.get(key)
+        if lines is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return lines
+        self.misses += 1
+        start = time.perf_counter()
+        wrapped = []
+        for paragraph in str(text).split("\n"):
+            indent = subsequent_indent if wrapped else initial_indent
+            wrapped.extend(textwrap.wrap(paragraph, width, initial_indent=indent, subsequent_indent=subsequent_indent,
+                                         break_on_hyphens=False) or [indent.rstrip()])
+        lines = self.cache[key] = tuple(wrapped)
+        if len(self.cache) > TEXT_WRAP_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        self.wrap_seconds += time.perf_counter() - start
+        return lines
+
+    def paint(self, text, color, prefix="", prefix_color="", indent=""):
+        """Wrap text behind a prefix (continuation lines hang under it) and color every line separately.
+
+        Coloring per line keeps escape codes from spanning wrapped lines. indent is used when there is no prefix.
+        """
+        hang = " " * len(prefix) if prefix else indent
+        lines = self.wrap(text, hang, hang)
+        painted = []
+        for number, line in enumerate(lines):
+            if number == 0 and prefix:
+                painted.append(f"{prefix_color or color}{prefix}{COLOR_RESET}{color}{line[len(prefix):]}{COLOR_RESET}")
+            else:
+                painted.append(f"{color}{line}{COLOR_RESET}")
+        return "\n".join(painted)
+
+    def stats(self):
+        """Counters for the profile report."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.cache), "seconds": self.wrap_seconds}
+
+
+def answer_time_bucket(seconds):
+    """Return the response-time histogram bucket index for an answer time in seconds."""
+    return bisect.bisect_right(ANSWER_TIME_BUCKETS, seconds)
+
+
+# --- Verify Results ---
+class VerifyResults:
+    """Answers of a verify session, (question_data, answer_index, is_correct), with a running tally.
+
+    Summary counts are kept up to date on append, so they are available without scanning the answers.
+    Results viewers pull one page at a time from the entries() generator. Incorrect-only views filter
+    while iterating instead of building a copy.
+    """
+
+    def __init__(self):
+        self.answers = []
+        self.correct = 0
+
+    def append(self, entry):
+        self.answers.append(entry)
+        if entry[2]:
+            self.correct += 1
+
+    def __len__(self):
+        return len(self.answers)
+
+    def __iter__(self):
+        return iter(self.answers)
+
+    def __bool__(self):
+        return bool(self.answers)
+
+    @property
+    def incorrect(self):
+        return len(self.answers) - self.correct
+
+    def accuracy(self):
+        """Percent correct (0 when nothing was answered)."""
+        return (self.correct / len(self.answers) * 100) if self.answers else 0.0
+
+    def entries(self, incorrect_only=False):
+        """Yield (question number, entry) in answer order, skipping correct answers if asked."""
+        for number, entry in enumerate(self.answers, start=1):
+            if not (incorrect_only and entry[2]):
+                yield number, entry
+
+    def page_count(self, page_size=VERIFY_RESULTS_PAGE_SIZE, incorrect_only=False):
+        shown = self.incorrect if incorrect_only else len(self.answers)
+        return max(1, math.ceil(shown / page_size))
+
+    def page(self, page_index, page_size=VERIFY_RESULTS_PAGE_SIZE, incorrect_only=False):
+        """The (number, entry) pairs on one page; only that page's entries are materialized."""
+        start = page_index * page_size
+        return list(itertools.islice(self.entries(incorrect_only), start, start + page_size))
+
+
+# --- Markdown Export Helpers ---
+def write_questions_answers_md(f, questions):
+    """Write questions, then an answer key, in the Markdown layout used by the Q&A exports."""
+    # --- Write Questions Section ---
+    f.write("# Questions\n\n")
+    for i, q_data in enumerate(questions):
+        if len(q_data) < 5: continue # Safety skip malformed data
+        question_text, options, _, category, _ = q_data
+        f.write(f"**Q{i+1}.** ({category})\n") # Add category like in the example
+        f.write(f"{question_text}\n")
+        # Add options with letters
+        for j, option in enumerate(options):
+            f.write(f"   {chr(ord('A') + j)}. {option}\n")
+        f.write("\n") # Blank line after each question
+
+    f.write("---\n\n") # Separator
+
+    # --- Write Answers Section ---
+    f.write("# Answers\n\n")
+    for i, q_data in enumerate(questions):
+        if len(q_data) < 5: continue # Safety skip malformed data
+        _, options, correct_answer_index, _, explanation = q_data
+        # Validate index before using
+        if 0 <= correct_answer_index < len(options):
+            correct_option_letter = chr(ord('A') + correct_answer_index)
+            correct_option_text = options[correct_answer_index]
+
+            f.write(f"**A{i+1}.** {correct_option_letter}. {correct_option_text}\n")
+            if explanation:
+                # Indent explanation slightly for readability in Markdown
+                explanation_lines = explanation.split('\n')
+                f.write("   *Explanation:*")
+                first_line = True
+                for line in explanation_lines:
+                   if not first_line:
+                        f.write("   ") # Indent subsequent lines
+                   f.write(f" {line.strip()}\n") # Add space before each line, strip extra whitespace
+                   first_line = False
+            f.write("\n\n") # Blank line after each answer block
+        else:
+             f.write(f"**A{i+1}.** Error: Invalid correct answer index.\n\n")
+
+
+# --- Worker Pool Helpers ---
+def map_in_processes(func, items, max_workers=None, description="processing", initializer=None, initargs=()):
+    """Return [func(item) for item in items], spread across a process pool when that can pay off.
+
+    func and initializer run inside worker processes, so they must be top-level functions. With one
+    item, one core, or no way to start a pool (e.g. process creation not permitted) the map runs
+    serially in this process instead; results keep the order of items either way.
+    """
+    items = list(items)
+    if len(items) > 1 and (max_workers or os.cpu_count() or 1) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs) as pool:
+                return list(pool.map(func, items))
+        except Exception as e:
+            print(f"{COLOR_WARNING} Parallel {description} unavailable ({e}); running serially. {COLOR_RESET}")
+    if initializer is not None:
+        initializer(*initargs)
+    return [func(item) for item in items]
+
+
+# --- Exam Form Helpers ---
+def exam_domain_for_category(category):
+    """Map a question category (pack namespace ignored) to one of the EXAM_DOMAIN_WEIGHTS domains."""
+    name = category.split(": ", 1)[-1]
+    if "Troubleshooting" in name:
+        return "Troubleshooting"
+    if "Security" in name:
+        return "Security"
+    if any(word in name for word in ("Scripting", "Container", "Automation", "Version Control")):
+        return "Scripting, Containers, and Automation"
+    return "System Management" # Includes networking, general terms and system commands
+
+
+def exam_form_quotas(form_size, available):
+    """Split form_size across domains by weight (largest remainder), capped by the questions available per domain."""
+    quotas = {domain: 0 for domain in EXAM_DOMAIN_WEIGHTS}
+    remaining = min(form_size, sum(available.get(domain, 0) for domain in EXAM_DOMAIN_WEIGHTS))
+    open_domains = [domain for domain in EXAM_DOMAIN_WEIGHTS if available.get(domain, 0) > 0]
+    while remaining > 0 and open_domains:
+        weight_total = sum(EXAM_DOMAIN_WEIGHTS[d] for d in open_domains)
+        shares = {d: remaining * EXAM_DOMAIN_WEIGHTS[d] / weight_total for d in open_domains}
+        grant = {d: int(shares[d]) for d in open_domains}
+        leftover = remaining - sum(grant.values())
+        for d in sorted(open_domains, key=lambda d: shares[d] - grant[d], reverse=True)[:leftover]:
+            grant[d] += 1
+        # Domains that cannot fill their share give the rest back for the next round
+        for d in open_domains:
+            grant[d] = min(grant[d], available[d] - quotas[d])
+            quotas[d] += grant[d]
+            remaining -= grant[d]
+        open_domains = [d for d in open_domains if quotas[d] < available[d]]
+    return quotas
+
+
+_EXAM_WORKER_STATE = {} # Set once per worker process by _init_exam_worker
+
+
+def _init_exam_worker(questions, strata, quotas, output_dir, seed):
+    """map_in_processes initializer: receive the question table and strata once per worker."""
+    _EXAM_WORKER_STATE.update(questions=questions, strata=strata, quotas=quotas, output_dir=output_dir, seed=seed)
+
+
+def _write_exam_forms(form_numbers):
+    """Draw and write the given forms. Each form has its own seed, so output does not depend on worker layout."""
+    state = _EXAM_WORKER_STATE
+    questions, strata = state["questions"], state["strata"]
+    written = []
+    for form_number in form_numbers:
+        rng = random.Random(f"{state['seed']}:{form_number}")
+        picked = []
+        for domain, quota in state["quotas"].items():
+            if quota:
+                picked.extend(rng.sample(strata[domain], quota)) # O(quota) draw without replacement
+        rng.shuffle(picked) # Interleave domains like the real exam
+        path = os.path.join(state["output_dir"], f"Linux_plus_exam_form_{form_number:04d}.md")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"<!-- Exam form {form_number} (seed {state['seed']}) -->\n\n")
+            write_questions_answers_md(f, [questions[i] for i in picked])
+        written.append(path)
+    return written
+
+
+# --- Raw Keypress Helpers ---
+def raw_keys_supported():
+    """True when single-keypress input can be used (POSIX terminal on stdin)."""
+    return termios is not None and sys.stdin.isatty()
+
+
+_typed_ahead = bytearray() # Keys read past the one returned; back in line mode they would only arrive after Enter
+
+
+def _first_key_length(data):
+    """Bytes making up the first key in data: an escape sequence, one UTF-8 character or a single byte."""
+    if data[:1] == b"\x1b" and data[1:2] in (b"[", b"O"): # CSI/SS3: parameter bytes, then one final byte in @..~
+        for end in range(2, min(len(data), 8)):
+            if 0x40 <= data[end] <= 0x7e:
+                return end + 1
+        return min(len(data), 8)
+    if data[0] >= 0xc0: # UTF-8 lead byte and its continuation bytes
+        return min(len(data), 2 if data[0] < 0xe0 else 3 if data[0] < 0xf0 else 4)
+    return 1
+
+
+def _read_waiting_keys(fd, wait=0):
+    """Bytes already typed at a cbreak-mode terminal, waiting up to wait seconds for the first of them."""
+    data = b""
+    while select.select([fd], [], [], wait)[0]:
+        chunk = os.read(fd, 64)
+        if not chunk:
+            break
+        data += chunk
+        wait = 0
+    return data
+
+
+def read_keypress():
+    """Read one keypress from the terminal without waiting for Enter; returns it lowercased.
+
+    Uses cbreak mode, so Ctrl+C still raises KeyboardInterrupt. Ctrl+D raises EOFError.
+    Returns one key per call: keys typed ahead are kept for the next calls rather than merged,
+    while escape sequences (arrows, function keys) and multi-byte characters are returned whole.
+    """
+    if not _typed_ahead:
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            data = os.read(fd, 1)
+            if data:
+                # A lone Esc has nothing after it; an arrow key's remaining bytes follow within KEYPRESS_ESCAPE_WAIT
+                data += _read_waiting_keys(fd, KEYPRESS_ESCAPE_WAIT if data == b"\x1b" else 0)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+        _typed_ahead.extend(data)
+    size = _first_key_length(_typed_ahead) if _typed_ahead else 0
+    key = bytes(_typed_ahead[:size]).decode('utf-8', 'ignore')
+    del _typed_ahead[:size]
+    if key in ("\x04", ""):
+        raise EOFError
+    return key.lower()
+
+
+# --- Pacing ---
+class Pacer:
+    """Replaces fixed time.sleep() pauses with named, scalable delays that do not block where avoidable.
+
+    CLI: wait() ends early on any keypress and returns immediately when stdin is not a terminal. The key is
+    not lost: it stays queued for the next input() line, or (keep_keys, single-keypress mode) goes to read_keypress.
+    GUI: schedule() runs a callback through widget.after() so the Tk main loop never blocks.
+    A scale of 0 (fast mode) turns every pause into a no-op.
+    """
+
+    def __init__(self, scale=1.0, delays=None):
+        self.scale = scale
+        self.keep_keys = False # --keys: hand keys typed during a pause to read_keypress
+        self.delays = dict(PACER_DELAYS)
+        if delays:
+            self.delays.update(delays)
+
+    def delay(self, name):
+        """Seconds for a named pause after scaling."""
+        return max(0.0, self.delays.get(name, 0.0) * self.scale)
+
+    def wait(self, name):
+        """CLI pause: up to delay(name) seconds, skipped by any key. Never blocks off a terminal."""
+        seconds = self.delay(name)
+        if seconds <= 0 or not sys.stdin.isatty() or _typed_ahead: # A key typed earlier already ends the pause
+            return
+        if not raw_keys_supported():
+            time.sleep(seconds) # No way to poll the console for a key here
+            return
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            ready, _, _ = select.select([fd], [], [], seconds)
+            if ready and self.keep_keys:
+                # Back in line mode these bytes would only be readable after Enter, so read_keypress gets them now
+                _typed_ahead.extend(_read_waiting_keys(fd))
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    def schedule(self, widget, name, callback):
+        """GUI pause: run callback after delay(name) via the Tk event loop; returns the after() id."""
+        milliseconds = int(self.delay(name) * 1000)
+        if milliseconds <= 0:
+            return widget.after_idle(callback)
+        return widget.after(milliseconds, callback)
+
+
+# --- Compressed File Helpers ---
+def codec_for_path(path, codec=None):
+    """Codec name to write path with: the explicit setting, else picked from the extension."""
+    if codec:
+        return codec
+    return HISTORY_CODEC_EXTENSIONS.get(os.path.splitext(path)[1].lower(), "none")
+
+
+def sniff_codec(head):
+    """Codec name from a file's first bytes, so old plain files and compressed ones both read transparently."""
+    for magic, codec in CODEC_MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return "none"
+
+
+def open_codec_file(path, mode, codec="none"):
+    """open() for plain files, gzip.open()/lzma.open() for compressed ones (binary modes)."""
+    module = HISTORY_CODECS[codec]
+    if module is None:
+        return open(path, mode)
+    if 'w' not in mode:
+        return module.open(path, mode)
+    if module is gzip:
+        return gzip.open(path, mode, compresslevel=HISTORY_CODEC_LEVELS[codec])
+    return lzma.open(path, mode, preset=HISTORY_CODEC_LEVELS[codec])
+
+
+def write_history_export(path, history):
+    """Write a JSON history export; .gz/.xz names are compressed (and written compact rather than indented)."""
+    codec = codec_for_path(path)
+    if codec == "none":
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2, default=history_json_default)
+        return
+    payload = json.dumps(history, separators=(',', ':'), default=history_json_default).encode('utf-8')
+    with open_codec_file(path, 'wb', codec) as f:
+        f.write(payload)
+
+
+# --- Streaming History Helpers ---
+class LazyQuestionHistory(MutableMapping):
+    """history["questions"] backed by a streaming history file; each record is parsed on first access.
+
+    The header index keeps every question's offset, length and correct/attempt counts, so question
+    selection can weight by counts (peek_counts) without touching the records themselves.
+    """
+
+    def __init__(self, path, records_offset, index, data=None):
+        self._path = path
+        self._records_offset = records_offset # Byte offset of the first record line
+        self._index = index # text -> [offset, length, correct, attempts, recent miss mask] for records not parsed yet
+        self._loaded = {}
+        self._file = None
+        self._data = data # Decompressed file contents for compressed histories (no seeking in the stream)
+
+    def _read_raw(self, entry):
+        if self._data is not None:
+            start = self._records_offset + entry[0]
+            return self._data[start:start + entry[1]]
+        if self._file is None:
+            self._file = open(self._path, 'rb')
+        self._file.seek(self._records_offset + entry[0])
+        return self._file.read(entry[1])
+
+    def _load_all(self):
+        """Parse every remaining record in one forward pass (used when iterating items/values)."""
+        for text, entry in sorted(self._index.items(), key=lambda item: item[1][0]):
+            self._loaded[text] = json.loads(self._read_raw(entry))[1]
+        self._index.clear()
+
+    def __getitem__(self, key):
+        if key in self._loaded:
+            return self._loaded[key]
+        entry = self._index[key] # KeyError for unknown questions, as with a dict
+        record = self._loaded[key] = json.loads(self._read_raw(entry))[1]
+        del self._index[key]
+        return record
+
+    def __setitem__(self, key, value):
+        self._index.pop(key, None)
+        self._loaded[key] = value
+
+    def __delitem__(self, key):
+        if key in self._loaded:
+            del self._loaded[key]
+        else:
+            del self._index[key]
+
+    def __iter__(self):
+        yield from list(self._index)
+        yield from list(self._loaded)
+
+    def __len__(self):
+        return len(self._index) + len(self._loaded)
+
+    def __contains__(self, key):
+        return key in self._loaded or key in self._index
+
+    def items(self):
+        self._load_all()
+        return self._loaded.items()
+
+    def values(self):
+        self._load_all()
+        return self._loaded.values()
+
+    def iter_items(self):
+        """(text, stats) for every question in file order, parsing unloaded records without keeping them."""
+        for text, entry in sorted(self._index.items(), key=lambda item: item[1][0]):
+            yield text, json.loads(self._read_raw(entry))[1]
+        yield from list(self._loaded.items())
+
+    def peek_counts(self, key):
+        """(correct, attempts) without parsing the record, or None if the question has no record."""
+        if key in self._loaded:
+            stats = self._loaded[key]
+            return (stats.get("correct", 0), stats.get("attempts", 0)) if isinstance(stats, dict) else (0, 0)
+        entry = self._index.get(key)
+        return (entry[2], entry[3]) if entry else None
+
+    def peek_recent(self, key):
+        """Recent-miss mask (see recent_miss_mask) without parsing the record; 0 if the file predates it."""
+        if key in self._loaded:
+            return recent_miss_mask(self._loaded[key])
+        entry = self._index.get(key)
+        return entry[4] if entry and len(entry) > 4 and isinstance(entry[4], int) else 0
+
+    def raw_record(self, key):
+        """The untouched record line (without newline) for an unparsed question, else None."""
+        entry = self._index.get(key)
+        return self._read_raw(entry) if entry else None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def rebase(self, path, records_offset, index, data=None):
+        """Point unparsed records at a newly written file (after save_history)."""
+        self.close()
+        self._path, self._records_offset, self._data = path, records_offset, data
+        self._index = {text: entry for text, entry in index.items() if text not in self._loaded}
+
+
+def streaming_history_path(path):
+    """Where the streaming layout goes for a history path: x.json -> x.jsonl, keeping any .gz/.xz suffix."""
+    base, codec_ext = os.path.splitext(path)
+    if codec_ext.lower() not in HISTORY_CODEC_EXTENSIONS:
+        base, codec_ext = path, ""
+    if base.lower().endswith(".jsonl"):
+        return path
+    if base.lower().endswith(".json"):
+        return base + "l" + codec_ext
+    return base + ".jsonl" + codec_ext
+
+
+def legacy_history_path(path):
+    """The single-document history older versions keep beside a streaming one (x.jsonl -> x.json), or None."""
+    base = os.path.splitext(path)[0] if os.path.splitext(path)[1].lower() in HISTORY_CODEC_EXTENSIONS else path
+    return base[:-1] if base.lower().endswith(".jsonl") else None
+
+
+def history_file_layout(path):
+    """'stream' for the streaming layout, 'missing' if there is no file, else 'legacy' (left for older versions)."""
+    try:
+        with open(path, 'rb') as f:
+            codec = sniff_codec(f.read(8))
+        with open_codec_file(path, 'rb', codec) as f:
+            first_line = f.readline()
+        if first_line.startswith(HISTORY_STREAM_PREFIX):
+            return "stream"
+        header = json.loads(first_line) # Headers written before the format key came first
+    except FileNotFoundError:
+        return "missing"
+    except (ValueError, EOFError, OSError, lzma.LZMAError):
+        return "legacy"
+    return "stream" if isinstance(header, dict) and header.get("format") == HISTORY_STREAM_FORMAT else "legacy"
+
+
+def history_json_default(obj):
+    """json.dump hook so exports of a lazily loaded history write plain JSON."""
+    if isinstance(obj, MutableMapping):
+        return dict(obj.items())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# --- History Migration Helpers ---
+class JsonStreamReader:
+    """Walks one large JSON document member by member, holding only the current member in memory.
+
+    iter_object() / iter_array() yield once per member; the caller consumes that member with value()
+    (or a nested iter_*()) before advancing the generator.
+    """
+    WHITESPACE = re.compile(r"\s*")
+
+    def __init__(self, stream, chunk_size=MIGRATE_CHUNK_CHARS):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, wanted=0):
+        """Drop the consumed text and append at least max(chunk_size, wanted) more. False at end of input."""
+        chunk = self.stream.read(max(self.chunk_size, wanted))
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of input)."""
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in JSON input")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value runs past the buffer: at least double what is buffered, so big values stay linear
+                if not self._fill(len(self.buffer) - self.pos):
+                    raise
+                continue
+            if end == len(self.buffer) and self._fill():
+                continue # A number or literal may continue in the next chunk
+            self.pos = end
+            return value
+
+    def _members(self, open_char, close_char, keyed):
+        self.expect(open_char)
+        if self.peek() == close_char:
+            self.pos += 1
+            return
+        while True:
+            if keyed:
+                key = self.value()
+                self.expect(':')
+                yield key
+            else:
+                yield None
+            char = self.peek()
+            self.pos += 1
+            if char == close_char:
+                return
+            if char != ',':
+                raise ValueError(f"expected ',' or {close_char!r} in JSON input")
+
+    def iter_object(self):
+        return self._members('{', '}', True)
+
+    def iter_array(self):
+        return self._members('[', ']', False)
+
+    def lines(self):
+        """The rest of the input line by line (the record lines that follow a streaming-layout header)."""
+        rest, self.buffer, self.pos = self.buffer[self.pos:], "", 0
+        buffered = rest.split("\n")
+        tail = buffered.pop()
+        yield from buffered
+        for line in self.stream:
+            if tail:
+                line, tail = tail + line, ""
+            yield line
+        if tail:
+            yield tail
+
+
+def history_question_id(question_text):
+    """Stable question ID for the ID-keyed history layout (hash of the full question text)."""
+    return "q" + hashlib.sha256(question_text.encode('utf-8')).hexdigest()[:16]
+
+
+def legacy_question_abbreviation(question_text):
+    """The abbreviated text d.py stored with each hash-ID question record."""
+    return question_text[:50] + "..." if len(question_text) > 50 else question_text
+
+
+def _migrated_question_stats(stats):
+    """Question record in the current schema (counts plus an attempt list), copied from any legacy record."""
+    stats = dict(stats) if isinstance(stats, dict) else {}
+    stats.pop("text", None) # d.py's abbreviation; the key (or the ID layout's "text") carries the full text
+    for key in ("correct", "attempts"):
+        if isinstance(stats.get(key), bool) or not isinstance(stats.get(key), int):
+            stats[key] = 0
+    if not isinstance(stats.get("history"), list):
+        stats["history"] = []
+    return stats
+
+
+def migrate_history(source_path, output_path, schema="current", question_texts=(), codec=None):
+    """Convert a history file of any known layout to the current streaming layout or the ID-keyed one.
+
+    Inputs: the streaming and ID-keyed layouts, text-keyed single-document JSON (d2.py, dV3-dV8) and d.py's
+    session-based files, whose question records are keyed by hash IDs and carry abbreviated text. Everything is read in one
+    forward pass: question records go straight to a temporary file, so memory holds the current record and
+    the per-question index, never the full attempt history. d.py's IDs came from Python's per-process
+    hash(), so its records are matched back to full questions through the abbreviation and question_texts.
+    Returns a summary dict; raises ValueError for a header naming a layout or version it does not know.
+    """
+    full_texts, ambiguous = {}, set()
+    for text in question_texts:
+        abbreviation = legacy_question_abbreviation(text)
+        if full_texts.setdefault(abbreviation, text) != text:
+            ambiguous.add(abbreviation)
+    summary = {"format": "text-keyed JSON", "questions": 0, "attempts": 0, "unmatched": 0, "ambiguous": 0}
+    header, index, hash_id_records = {}, {}, {}
+    offset = 0
+
+    with open(source_path, 'rb') as f:
+        source_codec = sniff_codec(f.read(8))
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with open_codec_file(source_path, 'rb', source_codec) as binary, io.TextIOWrapper(binary, encoding='utf-8') as source, \
+            tempfile.TemporaryFile(dir=output_dir) as records:
+
+        def write_record(text, stats):
+            nonlocal offset
+            key = history_question_id(text) if schema == "ids" else text
+            if schema == "ids":
+                stats["text"] = text
+            raw = json.dumps([key, stats], separators=(',', ':')).encode('utf-8')
+            records.write(raw + b"\n")
+            index[key] = [offset, len(raw), stats["correct"], stats["attempts"], recent_miss_mask(stats)]
+            offset += len(raw) + 1
+            summary["questions"] += 1
+            summary["attempts"] += stats["attempts"]
+
+        def add_question(key, stats):
+            if isinstance(stats, dict) and isinstance(stats.get("text"), str) and "history" not in stats and str(key).isdigit():
+                # d.py record: merged per resolved question (they have no attempt lists, so this stays small)
+                summary["format"] = "d.py session-based (hash IDs)"
+                abbreviation = stats["text"]
+                text = full_texts.get(abbreviation) if abbreviation not in ambiguous else None
+                if text is None:
+                    summary["ambiguous" if abbreviation in ambiguous else "unmatched"] += 1
+                    text = abbreviation # Kept under the abbreviation so its counts are not lost
+                merged = hash_id_records.setdefault(text, _migrated_question_stats({}))
+                stats = _migrated_question_stats(stats)
+                merged["correct"] += stats["correct"]
+                merged["attempts"] += stats["attempts"]
+            else:
+                write_record(key, _migrated_question_stats(stats))
+
+        reader = JsonStreamReader(source)
+        for key in reader.iter_object():
+            if key == "questions":
+                for question_key in reader.iter_object():
+                    add_question(question_key, reader.value())
+            elif key == "index":
+                reader.value() # Streaming-layout offsets; rebuilt below
+            else:
+                header[key] = reader.value()
+        source_format, source_version = header.pop("format", None), header.pop("version", None)
+        line_layouts = {HISTORY_STREAM_FORMAT: ("streaming layout", HISTORY_STREAM_VERSION),
+                        HISTORY_IDS_FORMAT: ("ID-keyed layout", HISTORY_IDS_VERSION)}
+        if source_format is not None:
+            if source_format not in line_layouts:
+                raise ValueError(f"unknown history format {source_format!r}")
+            summary["format"], supported_version = line_layouts[source_format]
+            if source_version != supported_version:
+                raise ValueError(f"unsupported {summary['format']} version {source_version!r}")
+            texts_by_id = {}
+            for line in reader.lines():
+                if line.strip():
+                    key, stats = json.loads(line)
+                    if source_format == HISTORY_IDS_FORMAT:
+                        if not isinstance(stats, dict) or not isinstance(stats.get("text"), str):
+                            raise ValueError(f"ID-keyed record {key!r} has no question text")
+                        texts_by_id[key] = stats["text"]
+                        key = stats["text"]
+                    add_question(key, stats)
+            if source_format == HISTORY_IDS_FORMAT and isinstance(header.get("incorrect_review"), list):
+                header["incorrect_review"] = [texts_by_id.get(key, key) for key in header["incorrect_review"]]
+        for text, stats in hash_id_records.items():
+            write_record(text, stats)
+
+        # Header: defaults for anything the old layout lacked, totals from the records if missing
+        for key, default_value in (("categories", {}), ("incorrect_review", [])):
+            if not isinstance(header.get(key), type(default_value)):
+                header[key] = default_value
+        header["sessions"] = session_columns(header.get("sessions"))
+        if not isinstance(header.get("total_attempts"), int):
+            header["total_attempts"] = summary["attempts"]
+        if not isinstance(header.get("total_correct"), int):
+            header["total_correct"] = sum(entry[2] for entry in index.values())
+        for category, stats in list(header["categories"].items()):
+            stats = dict(stats) if isinstance(stats, dict) else {}
+            stats.setdefault("correct", 0)
+            stats.setdefault("attempts", 0)
+            header["categories"][category] = stats
+        if schema == "ids":
+            header["incorrect_review"] = [history_question_id(text) for text in header["incorrect_review"] if isinstance(text, str)]
+            header = {"format": HISTORY_IDS_FORMAT, "version": HISTORY_IDS_VERSION, **header, "index": index}
+        else:
+            header = {"format": HISTORY_STREAM_FORMAT, "version": HISTORY_STREAM_VERSION, **header, "index": index}
+        summary["sessions"] = len(header["sessions"]["started"])
+
+        temp_path = output_path + ".tmp"
+        records.seek(0)
+        with open_codec_file(temp_path, 'wb', codec_for_path(output_path, codec)) as f:
+            f.write(json.dumps(header, separators=(',', ':')).encode('utf-8') + b"\n")
+            shutil.copyfileobj(records, f)
+    os.replace(temp_path, output_path)
+    return summary
+
+
+# --- Attempt Log Export ---
+def is_attempt_export_path(path):
+    """True for file names exported as a flat attempt log (CSV, optionally compressed, or the columnar format)."""
+    return path.lower().endswith(ATTEMPT_EXPORT_EXTENSIONS)
+
+
+def iter_history_items(questions):
+    """(text, stats) pairs; a lazily loaded history is parsed one record at a time and nothing is kept."""
+    if isinstance(questions, LazyQuestionHistory):
+        return questions.iter_items()
+    return iter(list(questions.items()))
+
+
+def iter_attempt_rows(history, text_to_category):
+    """(question_id, category, timestamp, correct, seconds or None) for every recorded attempt, question by question."""
+    for text, stats in iter_history_items(history.get("questions", {})):
+        attempts = stats.get("history") if isinstance(stats, dict) else None
+        if not isinstance(attempts, list):
+            continue
+        question_id = history_question_id(text)
+        category = text_to_category.get(text, "")
+        for attempt in attempts:
+            if isinstance(attempt, dict) and isinstance(attempt.get("timestamp"), str):
+                seconds = attempt.get("time")
+                yield (question_id, category, attempt["timestamp"], bool(attempt.get("correct")),
+                       seconds if isinstance(seconds, (int, float)) and not isinstance(seconds, bool) else None)
+
+
+def attempt_epoch_seconds(timestamp):
+    """Attempt timestamp as epoch seconds (naive times read as UTC, as the trend analytics do); -1 if malformed."""
+    try:
+        return calendar.timegm(datetime.fromisoformat(timestamp).timetuple())
+    except ValueError:
+        return -1
+
+
+def write_attempt_csv(path, rows):
+    """Stream rows to CSV (a .gz/.xz name is compressed); returns the row count."""
+    count = 0
+    with open_codec_file(path, 'wb', codec_for_path(path)) as binary, \
+            io.TextIOWrapper(binary, encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(ATTEMPT_EXPORT_COLUMNS)
+        while True:
+            chunk = [(question_id, category, timestamp, int(correct), "" if seconds is None else seconds)
+                     for question_id, category, timestamp, correct, seconds in itertools.islice(rows, ATTEMPT_EXPORT_CHUNK_ROWS)]
+            if not chunk:
+                return count
+            writer.writerows(chunk)
+            count += len(chunk)
+
+
+def write_attempt_columns(path, rows):
+    """Stream rows to the columnar attempt log; returns the row count.
+
+    Layout (little-endian): ATTEMPT_LOG_MAGIC, uint32 version, then chunks of uint32 row count n followed by
+    n x int32 question number, n x uint16 category number, n x int64 epoch seconds, n x uint8 correct and
+    n x float32 answer seconds (NaN = not timed). A zero row count ends the chunks, then comes a JSON footer
+    (column names and types, row count, question_ids and categories tables indexed by those numbers) and
+    its uint64 byte offset as the last 8 bytes. Each column of a chunk can be read with numpy.frombuffer.
+    """
+    question_numbers, category_numbers = {}, {}
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(ATTEMPT_LOG_MAGIC + struct.pack("<I", ATTEMPT_LOG_VERSION))
+        while True:
+            chunk = list(itertools.islice(rows, ATTEMPT_EXPORT_CHUNK_ROWS))
+            f.write(struct.pack("<I", len(chunk)))
+            if not chunk:
+                break
+            columns = (array('i', [question_numbers.setdefault(row[0], len(question_numbers)) for row in chunk]),
+                       array('H', [category_numbers.setdefault(row[1], len(category_numbers)) for row in chunk]),
+                       array('q', [attempt_epoch_seconds(row[2]) for row in chunk]),
+                       array('B', [row[3] for row in chunk]),
+                       array('f', [math.nan if row[4] is None else row[4] for row in chunk]))
+            for column in columns:
+                if sys.byteorder != "little":
+                    column.byteswap()
+                f.write(column.tobytes())
+            count += len(chunk)
+        footer = {"format": "linux_plus_attempt_log", "version": ATTEMPT_LOG_VERSION, "rows": count,
+                  "columns": [[name, dtype] for name, dtype in zip(ATTEMPT_EXPORT_COLUMNS, ATTEMPT_LOG_DTYPES)],
+                  "question_ids": list(question_numbers), "categories": list(category_numbers)}
+        footer_offset = f.tell()
+        f.write(json.dumps(footer, separators=(',', ':')).encode('utf-8'))
+        f.write(struct.pack("<Q", footer_offset))
+    return count
+
+
+def write_attempt_export(path, history, text_to_category):
+    """Flatten every attempt of history into path: the columnar log for ATTEMPT_LOG_EXTENSION, else CSV."""
+    rows = iter_attempt_rows(history, text_to_category)
+    if path.lower().endswith(ATTEMPT_LOG_EXTENSION):
+        return write_attempt_columns(path, rows)
+    return write_attempt_csv(path, rows)
+
+
+# --- Replay Helpers ---
+def replay_digest(question_text):
+    """Short content hash used to check that a replayed step selected the same question."""
+    return hashlib.sha1(question_text.encode('utf-8')).hexdigest()[:10]
+
+
+def read_replay_log(path):
+    """Yield the session records from a replay log, skipping lines that do not parse."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record.get("steps"), list) or "session_seed" not in record:
+                    raise ValueError("missing steps/session_seed")
+            except (ValueError, AttributeError) as e:
+                print(f"{COLOR_WARNING} Skipping replay log line {line_number}: {e} {COLOR_RESET}")
+                continue
+            yield record
+
+
+# --- Question Pack Helpers ---
+def validate_question(entry):
+    """Normalize one question (5-item list/tuple or dict) to the engine tuple. Returns (question, error)."""
+    if isinstance(entry, dict):
+        entry = [entry.get("question"), entry.get("options"), entry.get("correct"), entry.get("category"), entry.get("explanation")]
+    if not isinstance(entry, (list, tuple)) or len(entry) != 5:
+        return None, "expected 5 fields (question, options, correct index, category, explanation)"
+    question_text, options, correct_index, category, explanation = entry
+    if not isinstance(question_text, str) or not question_text.strip():
+        return None, "question text is empty"
+    if not isinstance(options, list) or len(options) < 2 or not all(isinstance(o, str) and o.strip() for o in options):
+        return None, "options must be a list of at least two non-empty strings"
+    if isinstance(correct_index, bool) or not isinstance(correct_index, int) or not 0 <= correct_index < len(options):
+        return None, f"correct index {correct_index!r} is outside the options"
+    if not isinstance(category, str) or not category.strip():
+        return None, "category is empty"
+    if not isinstance(explanation, str):
+        return None, "explanation must be a string"
+    return (question_text, list(options), correct_index, category.strip(), explanation), None
+
+
+def parse_question_pack(pack_name, raw_bytes):
+    """Parse and validate one pack file's contents.
+
+    Returns (namespace or None, [question tuples], [error messages]).
+    """
+    try:
+        pack = json.loads(raw_bytes.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        return None, [], [f"{pack_name}: not valid JSON ({e})"]
+    if isinstance(pack, list): # Bare list of questions
+        pack = {"questions": pack}
+    if not isinstance(pack, dict) or not isinstance(pack.get("questions"), list):
+        return None, [], [f"{pack_name}: expected an object with a 'questions' list"]
+    namespace = pack.get("namespace") if isinstance(pack.get("namespace"), str) and pack["namespace"].strip() else None
+    questions, errors = [], []
+    for number, entry in enumerate(pack["questions"], start=1):
+        question, error = validate_question(entry)
+        if error:
+            errors.append(f"{pack_name} question {number}: {error}")
+        else:
+            questions.append(question)
+    return namespace, questions, errors
+
+
+def _parse_question_pack_job(job):
+    """map_in_processes adapter for parse_question_pack."""
+    return parse_question_pack(*job)
+
+
+# --- Bank Compiler Helpers ---
+def known_category(category):
+    """True if category (pack namespace ignored) is one the study game knows how to place."""
+    name = category.split(": ", 1)[-1]
+    if name in EXAM_DOMAIN_WEIGHTS:
+        return True
+    match = re.fullmatch(r"(?:Commands|Concepts & Terms) \((.+)\)", name)
+    return bool(match) and match.group(1) in KNOWN_CATEGORY_TOPICS
+
+
+def lint_question_job(job):
+    """Validate one chunk of a question source.
+
+    job is (source name, number of the first entry, entries or raw JSON bytes, namespace or None).
+    Returns (source name, [(question tuple, entry number)], [error messages]).
+    """
+    source, first_number, payload, namespace = job
+    if isinstance(payload, bytes): # A whole pack/source file, same layout as question packs
+        try:
+            pack = json.loads(payload.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return source, [], [f"{source}: not valid JSON ({e})"]
+        if isinstance(pack, list):
+            pack = {"questions": pack}
+        if not isinstance(pack, dict) or not isinstance(pack.get("questions"), list):
+            return source, [], [f"{source}: expected an object with a 'questions' list"]
+        if isinstance(pack.get("namespace"), str) and pack["namespace"].strip():
+            namespace = pack["namespace"].strip()
+        payload = pack["questions"]
+    valid, errors = [], []
+    for number, entry in enumerate(payload, start=first_number):
+        question, error = validate_question(entry)
+        if not error and not question[4].strip():
+            error = "explanation is empty"
+        if not error and not known_category(question[3]):
+            error = f"unknown category {question[3]!r}"
+        if error:
+            errors.append(f"{source} question {number}: {error}")
+            continue
+        if namespace:
+            question = (question[0], question[1], question[2], f"{namespace}: {question[3]}", question[4])
+        valid.append((question, number))
+    return source, valid, errors
+
+
+def search_tokens(text):
+    """Lower-case words/command tokens used by the compiled bank's search index."""
+    return set(re.findall(r"[a-z0-9][a-z0-9_./-]*", text.lower()))
+
+
+def read_compiled_bank(path):
+    """Map a compiled bank artifact and unmarshal it. Raises ValueError for a foreign or outdated file."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if mapped[:len(COMPILED_BANK_MAGIC)] != COMPILED_BANK_MAGIC:
+            raise ValueError("not a compiled question bank")
+        with memoryview(mapped) as view, view[len(COMPILED_BANK_MAGIC):] as payload:
+            artifact = marshal.loads(payload) # Reads straight from the mapping, no intermediate copy
+    if not isinstance(artifact, dict) or artifact.get("version") != COMPILED_BANK_VERSION:
+        raise ValueError(f"unsupported compiled bank version {artifact.get('version') if isinstance(artifact, dict) else None!r}")
+    return artifact
+
+
+# --- Question Extraction Helpers ---
+def extract_source_files(directory):
+    """The game versions in directory that carry a question bank, newest first (main file before its test copy)."""
+    versions = []
+    for name in os.listdir(directory):
+        match = EXTRACT_SOURCE_PATTERN.fullmatch(name)
+        if match:
+            version = int(match.group(2) or 1) # d.py / testd.py are version 1
+            versions.append(((-version, bool(match.group(1))), os.path.join(directory, name)))
+    return [file_path for _, file_path in sorted(versions)]
+
+
+def _iter_statements(statements):
+    """Yield statements in source order, descending into compound statements but never into expressions."""
+    pending = list(reversed(statements))
+    while pending:
+        node = pending.pop()
+        yield node
+        for field in ("body", "handlers", "orelse", "finalbody"):
+            pending.extend(reversed(getattr(node, field, None) or []))
+
+
+def extract_question_literals(file_path):
+    """Harvest the literal question lists from one file's load_questions without importing or running it.
+
+    Only list displays assigned (or passed to extend()) inside an EXTRACT_FUNCTION_NAMES function are
+    evaluated, with ast.literal_eval.
+    Returns (file path, [question tuples], [error messages]).
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=file_path)
+    except (IOError, SyntaxError, ValueError) as e: # ValueError: source contains null bytes
+        return file_path, [], [f"{file_path}: could not parse ({e})"]
+    name = os.path.basename(file_path)
+    questions, errors = [], []
+    # Only statements are visited; the (large) list expressions are handed to literal_eval whole
+    for function in _iter_statements(tree.body):
+        if not isinstance(function, ast.FunctionDef) or function.name not in EXTRACT_FUNCTION_NAMES:
+            continue
+        for node in _iter_statements(function.body):
+            if isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.List):
+                literal_list = node.value
+            elif (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Attribute)
+                  and node.value.func.attr == "extend" and node.value.args and isinstance(node.value.args[0], ast.List)):
+                literal_list = node.value.args[0]
+            else:
+                continue
+            for element in literal_list.elts:
+                try:
+                    entry = ast.literal_eval(element)
+                except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                    errors.append(f"{name}:{element.lineno}: entry is not a literal")
+                    continue
+                if isinstance(entry, (list, tuple)) and len(entry) == 5 and isinstance(entry[1], tuple):
+                    entry = (entry[0], list(entry[1]), entry[2], entry[3], entry[4]) # Options written as a tuple
+                question, error = validate_question(entry)
+                if error:
+                    errors.append(f"{name}:{element.lineno}: {error}")
+                else:
+                    category = EXTRACT_CATEGORY_ALIASES.get(question[3], question[3])
+                    questions.append(question[:3] + (category,) + question[4:])
+    return file_path, questions, errors
+
+
+def question_content_hash(question):
+    """SHA-256 over a question's five fields; identical content in different files hashes the same."""
+    return hashlib.sha256(json.dumps(list(question), ensure_ascii=False, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def extract_question_banks(file_paths, output_path=EXTRACT_OUTPUT_FILE, max_workers=None):
+    """Extract every file's questions in parallel, merge them by content hash and write one pack-style JSON file.
+
+    Files are merged in the given order: when two versions hold different content for the same question
+    text, the earlier file's version is kept and the other files are listed under "variant_sources".
+    Files and sources are identified by the path given, so same-named files in different directories stay apart.
+    Returns a summary dict.
+    """
+    results = map_in_processes(extract_question_literals, file_paths, max_workers, "extraction") # Keeps file order
+
+    records, by_hash, by_text = [], {}, {}
+    files, errors = {}, []
+    for file_path, questions, file_errors in results:
+        files[file_path] = {"found": len(questions), "new": 0}
+        errors.extend(file_errors)
+        for question in questions:
+            digest = question_content_hash(question)
+            if digest in by_hash:
+                if file_path not in by_hash[digest]["sources"]:
+                    by_hash[digest]["sources"].append(file_path)
+                continue
+            text_key = " ".join(question[0].split()).casefold()
+            if text_key in by_text: # Same question, edited in another file
+                kept = by_text[text_key]
+                if file_path not in kept["variant_sources"]:
+                    kept["variant_sources"].append(file_path)
+                continue
+            question_text, options, correct_index, category, explanation = question
+            record = {"question": question_text, "options": options, "correct": correct_index, "category": category,
+                      "explanation": explanation, "hash": digest, "sources": [file_path], "variant_sources": []}
+            records.append(record)
+            by_hash[digest] = by_text[text_key] = record
+            files[file_path]["new"] += 1
+
+    document = {"format": "linux_plus_extracted_questions", "extracted": datetime.now().isoformat(timespec='seconds'),
+                "files": files, "questions": records}
+    temp_path = output_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=1, ensure_ascii=False)
+    os.replace(temp_path, output_path)
+    return {"files": files, "errors": errors, "questions": len(records),
+            "variants": sum(1 for record in records if record["variant_sources"])}
+
+
+# --- Trend Analytics ---
+class HistoryAnalytics:
+    """Columnar NumPy view of every recorded attempt, used for trend statistics.
+
+    The arrays are built once from study_history and then extended with attempts recorded
+    through update_history, so reopening the stats screens does not re-read the history.
+    """
+    def __init__(self, game):
+        self.game = game
+        self._columns = None # {"ts": int64 seconds, "correct": bool, "qid": int32, "cat": int16}
+        self._pending = [] # (ts, correct, qid, cat) recorded since the arrays were last concatenated
+        self._question_ids = {} # Question text -> qid
+        self._category_ids = {} # Category name -> cat code
+        self._history_id = None
+        self._attempts_seen = 0 # history["total_attempts"] the columns correspond to
+        self._summary = None
+
+    @property
+    def available(self):
+        return np is not None
+
+    def _category_code(self, category):
+        if not category:
+            return -1
+        return self._category_ids.setdefault(category, len(self._category_ids))
+
+    def record(self, question_text, category, timestamp, is_correct):
+        """Append one attempt (called from update_history). Ignored until the arrays have been built."""
+        if np is None or self._columns is None:
+            return
+        try:
+            ts = int(np.datetime64(timestamp, 's').astype(np.int64))
+        except ValueError:
+            return
+        qid = self._question_ids.setdefault(question_text, len(self._question_ids))
+        self._pending.append((ts, bool(is_correct), qid, self._category_code(category)))
+        self._attempts_seen += 1
+        self._summary = None
+
+    def _load(self):
+        """Flatten study_history into columns (one pass over the per-question attempt lists)."""
+        history = self.game.study_history
+        self.game.ensure_category_loaded(None) # Needed to map question texts to categories
+        text_to_category = {q[0]: q[3] for q in self.game.questions if len(q) > 3}
+        self._question_ids, self._category_ids, self._pending = {}, {}, []
+        timestamps, correct, qids, cats = [], [], [], []
+        for q_text, stats in history.get("questions", {}).items():
+            attempts = stats.get("history") if isinstance(stats, dict) else None
+            if not isinstance(attempts, list) or not attempts:
+                continue
+            qid = self._question_ids.setdefault(q_text, len(self._question_ids))
+            cat = self._category_code(text_to_category.get(q_text))
+            for attempt in attempts:
+                if isinstance(attempt, dict) and isinstance(attempt.get("timestamp"), str):
+                    timestamps.append(attempt["timestamp"])
+                    correct.append(bool(attempt.get("correct")))
+                    qids.append(qid)
+                    cats.append(cat)
+        try:
+            ts = np.array(timestamps, dtype='datetime64[s]').astype(np.int64)
+            keep = np.ones(len(ts), dtype=bool)
+        except ValueError: # At least one malformed timestamp: convert one by one and drop the bad ones
+            parsed = []
+            for value in timestamps:
+                try:
+                    parsed.append(np.datetime64(value, 's').astype(np.int64))
+                except ValueError:
+                    parsed.append(-1)
+            ts = np.array(parsed, dtype=np.int64)
+            keep = ts >= 0
+        self._columns = {
+            "ts": ts[keep],
+            "correct": np.array(correct, dtype=bool)[keep],
+            "qid": np.array(qids, dtype=np.int32)[keep],
+            "cat": np.array(cats, dtype=np.int16)[keep],
+        }
+        self._history_id = id(history)
+        self._attempts_seen = history.get("total_attempts", 0)
+        self._summary = None
+
+    def columns(self):
+        """Return the attempt columns, rebuilding them if the history object was replaced or changed externally."""
+        if np is None:
+            return None
+        history = self.game.study_history
+        if (self._columns is None or self._history_id != id(history)
+                or self._attempts_seen != history.get("total_attempts", 0)):
+            self._load()
+        if self._pending:
+            extra = np.array(self._pending, dtype=np.int64).reshape(-1, 4)
+            self._columns = {
+                "ts": np.concatenate([self._columns["ts"], extra[:, 0]]),
+                "correct": np.concatenate([self._columns["correct"], extra[:, 1].astype(bool)]),
+                "qid": np.concatenate([self._columns["qid"], extra[:, 2].astype(np.int32)]),
+                "cat": np.concatenate([self._columns["cat"], extra[:, 3].astype(np.int16)]),
+            }
+            self._pending = []
+        return self._columns
+
+    @staticmethod
+    def _forecast(days, hits, counts, current_accuracy):
+        """Weighted linear fit of daily accuracy; returns (status, date or None)."""
+        if current_accuracy >= EXAM_READY_ACCURACY:
+            return "ready", None
+        if len(days) < 3:
+            return "insufficient", None
+        daily_accuracy = hits / counts
+        slope, intercept = np.polyfit(days.astype(np.float64), daily_accuracy, 1, w=np.sqrt(counts))
+        if slope <= 1e-6:
+            return "flat", None
+        target_day = (EXAM_READY_ACCURACY - intercept) / slope
+        target_day = max(target_day, float(days[-1]))
+        return "forecast", np.datetime64(int(target_day), 'D').item() # Day number -> datetime.date
+
+    def summary(self):
+        """Compute rolling accuracy, learning curves, retention decay and exam-ready forecasts (cached)."""
+        if np is None:
+            return None
+        cols = self.columns()
+        if self._summary is not None:
+            return self._summary
+        ts, correct, qid, cat = cols["ts"], cols["correct"], cols["qid"], cols["cat"]
+        total = len(ts)
+        result = {"attempts": total}
+        if total == 0:
+            self._summary = result
+            return result
+
+        # Rolling accuracy over the most recent attempts
+        order = np.argsort(ts) # Ties between identical timestamps do not matter here
+        outcomes = correct[order].astype(np.float64)
+        window = min(ANALYTICS_ROLLING_WINDOW, total)
+        running = np.concatenate(([0.0], np.cumsum(outcomes)))
+        rolling = (running[window:] - running[:-window]) / window
+        result["window"] = window
+        result["rolling_current"] = float(rolling[-1])
+        result["rolling_previous"] = float(rolling[-1 - window]) if len(rolling) > window else None
+
+        # Learning curves: accuracy per block of ANALYTICS_CURVE_BLOCK attempts within each category.
+        # A stable sort of the time-ordered rows by category keeps each category chronological.
+        names = sorted(self._category_ids, key=self._category_ids.get)
+        by_cat = order[np.argsort(cat[order], kind='stable')]
+        cat_sorted, correct_sorted = cat[by_cat], correct[by_cat]
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(cat_sorted)) + 1))
+        group_sizes = np.diff(np.concatenate((starts, [total])))
+        rank = np.arange(total) - np.repeat(starts, group_sizes)
+        block = rank // ANALYTICS_CURVE_BLOCK
+        valid = cat_sorted >= 0
+        curves = {}
+        recent_accuracy = {} # Category code -> accuracy over its last ANALYTICS_ROLLING_WINDOW attempts
+        group_running = np.concatenate(([0.0], np.cumsum(correct_sorted)))
+        ends = starts + group_sizes
+        tails = np.maximum(starts, ends - ANALYTICS_ROLLING_WINDOW)
+        for start, end, tail in zip(starts.tolist(), ends.tolist(), tails.tolist()):
+            recent_accuracy[int(cat_sorted[start])] = (group_running[end] - group_running[tail]) / (end - tail)
+        if valid.any() and names:
+            blocks = int(block.max()) + 1
+            key = cat_sorted[valid].astype(np.int64) * blocks + block[valid]
+            counts = np.bincount(key, minlength=len(names) * blocks).reshape(len(names), blocks)
+            hits = np.bincount(key, weights=correct_sorted[valid], minlength=len(names) * blocks).reshape(len(names), blocks)
+            for code, name in enumerate(names):
+                filled = counts[code] > 0
+                if filled.any():
+                    curves[name] = (hits[code][filled] / counts[code][filled])[-ANALYTICS_CURVE_POINTS:].tolist()
+        result["curves"] = curves
+
+        # Retention decay: accuracy of repeat attempts by time since the previous attempt of that question
+        q_keys = qid[order]
+        if len(self._question_ids) < 2 ** 16:
+            q_keys = q_keys.astype(np.uint16) # Lets NumPy use its radix sort for the stable grouping
+        by_question = order[np.argsort(q_keys, kind='stable')]
+        q_sorted, t_sorted, c_sorted = qid[by_question], ts[by_question], correct[by_question]
+        repeat = q_sorted[1:] == q_sorted[:-1]
+        gaps = (t_sorted[1:] - t_sorted[:-1])[repeat]
+        gap_bins = np.searchsorted(RETENTION_GAP_EDGES, gaps, side='right')
+        gap_counts = np.bincount(gap_bins, minlength=len(RETENTION_GAP_LABELS))
+        gap_hits = np.bincount(gap_bins, weights=c_sorted[1:][repeat], minlength=len(RETENTION_GAP_LABELS))
+        result["retention"] = [
+            (label, int(gap_counts[i]), (gap_hits[i] / gap_counts[i]) if gap_counts[i] else None)
+            for i, label in enumerate(RETENTION_GAP_LABELS)
+        ]
+
+        # Exam-ready forecasts from daily accuracy trends (overall and per category)
+        first_day = int(ts.min()) // 86400
+        day_index = ts // 86400 - first_day # Dense day offsets, so bincount replaces a sort-based unique
+        span = int(day_index.max()) + 1
+        days = np.arange(first_day, first_day + span)
+        day_counts = np.bincount(day_index, minlength=span)
+        day_hits = np.bincount(day_index, weights=correct, minlength=span)
+        active_days = day_counts > 0
+        result["forecast"] = self._forecast(days[active_days], day_hits[active_days], day_counts[active_days],
+                                            result["rolling_current"])
+        category_forecasts = {}
+        if valid.any() and names:
+            # One bincount over (category, day) pairs gives every category's daily totals at once
+            known = cat >= 0
+            key = cat[known].astype(np.int64) * span + day_index[known]
+            cat_day_counts = np.bincount(key, minlength=len(names) * span).reshape(len(names), span)
+            cat_day_hits = np.bincount(key, weights=correct[known], minlength=len(names) * span).reshape(len(names), span)
+            for code, name in enumerate(names):
+                active = cat_day_counts[code] > 0
+                if code in recent_accuracy and active.any():
+                    category_forecasts[name] = self._forecast(days[active], cat_day_hits[code][active],
+                                                              cat_day_counts[code][active], recent_accuracy[code])
+        result["category_forecasts"] = category_forecasts
+        self._summary = result
+        return result
+
+    @staticmethod
+    def _forecast_text(forecast):
+        status, date = forecast
+        if status == "ready":
+            return f"ready now (>= {EXAM_READY_ACCURACY:.0%})", "correct"
+        if status == "forecast":
+            return f"~{date.isoformat()}", "neutral"
+        if status == "flat":
+            return "no upward trend yet", "incorrect"
+        return "needs 3+ days of practice", "dim"
+
+    def report_lines(self):
+        """Render the summary as [(text, tag)] lines shared by the CLI and the GUI stats views."""
+        if np is None:
+            return [("  Trend analytics need NumPy (pip install numpy).", "dim")]
+        result = self.summary()
+        if not result or result["attempts"] == 0:
+            return [("  No timestamped attempts recorded yet.", "dim")]
+        lines = []
+        current = result["rolling_current"]
+        trend = ""
+        if result["rolling_previous"] is not None:
+            delta = (current - result["rolling_previous"]) * 100
+            trend = f" ({'+' if delta >= 0 else ''}{delta:.1f} pts vs previous {result['window']})"
+        lines.append((f"  Rolling accuracy (last {result['window']} attempts): {current:.1%}{trend}",
+                      "correct" if current >= 0.75 else ("neutral" if current >= 0.5 else "incorrect")))
+        forecast_text, forecast_tag = self._forecast_text(result["forecast"])
+        lines.append((f"  Exam-ready forecast ({EXAM_READY_ACCURACY:.0%} target): {forecast_text}", forecast_tag))
+        lines.append(("", "value"))
+        lines.append((f"  Learning curves (accuracy per {ANALYTICS_CURVE_BLOCK} attempts, oldest -> newest):", "label"))
+        if not result["curves"]:
+            lines.append(("    No attempts could be matched to a category.", "dim"))
+        for name, points in sorted(result["curves"].items()):
+            curve = " -> ".join(f"{p:.0%}" for p in points)
+            forecast_text, forecast_tag = self._forecast_text(result["category_forecasts"].get(name, ("insufficient", None)))
+            lines.append((f"    {name}: {curve}", "value"))
+            lines.append((f"      exam-ready: {forecast_text}", forecast_tag))
+        lines.append(("", "value"))
+        lines.append(("  Retention (accuracy on repeats by time since last attempt):", "label"))
+        for label, count, accuracy in result["retention"]:
+            if count:
+                lines.append((f"    {label.rjust(6)}: {accuracy:.1%} of {count} repeats", "value"))
+            else:
+                lines.append((f"    {label.rjust(6)}: no repeats", "dim"))
+        return lines
+
+
+# --- Weak Spot Index ---
+def recent_miss_mask(stats):
+    """Bit i is set when the i-th most recent attempt was wrong (last WEAK_SPOT_MASK_BITS attempts only)."""
+    attempts = stats.get("history") if isinstance(stats, dict) else None
+    if not isinstance(attempts, list):
+        return 0
+    mask = 0
+    for attempt in attempts[-WEAK_SPOT_MASK_BITS:]:
+        mask = (mask << 1) | (0 if isinstance(attempt, dict) and attempt.get("correct") else 1)
+    return mask
+
+
+class WeakSpotIndex:
+    """Questions currently below the weak-spot thresholds, bucketed by accuracy band.
+
+    Built on first use from the history index (counts and recent-miss masks, no attempt records are
+    parsed) and then kept current by update_history: an answer moves at most one question between
+    buckets, in constant time. Buckets are lists with a position map, so removal is a swap with the last.
+    """
+    def __init__(self, game, accuracy=WEAK_SPOT_ACCURACY, recent_attempts=WEAK_SPOT_RECENT_ATTEMPTS):
+        self.game = game
+        self.accuracy = accuracy
+        self.recent_attempts = min(max(0, recent_attempts), WEAK_SPOT_MASK_BITS)
+        self._buckets = None # Band -> list of question texts; None until first use
+        self._positions = {} # Question text -> (band, position in that band's list)
+        self._stats = {} # Question text -> [correct, attempts, recent miss mask]
+        self._history_id = None
+        self._question_index = {} # Question text -> index in game.questions
+        self._questions_seen = -1 # len(game.questions) the text map was built for
+
+    def __len__(self):
+        self._ensure_built()
+        return len(self._positions)
+
+    def _band(self, correct, attempts, recent):
+        """Accuracy band of a weak question, or None when it is not weak."""
+        if not attempts:
+            return None
+        accuracy = correct / attempts
+        if accuracy >= self.accuracy and not recent & ((1 << self.recent_attempts) - 1):
+            return None
+        return min(WEAK_SPOT_BANDS - 1, int(accuracy * WEAK_SPOT_BANDS))
+
+    def _place(self, text, band):
+        current = self._positions.get(text)
+        if current is not None:
+            if current[0] == band:
+                return
+            bucket = self._buckets[current[0]]
+            last = bucket.pop()
+            if last != text:
+                bucket[current[1]] = last
+                self._positions[last] = current
+            del self._positions[text]
+        if band is not None:
+            bucket = self._buckets[band]
+            self._positions[text] = (band, len(bucket))
+            bucket.append(text)
+
+    def _ensure_built(self):
+        history = self.game.study_history
+        if self._buckets is not None and self._history_id == id(history):
+            return
+        self._buckets = [[] for _ in range(WEAK_SPOT_BANDS)]
+        self._positions, self._stats = {}, {}
+        self._history_id = id(history)
+        questions = history.get("questions", {})
+        lazy = isinstance(questions, LazyQuestionHistory)
+        for text in list(questions):
+            if lazy:
+                correct, attempts = questions.peek_counts(text)
+                recent = questions.peek_recent(text)
+            else:
+                stats = questions[text]
+                if not isinstance(stats, dict):
+                    continue
+                correct, attempts, recent = stats.get("correct", 0), stats.get("attempts", 0), recent_miss_mask(stats)
+            self._stats[text] = [correct, attempts, recent]
+            self._place(text, self._band(correct, attempts, recent))
+
+    def record(self, question_text, is_correct):
+        """Apply one answer (called from update_history). Ignored until the index has been built."""
+        if self._buckets is None or self._history_id != id(self.game.study_history):
+            return
+        stats = self._stats.setdefault(question_text, [0, 0, 0])
+        if is_correct:
+            stats[0] += 1
+        stats[1] += 1
+        stats[2] = ((stats[2] << 1) | (0 if is_correct else 1)) & ((1 << WEAK_SPOT_MASK_BITS) - 1)
+        self._place(question_text, self._band(*stats))
+
+    def _eligible(self, category_filter=None, exclude=()):
+        """Per band, the game.questions indices of weak questions that match the filter and are not excluded."""
+        self._ensure_built()
+        questions = self.game.questions
+        if self._questions_seen != len(questions):
+            self._question_index = {q[0]: i for i, q in enumerate(questions)}
+            self._questions_seen = len(questions)
+        exclude = set(exclude)
+        bands = []
+        for bucket in self._buckets:
+            indices = []
+            for text in bucket:
+                index = self._question_index.get(text)
+                if index is None or index in exclude:
+                    continue
+                if category_filter is None or (len(questions[index]) > 3 and questions[index][3] == category_filter):
+                    indices.append(index)
+            bands.append(indices)
+        return bands
+
+    def count(self, category_filter=None):
+        """Number of weak questions in the loaded bank for the filter."""
+        return sum(len(indices) for indices in self._eligible(category_filter))
+
+    def pick(self, rng, category_filter=None, exclude=()):
+        """Index of a weak question (weaker bands are drawn more often), or -1 when none is left.
+
+        Bucket order depends on history insertion order and earlier swap-removes, so the band is sorted
+        before drawing: the same RNG state picks the same question from a rebuilt index (replays).
+        """
+        bands = [(band, indices) for band, indices in enumerate(self._eligible(category_filter, exclude)) if indices]
+        if not bands:
+            return -1
+        _, indices = rng.choices(bands, weights=[WEAK_SPOT_BANDS - band for band, _ in bands], k=1)[0]
+        return rng.choice(sorted(indices))
+
+
+# --- Question Coverage Bitset ---
+BYTE_POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+
+
+def popcount(value):
+    """Number of set bits in a non-negative int (int.bit_count where available)."""
+    return value.bit_count() if hasattr(value, "bit_count") else bin(value).count("1")
+
+
+def nth_set_bit(value, n):
+    """Position of the n-th (0-based) set bit of value, found a byte at a time."""
+    for byte_index, byte in enumerate(value.to_bytes((value.bit_length() + 7) // 8, 'little')):
+        count = BYTE_POPCOUNT[byte]
+        if n >= count:
+            n -= count
+            continue
+        for bit in range(8):
+            if byte >> bit & 1:
+                if n == 0:
+                    return byte_index * 8 + bit
+                n -= 1
+    raise ValueError("not enough set bits")
+
+
+def question_bank_fingerprint(sorted_texts):
+    """Short hash of the bank's sorted question texts; a stored bitset is only valid for the same bank."""
+    digest = hashlib.sha256()
+    for text in sorted_texts:
+        digest.update(text.encode('utf-8') + b"\0")
+    return digest.hexdigest()[:16]
+
+
+class AttemptedBitset:
+    """One bit per bank question, set once it has been attempted; persisted as history["attempted"].
+
+    Bit positions follow the sorted question texts, so the stored bits carry the bank fingerprint and the
+    total_attempts they correspond to. If either no longer matches (another bank, or attempts recorded by an
+    older version), the bits are rebuilt once from the history's question keys. Coverage is a popcount of
+    the bits ANDed with a per-category mask, so the stats screens never scan the question records.
+    """
+    def __init__(self, game):
+        self.game = game
+        self._bits = None # bytearray; None until first use
+        self._positions = {} # Question text -> bit position
+        self._texts = [] # Bit position -> question text
+        self._question_index = {} # Question text -> index in game.questions
+        self._category_masks = {} # Category -> int with the bits of its questions
+        self._fingerprint = None
+        self._history_id = None
+        self._questions_seen = -1 # len(game.questions) the positions were laid out for
+
+    def _attempted_texts(self):
+        return [self._texts[byte_index * 8 + bit] for byte_index, byte in enumerate(self._bits) if byte
+                for bit in range(8) if byte >> bit & 1]
+
+    def _set(self, text):
+        position = self._positions.get(text)
+        if position is not None:
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def _ensure_built(self):
+        history = self.game.study_history
+        if self._bits is not None and self._history_id == id(history) and self._questions_seen == len(self.game.questions):
+            return
+        # The bank grew (segments loaded later): keep what this history already had
+        attempted = self._attempted_texts() if self._bits is not None and self._history_id == id(history) else None
+        self.game.ensure_category_loaded(None)
+        questions = self.game.questions
+        self._texts = sorted({q[0] for q in questions})
+        self._positions = {text: position for position, text in enumerate(self._texts)}
+        self._question_index = {}
+        category_bits = {}
+        for index, q in enumerate(questions):
+            self._question_index.setdefault(q[0], index)
+            if len(q) > 3:
+                position = self._positions[q[0]]
+                mask = category_bits.setdefault(q[3], bytearray((len(self._texts) + 7) // 8))
+                mask[position >> 3] |= 1 << (position & 7)
+        self._category_masks = {category: int.from_bytes(mask, 'little') for category, mask in category_bits.items()}
+        self._fingerprint = question_bank_fingerprint(self._texts)
+        self._history_id = id(history)
+        self._questions_seen = len(questions)
+        self._bits = bytearray((len(self._texts) + 7) // 8)
+
+        stored = history.get("attempted")
+        if attempted is None and isinstance(stored, dict) and stored.get("fingerprint") == self._fingerprint \
+                and stored.get("total_attempts") == history.get("total_attempts", 0) \
+                and isinstance(stored.get("bits"), str) and len(stored["bits"]) == 2 * len(self._bits):
+            try:
+                self._bits = bytearray.fromhex(stored["bits"])
+                return
+            except ValueError:
+                pass # Damaged: rebuilt from the question keys below
+        if attempted is None:
+            attempted = [text for text in history.get("questions", {}) if self.game.question_counts(text)[1] > 0]
+        for text in attempted:
+            self._set(text)
+
+    def record(self, question_text):
+        """Mark a question attempted (called from update_history). Ignored until the bitset has been built."""
+        if self._bits is None:
+            return
+        self._ensure_built()
+        self._set(question_text)
+
+    def store(self):
+        """Write the bits into the history before it is saved (nothing to do if they were never built)."""
+        history = self.game.study_history
+        if self._bits is None or self._history_id != id(history):
+            return
+        history["attempted"] = {"fingerprint": self._fingerprint, "total_attempts": history.get("total_attempts", 0),
+                                "bits": self._bits.hex()}
+
+    def _unseen(self, category_filter=None, exclude=()):
+        self._ensure_built()
+        if category_filter is None:
+            mask = (1 << len(self._texts)) - 1
+        else:
+            mask = self._category_masks.get(category_filter, 0)
+        unseen = mask & ~int.from_bytes(self._bits, 'little')
+        for index in exclude:
+            position = self._positions.get(self.game.questions[index][0]) if 0 <= index < len(self.game.questions) else None
+            if position is not None:
+                unseen &= ~(1 << position)
+        return unseen
+
+    def count_unseen(self, category_filter=None):
+        """Number of never-attempted questions for the filter."""
+        return popcount(self._unseen(category_filter))
+
+    def pick_unseen(self, rng, category_filter=None, exclude=()):
+        """Index in game.questions of a random never-attempted question, or -1 when there is none."""
+        unseen = self._unseen(category_filter, exclude)
+        remaining = popcount(unseen)
+        if not remaining:
+            return -1
+        return self._question_index[self._texts[nth_set_bit(unseen, rng.randrange(remaining))]]
+
+    def coverage(self):
+        """([(category, attempted, total)] sorted by category, attempted overall, total overall)."""
+        self._ensure_built()
+        attempted = int.from_bytes(self._bits, 'little')
+        rows = [(category, popcount(attempted & mask), popcount(mask)) for category, mask in sorted(self._category_masks.items())]
+        return rows, popcount(attempted), len(self._texts)
+
+
+# --- Session History ---
+def empty_session_columns():
+    return {name: [] for name in SESSION_COLUMNS}
+
+
+def session_columns(value):
+    """history["sessions"] as equal-length columns (SESSION_COLUMNS); d.py's list of session dicts is converted."""
+    if isinstance(value, dict) and all(isinstance(value.get(name), list) for name in SESSION_COLUMNS):
+        length = min(len(value[name]) for name in SESSION_COLUMNS)
+        return {name: value[name][:length] for name in SESSION_COLUMNS}
+    columns = empty_session_columns()
+    for session in value if isinstance(value, list) else ():
+        if not isinstance(session, dict):
+            continue
+        try:
+            started = int(datetime.strptime(str(session.get("date")), "%Y-%m-%d %H:%M").timestamp())
+        except ValueError:
+            started = 0
+        answered, correct = session.get("questions"), session.get("correct")
+        if not isinstance(answered, int) or not isinstance(correct, int):
+            continue
+        category = session.get("category")
+        values = {"started": started, "duration": 0, "mode": QUIZ_MODE_STANDARD, # d.py kept no duration
+                  "category": category if isinstance(category, str) else None, "answered": answered, "correct": correct}
+        for name in SESSION_COLUMNS:
+            columns[name].append(values[name])
+    return columns
+
+
+def _trend_text(points, fmt):
+    return " -> ".join(fmt.format(point) for point in points) if points else "not enough sessions"
+
+
+def session_report_lines(columns, recent=SESSION_REPORT_RECENT):
+    """Render the session-history view as [(text, tag)] lines shared by the CLI and the GUI stats views.
+
+    One pass over the columns: totals, per-mode averages and score/pace per block of SESSION_TREND_BLOCK sessions.
+    """
+    count = len(columns["started"])
+    if not count:
+        return [("  No quiz sessions recorded yet.", "dim")]
+    answered_total = sum(columns["answered"])
+    correct_total = sum(columns["correct"])
+    timed_answered = timed_seconds = 0
+    by_mode = {}
+    score_blocks, pace_blocks = [], []
+    block = [0, 0, 0, 0.0] # answered, correct, timed answered, timed seconds
+    for index, (mode, duration, answered, correct) in enumerate(zip(columns["mode"], columns["duration"], columns["answered"], columns["correct"])):
+        mode_stats = by_mode.setdefault(mode, [0, 0, 0])
+        mode_stats[0] += 1
+        mode_stats[1] += answered
+        mode_stats[2] += correct
+        block[0] += answered
+        block[1] += correct
+        if duration and duration > 0:
+            timed_answered += answered
+            timed_seconds += duration
+            block[2] += answered
+            block[3] += duration
+        if (index + 1) % SESSION_TREND_BLOCK == 0 or index + 1 == count:
+            if block[0]:
+                score_blocks.append(block[1] / block[0])
+            if block[3]:
+                pace_blocks.append(block[2] / (block[3] / 60))
+            block = [0, 0, 0, 0.0]
+
+    lines = [(f"  Sessions recorded: {count}    Questions answered: {answered_total}", "value")]
+    score = correct_total / answered_total if answered_total else 0
+    lines.append((f"  Average score: {score:.1%}", "correct" if score >= 0.75 else ("neutral" if score >= 0.5 else "incorrect")))
+    if timed_seconds:
+        lines.append((f"  Average pace: {timed_answered / (timed_seconds / 60):.1f} questions per minute", "value"))
+    lines.append(("", "value"))
+    lines.append((f"  Score per {SESSION_TREND_BLOCK} sessions (oldest -> newest): "
+                   f"{_trend_text(score_blocks[-ANALYTICS_CURVE_POINTS:], '{:.0%}')}", "label"))
+    lines.append((f"  Questions per minute per {SESSION_TREND_BLOCK} sessions: "
+                  f"{_trend_text(pace_blocks[-ANALYTICS_CURVE_POINTS:], '{:.1f}')}", "label"))
+    lines.append(("", "value"))
+    lines.append(("  By mode:", "label"))
+    for mode, (sessions, answered, correct) in sorted(by_mode.items()):
+        mode_score = f"{correct / answered:.1%}" if answered else "n/a"
+        lines.append((f"    {str(mode).ljust(10)} {sessions} sessions, {answered} questions, score {mode_score}", "value"))
+    lines.append(("", "value"))
+    lines.append(("  Most recent sessions (newest first):", "label"))
+    for index in range(count - 1, max(-1, count - 1 - recent), -1):
+        started, duration = columns["started"][index], columns["duration"][index]
+        answered, correct = columns["answered"][index], columns["correct"][index]
+        date_text = datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M") if started else "unknown date"
+        pace_text = f", {answered / (duration / 60):.1f}/min" if duration and duration > 0 else ""
+        duration_text = f", {duration / 60:.1f} min" if duration and duration > 0 else ""
+        session_score = correct / answered if answered else 0
+        lines.append((f"    {date_text}  {str(columns['mode'][index]).ljust(8)} {columns['category'][index] or 'All Categories'}: "
+                       f"{correct}/{answered} ({session_score:.0%}){duration_text}{pace_text}",
+                       "correct" if session_score >= 0.75 else ("neutral" if session_score >= 0.5 else "incorrect")))
+    return lines
+
+
+# --- Profiling Helpers ---
+class InstrumentedReport:
+    """Shared base of PerformanceProfiler and StallMonitor: method instrumentation and the report file.
+
+    Subclasses set enabled, report_file and _report_written, implement _call (the body of every
+    wrapped call) and build_report, and name themselves through report_name.
+    """
+    report_name = "Report" # "Profile" -> "Profile report written to ..."
+
+    def _call(self, name, func, args, kwargs):
+        raise NotImplementedError
+
+    def wrap(self, name, func):
+        """Return func wrapped so every call goes through self._call under the given name."""
+        def wrapped(*args, **kwargs):
+            return self._call(name, func, args, kwargs)
+        wrapped.__name__ = getattr(func, "__name__", name)
+        wrapped.__doc__ = getattr(func, "__doc__", None)
+        return wrapped
+
+    def instrument(self, obj, method_names, prefix):
+        """Replace the named bound methods on obj with wrappers (instance attributes)."""
+        if not self.enabled:
+            return
+        for name in method_names:
+            method = getattr(obj, name, None)
+            if callable(method):
+                setattr(obj, name, self.wrap(f"{prefix}:{name.strip('_')}", method))
+
+    def _report_title(self):
+        return f"Linux+ Study Game - {self.report_name} Report ({datetime.now().isoformat(timespec='seconds')})"
+
+    def _has_report(self):
+        """Whether there is anything to write; overridden when a run can end before data is collected."""
+        return self.enabled
+
+    def write_report(self):
+        """Write the report to self.report_file (once). Safe to register with atexit."""
+        if self._report_written or not self._has_report():
+            return
+        self._report_written = True
+        try:
+            with open(self.report_file, 'w', encoding='utf-8') as f:
+                f.write(self.build_report())
+            print(f"{self.report_name} report written to {os.path.abspath(self.report_file)}")
+        except IOError as e:
+            print(f"Error writing {self.report_name.lower()} report: {e}")
+
+
+class PerformanceProfiler(InstrumentedReport):
+    """Collects per-action timings (and optional cProfile data) for --profile runs."""
+    report_name = "Profile"
+
+    def __init__(self, enabled=False, use_cprofile=False, report_file=PROFILE_REPORT_FILE):
+        self.enabled = enabled
+        self.report_file = report_file
+        self.timings = {} # Action name -> list of durations in seconds
+        self._cprofile = cProfile.Profile() if (enabled and use_cprofile) else None
+        self._depth = 0 # Nesting level, cProfile is only toggled by the outermost action
+        self._report_written = False
+        self.stat_sources = {} # Name -> callable returning {"hits", "misses", "entries", "seconds"}
+
+    @contextmanager
+    def track(self, action):
+        """Context manager timing one action. Does nothing when profiling is disabled."""
+        if not self.enabled:
+            yield
+            return
+        outermost = self._depth == 0
+        self._depth += 1
+        if outermost and self._cprofile:
+            self._cprofile.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if outermost and self._cprofile:
+                self._cprofile.disable()
+            self._depth -= 1
+            self.timings.setdefault(action, []).append(elapsed)
+
+    def _call(self, action, func, args, kwargs):
+        with self.track(action):
+            return func(*args, **kwargs)
+
+    def register_stats(self, name, source):
+        """Add a cache (or similar) whose counters are listed in the report."""
+        self.stat_sources[name] = source
+
+    @staticmethod
+    def _percentile(sorted_values, pct):
+        """Nearest-rank percentile of an already sorted list."""
+        if not sorted_values:
+            return 0.0
+        rank = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+        return sorted_values[rank]
+
+    def build_report(self):
+        """Build the text report: per-action latency percentiles plus top cProfile functions."""
+        lines = [self._report_title(), ""]
+        if not self.timings:
+            lines.append("No actions were recorded.")
+        else:
+            name_width = max(len("Action"), max(len(name) for name in self.timings))
+            lines.append(f"{'Action'.ljust(name_width)}  {'Calls':>6}  {'Total ms':>10}  {'Mean ms':>9}  {'p50 ms':>9}  {'p90 ms':>9}  {'p99 ms':>9}  {'Max ms':>9}")
+            lines.append("-" * (name_width + 80))
+            # Most expensive actions first
+            for name, durations in sorted(self.timings.items(), key=lambda item: -sum(item[1])):
+                ordered = sorted(durations)
+                total = sum(ordered)
+                lines.append(
+                    f"{name.ljust(name_width)}  {len(ordered):>6}  {total * 1000:>10.2f}  {total / len(ordered) * 1000:>9.3f}  "
+                    f"{self._percentile(ordered, 50) * 1000:>9.3f}  {self._percentile(ordered, 90) * 1000:>9.3f}  "
+                    f"{self._percentile(ordered, 99) * 1000:>9.3f}  {ordered[-1] * 1000:>9.3f}"
+                )
+        if self.stat_sources:
+            lines.extend(["", f"{'Cache'.ljust(20)}  {'Hits':>8}  {'Misses':>8}  {'Hit %':>6}  {'Entries':>8}  {'Build ms':>9}",
+                          "-" * 68])
+            for name, source in self.stat_sources.items():
+                stats = source()
+                lookups = stats["hits"] + stats["misses"]
+                hit_rate = (stats["hits"] / lookups * 100) if lookups else 0.0
+                lines.append(f"{name.ljust(20)}  {stats['hits']:>8}  {stats['misses']:>8}  {hit_rate:>6.1f}  "
+                             f"{stats['entries']:>8}  {stats['seconds'] * 1000:>9.3f}")
+        if self._cprofile:
+            lines.extend(["", f"Top {PROFILE_TOP_FUNCTIONS} functions by cumulative time:", ""])
+            stream = io.StringIO()
+            try:
+                stats = pstats.Stats(self._cprofile, stream=stream)
+                stats.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+                lines.append(stream.getvalue().strip())
+            except TypeError: # Raised by pstats when nothing was captured
+                lines.append("No cProfile data was captured.")
+        return "\n".join(lines) + "\n"
+
+
+# --- Responsiveness Monitor ---
+class StallMonitor(InstrumentedReport):
+    """Detects Tk event-loop stalls and attributes them to the handler that was running.
+
+    A heartbeat is scheduled with root.after every STALL_HEARTBEAT_MS; a beat that fires more than the
+    threshold late means the loop was blocked. Instrumented handlers record their longest stretch without
+    the loop being serviced (time spent in a nested loop, e.g. a messagebox, does not count), which is
+    what stalls are attributed to and what assert_max_block() checks.
+    """
+    report_name = "GUI Responsiveness"
+
+    def __init__(self, enabled=False, threshold_ms=STALL_THRESHOLD_MS, interval_ms=STALL_HEARTBEAT_MS,
+                 report_file=STALL_REPORT_FILE, max_block_ms=None):
+        self.enabled = enabled
+        self.threshold = threshold_ms / 1000.0
+        self.interval_ms = interval_ms
+        self.report_file = report_file
+        self.max_block_ms = max_block_ms # Handlers blocking longer are listed as violations
+        self.root = None
+        self.after_id = None
+        self.last_beat = None
+        self.beats = 0
+        self.active = [] # Running handlers, outermost first: [name, started, last_serviced, longest_block]
+        self.recent = [] # (name, block seconds, depth) of handlers finished since the last beat
+        self.blocks = {} # Handler name -> list of longest-block durations (seconds), one per call
+        self.stalls = [] # (seconds since start, lateness seconds, handler, slowest nested handler)
+        self.violations = [] # (handler, block ms) over max_block_ms
+        self.started_at = None
+        self._report_written = False
+
+    def start(self, root):
+        """Begin the heartbeat once the main loop is running."""
+        if not self.enabled:
+            return
+        self.root = root
+        root.after_idle(self._first_beat)
+
+    def stop(self):
+        """Cancel the heartbeat (before the root window is destroyed)."""
+        if self.after_id is not None and self.root is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except tk.TclError:
+                pass # Root already gone
+        self.after_id = None
+
+    def _first_beat(self):
+        self.started_at = self.last_beat = time.perf_counter()
+        self.after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _beat(self):
+        now = time.perf_counter()
+        self.beats += 1
+        lateness = (now - self.last_beat) - self.interval_ms / 1000.0
+        if lateness > self.threshold:
+            # Blame the outermost handler with the longest block since the previous beat
+            candidates = list(self.recent) + [(frame[0], now - frame[2], depth) for depth, frame in enumerate(self.active)]
+            outer = [c for c in candidates if c[2] == 0]
+            nested = [c for c in candidates if c[2] > 0]
+            handler = max(outer, key=lambda c: c[1])[0] if outer else "(unattributed)"
+            inner = max(nested, key=lambda c: c[1]) if nested else None
+            self.stalls.append((now - self.started_at, lateness, handler, inner))
+        for frame in self.active: # Loop serviced: blocks inside running handlers restart here
+            frame[3] = max(frame[3], now - frame[2])
+            frame[2] = now
+        self.recent = []
+        self.last_beat = now
+        self.after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _call(self, name, func, args, kwargs):
+        """Record the longest block of one main-thread call."""
+        if threading.current_thread() is not threading.main_thread():
+            return func(*args, **kwargs) # A worker thread; not a Tk handler
+        started = time.perf_counter()
+        frame = [name, started, started, 0.0]
+        depth = len(self.active)
+        self.active.append(frame)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.active.pop()
+            block = max(frame[3], time.perf_counter() - frame[2])
+            self.blocks.setdefault(name, []).append(block)
+            self.recent.append((name, block, depth))
+            if self.max_block_ms is not None and block * 1000 > self.max_block_ms:
+                self.violations.append((name, block * 1000))
+
+    def max_blocks(self):
+        """Longest block per handler, in milliseconds."""
+        return {name: max(durations) * 1000 for name, durations in self.blocks.items()}
+
+    def assert_max_block(self, limit_ms=None):
+        """Raise AssertionError if any handler blocked the event loop for longer than limit_ms."""
+        limit_ms = self.max_block_ms if limit_ms is None else limit_ms
+        offenders = sorted(((name, ms) for name, ms in self.max_blocks().items() if ms > limit_ms), key=lambda item: -item[1])
+        if offenders:
+            details = ", ".join(f"{name} {ms:.1f}ms" for name, ms in offenders)
+            raise AssertionError(f"Handlers blocked the Tk event loop for more than {limit_ms}ms: {details}")
+
+    def build_report(self):
+        """Build the text report: stall summary, per-handler blocks and the worst stalls."""
+        lines = [self._report_title(), "",
+                 f"Heartbeat every {self.interval_ms}ms, stall threshold {self.threshold * 1000:.0f}ms.",
+                 f"Beats: {self.beats}   Stalls: {len(self.stalls)}   "
+                 f"Time stalled: {sum(stall[1] for stall in self.stalls) * 1000:.0f}ms   "
+                 f"Worst: {max((stall[1] for stall in self.stalls), default=0.0) * 1000:.0f}ms"]
+        if self.blocks:
+            stall_counts = {}
+            for _, _, handler, _ in self.stalls:
+                stall_counts[handler] = stall_counts.get(handler, 0) + 1
+            name_width = max(len("Handler"), max(len(name) for name in self.blocks))
+            lines.extend(["", f"{'Handler'.ljust(name_width)}  {'Calls':>6}  {'Stalls':>6}  {'Mean block ms':>13}  {'Max block ms':>12}",
+                          "-" * (name_width + 47)])
+            for name, durations in sorted(self.blocks.items(), key=lambda item: -max(item[1])):
+                lines.append(f"{name.ljust(name_width)}  {len(durations):>6}  {stall_counts.get(name, 0):>6}  "
+                             f"{sum(durations) / len(durations) * 1000:>13.2f}  {max(durations) * 1000:>12.2f}")
+        if self.stalls:
+            lines.extend(["", f"Longest stalls (up to {STALL_REPORT_WORST}):"])
+            for at, lateness, handler, inner in sorted(self.stalls, key=lambda stall: -stall[1])[:STALL_REPORT_WORST]:
+                inner_text = f" (slowest inside: {inner[0]} {inner[1] * 1000:.0f}ms)" if inner else ""
+                lines.append(f"  +{at:8.2f}s  {lateness * 1000:8.0f}ms  {handler}{inner_text}")
+        if self.max_block_ms is not None:
+            lines.extend(["", f"Handlers over the {self.max_block_ms}ms block limit: {len(self.violations)}"])
+            for name, block_ms in self.violations:
+                lines.append(f"  {name}: {block_ms:.1f}ms")
+        return "\n".join(lines) + "\n"
+
+    def _has_report(self):
+        return self.enabled and self.started_at is not None # Nothing to report if the loop never ran
 
 
 # --- CLI Game Class ---
 class LinuxPlusStudyGame:
     """Handles the logic and Command-Line Interface for the study game."""
-    def __init__(self):
+    def __init__(self, profiler=None, packs_dir=QUESTION_PACKS_DIR, bank_dir=QUESTION_BANK_DIR,
+                 seed=None, replay_log_file=REPLAY_LOG_FILE, history_file=HISTORY_FILE, history_codec=None,
+                 compiled_bank_file=COMPILED_BANK_FILE, weak_accuracy=WEAK_SPOT_ACCURACY,
+                 weak_recent_attempts=WEAK_SPOT_RECENT_ATTEMPTS):
+        # All shuffling and selection goes through this RNG so a --seed run is reproducible
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.session_rng = self.rng # Reseeded per quiz session by start_replay_session
+        self.replay_log_file = replay_log_file
+        self.replay_session = None # Log record of the session in progress
+        self.session_record = None # Start, mode, category and running counts of the session in progress
+        self.session_token = 0 # Bumped per quiz session; a prefetch from an older session is discarded
+        self.selection_mode = QUIZ_MODE_STANDARD # Mode of the session in progress; QUIZ_MODE_WEAK changes how select_question picks
+        self.prefetched = None # (token, filter, question_data, index, rendered) picked during feedback
+        self.prefetch_thread = None
         self.questions = []
         self.score = 0
         self.total_questions_session = 0 # Track questions answered in the current session
         self.categories = set()
         self.answered_indices_session = []  # Track answered question indices in this session
-        self.history_file = HISTORY_FILE
-        self.study_history = self.load_history()
-        self.load_questions() # Load questions after initializing history
+        self.last_answer_time = None # Seconds taken to answer the last CLI question
+        self.raw_keys = False # Single-keypress answers/continue (--keys); falls back to input() off a terminal
+        self.pacer = Pacer() # All CLI pauses go through this (--pace / --fast)
+        self.frame_cache = FrameCache() # Pre-rendered welcome/menu screens
+        self.layout = TextLayout(self.frame_cache.width) # Width-aware wrapping for questions/explanations
+        self.history_file = history_file
+        self.history_codec = history_codec # None = pick from the history file's extension
+        self.analytics = HistoryAnalytics(self)
+        self.weak_spots = WeakSpotIndex(self, weak_accuracy, weak_recent_attempts)
+        self.coverage = AttemptedBitset(self)
+        # Profiler is a no-op unless --profile was given
+        self.profiler = profiler if profiler is not None else PerformanceProfiler()
+        self.profiler.instrument(self, ENGINE_PROFILED_METHODS, prefix="engine")
+        self.profiler.register_stats("CLI frame cache", self.frame_cache.stats)
+        self.profiler.register_stats("Text wrap cache", self.layout.stats)
+        with self.profiler.track("startup:load_history"):
+            self.study_history = self.load_history()
+        # Segmented bank state: category -> {"file", "count"}; None means the built-in bank is fully loaded
+        self.bank_dir = bank_dir
+        self.category_manifest = None
+        self.loaded_categories = set()
+        # Compiled bank: question table (IDs are positions) plus category / text / search indexes
+        self.compiled_bank_file = compiled_bank_file
+        self.compiled_bank = None
+        self.packs_dir = packs_dir
+        with self.profiler.track("startup:load_questions"):
+            if not (bank_dir and self.load_bank_manifest(bank_dir)):
+                self.load_questions() # Load questions after initializing history
+        self.question_packs = {} # Pack namespace -> number of questions merged from it
+        if packs_dir and os.path.isdir(packs_dir):
+            with self.profiler.track("startup:load_question_packs"):
+                self.load_question_packs(packs_dir)
         # For Verify Knowledge mode
-        self.verify_session_answers = [] # List of tuples: (question_data, user_answer_index, is_correct)
+        self.verify_session_answers = VerifyResults() # (question_data, user_answer_index, is_correct) with a running tally
 
     def _default_history(self):
         """Returns the default structure for study history."""
         return {
-            "sessions": [], # Could store session summaries later
+            "sessions": empty_session_columns(), # One list per SESSION_COLUMNS entry, one item per quiz session
             "questions": {}, # Stores stats per question text
             "categories": {}, # Stores stats per category name
             "total_correct": 0,
@@ -156,44 +2488,144 @@ class LinuxPlusStudyGame:
 
     def clear_screen(self):
         """Clear the terminal screen."""
+        if ansi_terminal():
+            sys.stdout.write(ANSI_CLEAR_SCREEN) # Same effect as `clear` without starting a process
+            sys.stdout.flush()
+            return
         os.system('cls' if os.name == 'nt' else 'clear')
 
     def load_history(self):
-        """Load study history from file if it exists."""
+        """Load study history from file if it exists.
+
+        Streaming-layout files only have their header parsed here; question records load on demand.
+        Older single-document JSON files are still read whole; save_history then writes the streaming
+        layout beside them (x.json -> x.jsonl) so versions that json.load the old file keep their data.
+        """
+        path = self.history_file
+        layout = history_file_layout(path)
+        if layout == "legacy" and history_file_layout(streaming_history_path(path)) == "stream":
+            path = self.history_file = streaming_history_path(path) # A previous save already moved on from the old file
+        elif layout == "missing":
+            legacy = legacy_history_path(path)
+            if legacy and os.path.exists(legacy):
+                print(f"{COLOR_INFO} Importing history from '{legacy}' (left unchanged); progress is saved to '{path}'. {COLOR_RESET}")
+                path = legacy
         try:
-            with open(self.history_file, 'r', encoding='utf-8') as f: # Specify encoding
-                history = json.load(f)
+            with open(path, 'rb') as f:
+                # Compressed files are inflated into memory once; plain files are read in place
+                codec = sniff_codec(f.read(8))
+                f.seek(0)
+                data = HISTORY_CODECS[codec].decompress(f.read()) if codec != "none" else None
+                stream = f if data is None else io.BytesIO(data)
+                header = None
+                first_line = stream.readline()
+                try:
+                    header = json.loads(first_line)
+                except ValueError:
+                    pass # Legacy indented JSON: the first line is just "{"
+                if isinstance(header, dict) and header.get("format") == HISTORY_STREAM_FORMAT:
+                    if header.get("version") != HISTORY_STREAM_VERSION:
+                        raise ValueError(f"unsupported history version {header.get('version')!r}")
+                    history = header
+                    index = history.pop("index", None)
+                    history.pop("format")
+                    history.pop("version")
+                    history["questions"] = LazyQuestionHistory(path, stream.tell(),
+                                                               index if isinstance(index, dict) else {}, data=data)
+                else:
+                    stream.seek(0)
+                    history = json.load(stream)
                 # Ensure all default keys exist
                 default = self._default_history()
                 for key, default_value in default.items():
                     history.setdefault(key, default_value)
                 # Basic type validation
-                if not isinstance(history.get("questions"), dict): history["questions"] = {}
+                if not isinstance(history.get("questions"), MutableMapping): history["questions"] = {}
                 if not isinstance(history.get("categories"), dict): history["categories"] = {}
-                if not isinstance(history.get("sessions"), list): history["sessions"] = []
+                history["sessions"] = session_columns(history.get("sessions")) # Also converts d.py's session list
                 if not isinstance(history.get("incorrect_review"), list): history["incorrect_review"] = []
                 return history
-        except (FileNotFoundError, json.JSONDecodeError):
+        except (FileNotFoundError, ValueError, EOFError, lzma.LZMAError): # JSONDecodeError is a ValueError; EOFError = truncated archive
             print(f"{COLOR_INFO} History file not found or invalid. Starting fresh. {COLOR_RESET}")
             return self._default_history()
         except Exception as e: # Catch other potential errors like permissions
-            print(f"{COLOR_ERROR} Error loading history file '{self.history_file}': {e} {COLOR_RESET}")
+            print(f"{COLOR_ERROR} Error loading history file '{path}': {e} {COLOR_RESET}")
             print(f"{COLOR_WARNING} Starting with empty history. {COLOR_RESET}")
             return self._default_history()
 
     def save_history(self):
-        """Save study history to file."""
+        """Save study history to file in the streaming layout (header line + one line per question).
+
+        Records that were never parsed this run are copied byte-for-byte from the old file.
+        """
+        if history_file_layout(self.history_file) == "legacy" and streaming_history_path(self.history_file) != self.history_file:
+            target = streaming_history_path(self.history_file)
+            print(f"{COLOR_WARNING} '{self.history_file}' is in the older single-document layout; saving to '{target}' instead. {COLOR_RESET}")
+            self.history_file = target
+        questions = self.study_history.get("questions", {})
+        lazy = isinstance(questions, LazyQuestionHistory)
+        temp_file = self.history_file + ".tmp"
+        self.coverage.store() # Header carries the attempted-question bits
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f: # Specify encoding
-                json.dump(self.study_history, f, indent=2)
+            # Lay out the records first so the header can carry their offsets
+            records, index, offset = [], {}, 0
+            for text in list(questions):
+                raw = questions.raw_record(text) if lazy else None
+                if raw is not None:
+                    correct, attempts = questions.peek_counts(text)
+                    recent = questions.peek_recent(text)
+                else:
+                    stats = questions[text]
+                    raw = json.dumps([text, stats], separators=(',', ':')).encode('utf-8')
+                    correct, attempts = (stats.get("correct", 0), stats.get("attempts", 0)) if isinstance(stats, dict) else (0, 0)
+                    recent = recent_miss_mask(stats)
+                records.append(raw)
+                index[text] = [offset, len(raw), correct, attempts, recent]
+                offset += len(raw) + 1 # Plus the newline
+            header = {"format": HISTORY_STREAM_FORMAT, "version": HISTORY_STREAM_VERSION} # First, so the layout is sniffable
+            header.update((key, value) for key, value in self.study_history.items() if key != "questions")
+            header["index"] = index
+            header_line = json.dumps(header, separators=(',', ':')).encode('utf-8') + b"\n"
+            records_offset = len(header_line)
+            codec = codec_for_path(self.history_file, self.history_codec)
+            data = None
+            if codec == "none":
+                with open(temp_file, 'wb') as f:
+                    f.write(header_line)
+                    for raw in records:
+                        f.write(raw + b"\n")
+            else:
+                # Keep the uncompressed image: lazy records are served from it after the save
+                data = header_line + b"".join(raw + b"\n" for raw in records)
+                with open_codec_file(temp_file, 'wb', codec) as f:
+                    f.write(data)
+            if lazy:
+                questions.close() # Windows cannot replace a file that is still open
+            os.replace(temp_file, self.history_file)
+            if lazy:
+                questions.rebase(self.history_file, records_offset, index, data=data)
         except IOError as e:
             print(f"{COLOR_ERROR} Error saving history: {e} {COLOR_RESET}")
         except Exception as e:
             print(f"{COLOR_ERROR} An unexpected error occurred during history save: {e} {COLOR_RESET}")
 
+    def release_history(self):
+        """Close the file a lazily loaded history reads records from, before the history is replaced."""
+        questions = self.study_history.get("questions")
+        if isinstance(questions, LazyQuestionHistory):
+            questions.close()
 
-    def load_questions(self):
-        """Load sample Linux+ questions, commands, and definitions."""
+    def reset_history(self):
+        """Replace the study history with an empty one (every known category at zero) and save it."""
+        self.release_history()
+        self.study_history = self._default_history()
+        for category in self.categories:
+            self.study_history["categories"].setdefault(category, {"correct": 0, "attempts": 0})
+        self.save_history()
+
+
+    def builtin_questions(self):
+        """Return the sample Linux+ questions, commands, and definitions built into this file."""
         # --- (Question data remains the same - truncated for brevity) ---
         # Note: Add your actual questions here
         # --- Existing Questions ---
@@ -4426,8 +6858,20 @@ class LinuxPlusStudyGame:
         ]
 
         # Combine all question lists
-        self.questions = existing_questions + command_questions + definition_questions
-        random.shuffle(self.questions) # Shuffle once on load
+        return existing_questions + command_questions + definition_questions
+
+    def load_questions(self):
+        """Load the questions: the compiled bank artifact when one exists, otherwise the built-in lists."""
+        if self.compiled_bank_file and os.path.isfile(self.compiled_bank_file):
+            try:
+                self.compiled_bank = read_compiled_bank(self.compiled_bank_file)
+            except (IOError, ValueError, EOFError, TypeError) as e: # marshal raises EOFError/ValueError on corrupt data
+                print(f"{COLOR_WARNING} Ignoring compiled bank '{self.compiled_bank_file}': {e}. Using built-in questions. {COLOR_RESET}")
+        if self.compiled_bank is not None:
+            self.questions = list(self.compiled_bank["questions"]) # Already validated, deduplicated tuples
+        else:
+            self.questions = self.builtin_questions()
+        self.rng.shuffle(self.questions) # Shuffle once on load
 
         self.categories = set(q[3] for q in self.questions if len(q) > 3) # Ensure index 3 exists
         # Ensure all categories from questions exist in history
@@ -4435,8 +6879,309 @@ class LinuxPlusStudyGame:
             self.study_history["categories"].setdefault(category, {"correct": 0, "attempts": 0})
         # Optional: self.save_history() # Save potentially updated history (might slow down startup)
 
-    def update_history(self, question_text, category, is_correct):
-        """Update study history with the result of the answered question."""
+    def load_bank_manifest(self, directory):
+        """Read only the segmented bank's manifest; category segments are faulted in later. Returns success."""
+        manifest_path = os.path.join(directory, BANK_MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            return False
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") != BANK_FORMAT_VERSION or not isinstance(manifest.get("categories"), dict):
+                raise ValueError(f"unsupported bank version {manifest.get('version')!r}")
+        except (IOError, ValueError, AttributeError) as e: # JSONDecodeError is a ValueError
+            print(f"{COLOR_WARNING} Ignoring question bank '{directory}': {e}. Using built-in questions. {COLOR_RESET}")
+            return False
+        self.category_manifest = manifest["categories"]
+        self.categories = set(self.category_manifest)
+        for category in self.categories:
+            self.study_history["categories"].setdefault(category, {"correct": 0, "attempts": 0})
+        return True
+
+    def ensure_category_loaded(self, category=None):
+        """Fault in the segment for category (every segment when category is None). No-op for the built-in bank."""
+        if self.category_manifest is None:
+            return
+        wanted = list(self.category_manifest) if category is None else [category]
+        for name in wanted:
+            if name in self.loaded_categories or name not in self.category_manifest:
+                continue
+            self.loaded_categories.add(name) # Mark first so a broken segment is not retried on every call
+            segment_path = os.path.join(self.bank_dir, self.category_manifest[name]["file"])
+            try:
+                with open(segment_path, 'r', encoding='utf-8') as f:
+                    segment = [tuple(q) for q in json.load(f)]
+            except (IOError, ValueError) as e:
+                print(f"{COLOR_ERROR} Error loading questions for '{name}' from {segment_path}: {e} {COLOR_RESET}")
+                continue
+            # Seeded per category, so the order does not depend on which segments were faulted in first
+            random.Random(f"{self.seed}:{name}").shuffle(segment)
+            self.questions.extend(segment)
+
+    def count_questions(self, category_filter=None):
+        """Number of questions available for the filter, answered from the manifest for unloaded segments."""
+        if self.category_manifest is None or (category_filter is not None and category_filter in self.loaded_categories):
+            if category_filter is None:
+                return len(self.questions)
+            return sum(1 for q in self.questions if len(q) > 3 and q[3] == category_filter) # Check length
+        if category_filter is None:
+            unloaded = sum(entry.get("count", 0) for name, entry in self.category_manifest.items() if name not in self.loaded_categories)
+            return len(self.questions) + unloaded
+        return self.category_manifest.get(category_filter, {}).get("count", 0) + sum(
+            1 for q in self.questions if len(q) > 3 and q[3] == category_filter) # Pack questions may share the name
+
+    def compile_question_bank(self, artifact_path=COMPILED_BANK_FILE, source_files=(), max_workers=None):
+        """Lint, deduplicate and index every question source into one load-ready artifact.
+
+        Sources are the built-in lists, each pack in the packs directory (namespaced as at runtime) and
+        any extra JSON files. Validation runs across worker processes. Returns a summary dict with the
+        lint errors and dropped duplicates.
+        """
+        jobs = []
+        builtin = self.builtin_questions()
+        for start in range(0, len(builtin), BANK_COMPILE_CHUNK):
+            jobs.append(("built-in", start + 1, builtin[start:start + BANK_COMPILE_CHUNK], None))
+        file_sources = []
+        if self.packs_dir and os.path.isdir(self.packs_dir):
+            file_sources += [(os.path.join(self.packs_dir, name), os.path.splitext(name)[0])
+                             for name in sorted(os.listdir(self.packs_dir)) if name.lower().endswith(QUESTION_PACK_EXTENSION)]
+        file_sources += [(file_path, None) for file_path in source_files]
+        errors = []
+        for file_path, namespace in file_sources:
+            try:
+                with open(file_path, 'rb') as f:
+                    jobs.append((file_path, 1, f.read(), namespace))
+            except IOError as e:
+                errors.append(f"{file_path}: could not read ({e})")
+
+        results = map_in_processes(lint_question_job, jobs, max_workers, "validation") # Keeps source order
+
+        # Drop duplicates (same text up to case and spacing); the first source wins
+        questions, seen, duplicates, sources = [], {}, [], {}
+        read_count = len(errors)
+        for source, valid, job_errors in results:
+            errors.extend(job_errors)
+            read_count += len(valid) + len(job_errors)
+            for question, number in valid:
+                key = " ".join(question[0].split()).casefold()
+                if key in seen:
+                    duplicates.append((question[0], seen[key], f"{source} question {number}"))
+                    continue
+                seen[key] = f"{source} question {number}"
+                questions.append(question)
+                sources[source] = sources.get(source, 0) + 1
+
+        categories, search = {}, {}
+        for question_id, (question_text, options, _, category, _) in enumerate(questions):
+            categories.setdefault(category, []).append(question_id)
+            for token in search_tokens(" ".join([question_text] + options)):
+                search.setdefault(token, []).append(question_id)
+        artifact = {
+            "format": "linux_plus_compiled_bank", "version": COMPILED_BANK_VERSION,
+            "built": datetime.now().isoformat(timespec='seconds'), "sources": sources,
+            "questions": questions, "categories": categories,
+            "text_ids": {q[0]: question_id for question_id, q in enumerate(questions)},
+            "search": search,
+        }
+        temp_path = artifact_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(COMPILED_BANK_MAGIC)
+            marshal.dump(artifact, f)
+        os.replace(temp_path, artifact_path)
+        return {"sources": sources, "read": read_count, "errors": errors, "duplicates": duplicates,
+                "questions": len(questions), "categories": len(categories), "tokens": len(search),
+                "bytes": os.path.getsize(artifact_path)}
+
+    def search_questions(self, query):
+        """Questions whose text or options contain every token of query (compiled search index when loaded)."""
+        tokens = search_tokens(query)
+        if not tokens:
+            return []
+        if self.compiled_bank is not None:
+            index = self.compiled_bank["search"]
+            matches = set.intersection(*(set(index.get(token, ())) for token in tokens))
+            table = self.compiled_bank["questions"]
+            return [table[question_id] for question_id in sorted(matches)]
+        self.ensure_category_loaded(None)
+        return [q for q in self.questions if len(q) >= 5 and tokens <= search_tokens(" ".join([q[0]] + list(q[1])))]
+
+    def write_question_bank(self, directory):
+        """Write every loaded question as a segmented bank (one JSON file per category plus a manifest)."""
+        self.ensure_category_loaded(None)
+        by_category = {}
+        for q_data in self.questions:
+            if len(q_data) >= 5:
+                by_category.setdefault(q_data[3], []).append(list(q_data))
+        os.makedirs(directory, exist_ok=True)
+        manifest = {"format": "linux_plus_bank", "version": BANK_FORMAT_VERSION,
+                    "built": datetime.now().isoformat(timespec='seconds'), "categories": {}}
+        for number, category in enumerate(sorted(by_category), start=1):
+            slug = re.sub(r'[^a-z0-9]+', '_', category.lower()).strip('_') or "category"
+            file_name = f"{number:03d}_{slug}.json"
+            with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as f:
+                json.dump(by_category[category], f, separators=(',', ':'))
+            manifest["categories"][category] = {"file": file_name, "count": len(by_category[category])}
+        # Manifest goes last (atomically) so a partially written bank is never picked up
+        temp_path = os.path.join(directory, BANK_MANIFEST_FILE + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, os.path.join(directory, BANK_MANIFEST_FILE))
+        return len(self.questions), len(by_category)
+
+    def benchmark_history_codecs(self, question_count=CODEC_BENCHMARK_QUESTIONS, attempts=CODEC_BENCHMARK_ATTEMPTS):
+        """Save/load a synthetic history with every codec; returns rows of (codec, bytes, save s, startup s, full load s).
+
+        Runs in a temporary directory and restores this engine's own history afterwards.
+        """
+        own_file, own_codec, own_history = self.history_file, self.history_codec, self.study_history
+        rng = random.Random(0)
+        synthetic = self._default_history()
+        for number in range(question_count):
+            category = f"Category {number % 12}"
+            results = [rng.random() < 0.7 for _ in range(attempts)]
+            synthetic["questions"][f"Synthetic question {number}: which command does task {number}?"] = {
+                "correct": sum(results), "attempts": attempts,
+                "history": [{"timestamp": f"2024-{1 + day % 12:02d}-{1 + day % 28:02d}T10:{day % 60:02d}:00",
+                             "correct": result, "time": round(rng.uniform(1, 40), 1)} for day, result in enumerate(results)],
+            }
+            cat_stats = synthetic["categories"].setdefault(category, {"correct": 0, "attempts": 0})
+            cat_stats["correct"] += sum(results)
+            cat_stats["attempts"] += attempts
+        synthetic["total_attempts"] = question_count * attempts
+        synthetic["total_correct"] = sum(stats["correct"] for stats in synthetic["questions"].values())
+        rows = []
+        try:
+            with tempfile.TemporaryDirectory() as work_dir:
+                for codec in HISTORY_CODECS:
+                    self.history_file = os.path.join(work_dir, f"history_{codec}.jsonl")
+                    self.history_codec = codec
+                    self.study_history = synthetic
+                    start = time.perf_counter()
+                    self.save_history()
+                    save_seconds = time.perf_counter() - start
+                    start = time.perf_counter()
+                    history = self.load_history()
+                    startup_seconds = time.perf_counter() - start
+                    dict(history["questions"].items()) # Parse every record, as the stats screens do
+                    full_seconds = time.perf_counter() - start
+                    if isinstance(history["questions"], LazyQuestionHistory):
+                        history["questions"].close()
+                    rows.append((codec, os.path.getsize(self.history_file), save_seconds, startup_seconds, full_seconds))
+                # Baseline: the old single-document indent=2 JSON
+                legacy_file = os.path.join(work_dir, "history_legacy.json")
+                start = time.perf_counter()
+                with open(legacy_file, 'w', encoding='utf-8') as f:
+                    json.dump(synthetic, f, indent=2)
+                save_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    json.load(f)
+                load_seconds = time.perf_counter() - start
+                rows.insert(0, ("legacy", os.path.getsize(legacy_file), save_seconds, load_seconds, load_seconds))
+        finally:
+            self.history_file, self.history_codec, self.study_history = own_file, own_codec, own_history
+        return rows
+
+    def generate_exam_forms(self, form_count, output_dir=EXAM_FORMS_DIR, seed=None, form_size=EXAM_FORM_SIZE, max_workers=None):
+        """Write form_count stratified mock exams (questions + answer key) to output_dir, in parallel.
+
+        Questions are bucketed by exam domain once; each form then draws its domain quotas without
+        replacement. Returns (number of forms written, quotas used, seed used).
+        """
+        self.ensure_category_loaded(None)
+        if seed is None:
+            seed = self.rng.randrange(2 ** 32)
+        strata = {domain: [] for domain in EXAM_DOMAIN_WEIGHTS}
+        # Stable question order (the loaded list is shuffled) so a seed always reproduces the same forms
+        ordered = sorted((index for index, q_data in enumerate(self.questions) if len(q_data) >= 5),
+                         key=lambda index: self.questions[index][0])
+        for index in ordered:
+            strata[exam_domain_for_category(self.questions[index][3])].append(index)
+        quotas = exam_form_quotas(form_size, {domain: len(indices) for domain, indices in strata.items()})
+        os.makedirs(output_dir, exist_ok=True)
+        form_numbers = list(range(1, form_count + 1))
+        worker_count = max_workers or os.cpu_count() or 1
+        # A few chunks per worker keeps every core busy without paying per-form IPC
+        chunk_size = max(1, math.ceil(form_count / (worker_count * 4)))
+        chunks = [form_numbers[i:i + chunk_size] for i in range(0, form_count, chunk_size)]
+        written = map_in_processes(_write_exam_forms, chunks, worker_count, "form generation", initializer=_init_exam_worker,
+                                   initargs=(self.questions, strata, quotas, output_dir, seed))
+        return sum(len(paths) for paths in written), quotas, seed
+
+    def load_question_packs(self, directory, max_workers=None):
+        """Merge every pack file in directory into self.questions, parsing cache misses in parallel.
+
+        Each pack's categories are namespaced ("<namespace>: <category>", namespace defaulting to the
+        file name). Parsed packs are cached by content hash so unchanged packs skip parsing entirely.
+        """
+        pack_files = sorted(name for name in os.listdir(directory) if name.lower().endswith(QUESTION_PACK_EXTENSION))
+        if not pack_files:
+            return
+        parsed = {} # File name -> (namespace, questions, errors)
+        misses = [] # (file name, raw bytes, content hash)
+        for name in pack_files:
+            try:
+                with open(os.path.join(directory, name), 'rb') as f:
+                    raw = f.read()
+            except IOError as e:
+                print(f"{COLOR_WARNING} Could not read question pack '{name}': {e} {COLOR_RESET}")
+                continue
+            digest = hashlib.sha256(raw).hexdigest()
+            try:
+                with open(os.path.join(PACK_CACHE_DIR, digest + ".marshal"), 'rb') as f:
+                    namespace, questions = marshal.load(f)
+                parsed[name] = (namespace, [tuple(q) for q in questions], [])
+            except (IOError, EOFError, ValueError, TypeError):
+                misses.append((name, raw, digest))
+
+        if misses:
+            results = map_in_processes(_parse_question_pack_job, [(name, raw) for name, raw, _ in misses],
+                                       max_workers, "pack loading")
+            try:
+                os.makedirs(PACK_CACHE_DIR, exist_ok=True)
+            except OSError:
+                pass
+            for (name, _, digest), result in zip(misses, results):
+                parsed[name] = result
+                namespace, questions, errors = result
+                if errors or not questions:
+                    continue # Only cache clean packs so warnings are shown again next start
+                try:
+                    temp_path = os.path.join(PACK_CACHE_DIR, digest + ".tmp")
+                    with open(temp_path, 'wb') as f:
+                        marshal.dump((namespace, questions), f)
+                    os.replace(temp_path, os.path.join(PACK_CACHE_DIR, digest + ".marshal"))
+                except (IOError, OSError):
+                    pass # Cache is an optimization only
+
+        known_texts = set(q[0] for q in self.questions)
+        for name in pack_files:
+            if name not in parsed:
+                continue
+            namespace, questions, errors = parsed[name]
+            for error in errors:
+                print(f"{COLOR_WARNING} Skipped invalid pack entry - {error} {COLOR_RESET}")
+            if not questions:
+                continue
+            namespace = namespace or os.path.splitext(name)[0]
+            added = 0
+            for question_text, options, correct_index, category, explanation in questions:
+                category = f"{namespace}: {category}"
+                if question_text in known_texts: # History is keyed by text, so texts must stay unique
+                    continue
+                if self.category_manifest is not None and category in self.category_manifest:
+                    continue # Already baked into the segmented bank
+                known_texts.add(question_text)
+                self.questions.append((question_text, options, correct_index, category, explanation))
+                added += 1
+            self.question_packs[namespace] = self.question_packs.get(namespace, 0) + added
+
+        self.categories = set(q[3] for q in self.questions if len(q) > 3)
+        for category in self.categories:
+            self.study_history["categories"].setdefault(category, {"correct": 0, "attempts": 0})
+
+    def update_history(self, question_text, category, is_correct, answer_time=None):
+        """Update study history with the result of the answered question (answer_time in seconds, optional)."""
         timestamp = datetime.now().isoformat()
         history = self.study_history
 
@@ -4468,18 +7213,60 @@ class LinuxPlusStudyGame:
         # Ensure history list exists and is a list
         if not isinstance(q_stats.get("history"), list):
             q_stats["history"] = []
-        q_stats["history"].append({"timestamp": timestamp, "correct": is_correct})
+        attempt = {"timestamp": timestamp, "correct": is_correct}
+        if answer_time is not None:
+            attempt["time"] = round(answer_time, 1) # Tenths of a second is plenty and keeps the file small
+            q_stats["time_total"] = q_stats.get("time_total", 0) + attempt["time"]
+            q_stats["timed_attempts"] = q_stats.get("timed_attempts", 0) + 1
+        q_stats["history"].append(attempt)
         # q_stats["history"] = q_stats["history"][-10:] # Optional: limit history length
 
         # Category specific stats
+        if self.session_record is not None:
+            self.session_record["answered"] += 1
+            if is_correct:
+                self.session_record["correct"] += 1
+
         cat_stats = history.setdefault("categories", {}).setdefault(category, {"correct": 0, "attempts": 0})
         cat_stats["attempts"] += 1
         if is_correct:
             cat_stats["correct"] += 1
+        self.analytics.record(question_text, category, timestamp, is_correct)
+        self.weak_spots.record(question_text, is_correct)
+        self.coverage.record(question_text)
+        if answer_time is not None:
+            # Histogram is updated incrementally so the stats screens never rescan attempts
+            time_hist = cat_stats.get("time_hist")
+            if not isinstance(time_hist, list) or len(time_hist) != len(ANSWER_TIME_BUCKET_LABELS):
+                time_hist = cat_stats["time_hist"] = [0] * len(ANSWER_TIME_BUCKET_LABELS)
+            time_hist[answer_time_bucket(answer_time)] += 1
+            cat_stats["time_total"] = cat_stats.get("time_total", 0) + attempt["time"]
         # Saving happens elsewhere (end of session, quit, explicit actions)
 
+    def question_counts(self, question_text):
+        """(correct, attempts) for a question, read from the history index when records are lazy."""
+        questions = self.study_history.get("questions", {})
+        if isinstance(questions, LazyQuestionHistory):
+            return questions.peek_counts(question_text) or (0, 0)
+        q_stats = questions.get(question_text)
+        if not isinstance(q_stats, dict):
+            return 0, 0
+        return q_stats.get("correct", 0), q_stats.get("attempts", 0)
+
+    def question_recent_mask(self, question_text):
+        """Recent-miss mask of a question (see recent_miss_mask), read from the history index when records are lazy."""
+        questions = self.study_history.get("questions", {})
+        if isinstance(questions, LazyQuestionHistory):
+            return questions.peek_recent(question_text)
+        return recent_miss_mask(questions.get(question_text))
+
     def select_question(self, category_filter=None):
         """Select a question, optionally filtered, avoiding recent repeats and using weighting. DOES NOT auto-reset session list."""
+        self.ensure_category_loaded(category_filter)
+        if self.selection_mode == QUIZ_MODE_WEAK:
+            return self.select_weak_question(category_filter)
+        if self.selection_mode == QUIZ_MODE_UNSEEN:
+            return self.select_unseen_question(category_filter)
         possible_indices = [
             idx for idx, q in enumerate(self.questions)
             if (category_filter is None or (len(q) > 3 and q[3] == category_filter)) # Check length for safety
@@ -4501,9 +7288,7 @@ class LinuxPlusStudyGame:
             if q_idx < 0 or q_idx >= len(self.questions): continue # Safety check
             # Use the actual question text (index 0) as the key for history
             q_text = self.questions[q_idx][0]
-            q_stats = self.study_history.get("questions", {}).get(q_text, {"correct": 0, "attempts": 0})
-            attempts = q_stats.get("attempts", 0)
-            correct = q_stats.get("correct", 0)
+            correct, attempts = self.question_counts(q_text) # Never forces a lazy history record to load
             # Avoid division by zero; treat 0 attempts as 50% accuracy for weighting
             accuracy = (correct / attempts) if attempts > 0 else 0.5
             # Weight: higher for incorrect, higher for less attempted
@@ -4516,14 +7301,14 @@ class LinuxPlusStudyGame:
         if not indices_for_weighting or not weights or len(weights) != len(indices_for_weighting):
             # Fallback to simple random choice if weighting fails or no items
             if available_indices:
-                 chosen_original_index = random.choice(available_indices)
+                 chosen_original_index = self.session_rng.choice(available_indices)
         else:
             try:
-                chosen_original_index = random.choices(indices_for_weighting, weights=weights, k=1)[0]
+                chosen_original_index = self.session_rng.choices(indices_for_weighting, weights=weights, k=1)[0]
             except (IndexError, ValueError):
                  # Fallback on error during weighted choice
                  if available_indices:
-                     chosen_original_index = random.choice(available_indices)
+                     chosen_original_index = self.session_rng.choice(available_indices)
 
         if chosen_original_index != -1:
             self.answered_indices_session.append(chosen_original_index) # Mark as answered this session
@@ -4538,29 +7323,275 @@ class LinuxPlusStudyGame:
             # Should not happen if available_indices check above works, but safety net
             return None, -1
 
-    def display_question(self, question_data, question_num=None, total_questions=None):
-        """Display the question and options with enhanced CLI formatting."""
-        if len(question_data) < 5: # Basic validation
-             print(f"{COLOR_ERROR} Error: Invalid question data format. {COLOR_RESET}")
-             return
+    def select_weak_question(self, category_filter=None):
+        """Weak spots mode: draw only from the weak-spot index, never repeating a question within the session."""
+        index = self.weak_spots.pick(self.session_rng, category_filter, self.answered_indices_session)
+        if index < 0:
+            return None, -1
+        self.answered_indices_session.append(index)
+        return self.questions[index], index
+
+    def select_unseen_question(self, category_filter=None):
+        """Never-attempted mode: a random question whose bit is clear in the attempted bitset."""
+        index = self.coverage.pick_unseen(self.session_rng, category_filter, self.answered_indices_session)
+        if index < 0:
+            return None, -1
+        self.answered_indices_session.append(index)
+        return self.questions[index], index
+
+    def count_session_questions(self, category_filter=None, mode=QUIZ_MODE_STANDARD):
+        """Questions a session in this mode starts with: the whole filter, its weak spots or its unseen questions."""
+        if mode == QUIZ_MODE_WEAK:
+            self.ensure_category_loaded(category_filter)
+            return self.weak_spots.count(category_filter)
+        if mode == QUIZ_MODE_UNSEEN:
+            return self.coverage.count_unseen(category_filter)
+        return self.count_questions(category_filter)
+
+    # --- Session History ---
+    def begin_session_record(self, category_filter=None, mode=QUIZ_MODE_STANDARD):
+        """Start counting a quiz session for history["sessions"] (update_history adds each answer)."""
+        self.session_record = {"started": time.time(), "mode": mode, "category": category_filter, "answered": 0, "correct": 0}
+
+    def end_session_record(self):
+        """Append the session in progress to the session columns, unless nothing was answered."""
+        record, self.session_record = self.session_record, None
+        if not record or not record["answered"]:
+            return
+        record["duration"] = round(time.time() - record["started"], 1)
+        record["started"] = int(record["started"])
+        columns = self.study_history.get("sessions")
+        if not isinstance(columns, dict) or any(not isinstance(columns.get(name), list) for name in SESSION_COLUMNS):
+            columns = self.study_history["sessions"] = session_columns(columns)
+        for name in SESSION_COLUMNS:
+            columns[name].append(record[name])
+
+    # --- Session Replay Log ---
+    def start_replay_session(self, category_filter=None, mode=QUIZ_MODE_STANDARD):
+        """Give the new session its own seeded RNG and start its replay log record and session-history record."""
+        self.finish_replay_session() # An unfinished previous session is still logged
+        self.begin_session_record(category_filter, mode)
+        self.session_token += 1
+        self.selection_mode = mode
+        self.ensure_category_loaded(category_filter)
+        session_seed = self.rng.randrange(2 ** 63)
+        self.session_rng = random.Random(session_seed)
+        # Snapshot only what selection works from, keyed by question digest so a replay starts from the same
+        # state: correct/attempt counts, plus the recent-miss mask the weak-spot index uses in that mode
+        counts = {}
+        for q in self.questions:
+            if category_filter is None or (len(q) > 3 and q[3] == category_filter):
+                correct, attempts = self.question_counts(q[0])
+                if attempts:
+                    recent = self.question_recent_mask(q[0]) if mode == QUIZ_MODE_WEAK else 0
+                    counts[replay_digest(q[0])] = [correct, attempts, recent] if recent else [correct, attempts]
+        self.replay_session = {
+            "started": datetime.now().isoformat(), "engine_seed": self.seed, "session_seed": session_seed,
+            "category": category_filter, "mode": mode, "bank": self.category_manifest is not None,
+            "digest_counts": counts,
+            "steps": [], # [question index, answer index (-1 = skipped), question digest]
+        }
+        if mode == QUIZ_MODE_WEAK:
+            self.replay_session["weak"] = {"accuracy": self.weak_spots.accuracy, "recent_attempts": self.weak_spots.recent_attempts}
+
+    def record_replay_step(self, question_index, answer):
+        """Log one selected question and the answer given (an option index, or anything else for a skip)."""
+        if self.replay_session is None or not (0 <= question_index < len(self.questions)):
+            return
+        answer_index = answer if isinstance(answer, int) else -1
+        self.replay_session["steps"].append([question_index, answer_index, replay_digest(self.questions[question_index][0])])
+
+    def finish_replay_session(self):
+        """Append the current session to the replay log and session history (if it answered anything) and stop recording."""
+        self.discard_prefetch()
+        self.end_session_record()
+        record, self.replay_session = self.replay_session, None
+        self.session_rng = self.rng
+        self.selection_mode = QUIZ_MODE_STANDARD
+        if not record or not record["steps"] or not self.replay_log_file:
+            return
+        try:
+            if os.path.exists(self.replay_log_file) and os.path.getsize(self.replay_log_file) >= REPLAY_LOG_MAX_BYTES:
+                os.replace(self.replay_log_file, self.replay_log_file + ".1")
+            with open(self.replay_log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + "\n")
+        except IOError as e:
+            print(f"{COLOR_ERROR} Error writing replay log '{self.replay_log_file}': {e} {COLOR_RESET}")
+
+    def replay_session_record(self, record):
+        """Re-run a logged session through select_question/update_history without UI.
+
+        Works on an in-memory history rebuilt from the record's snapshot; nothing is saved. Stops at the
+        first step whose selection differs from the log, since the rest would no longer be the same workload.
+        Returns (steps replayed, steps not replayed because of a divergence, elapsed seconds).
+        """
+        category_filter = record.get("category")
+        self.ensure_category_loaded(category_filter)
+        digest_index = {replay_digest(q[0]): i for i, q in enumerate(self.questions)}
+        snapshot = record.get("counts", {}) # Records from before digest keys hold full question texts
+        for digest, entry in record.get("digest_counts", {}).items():
+            if digest in digest_index:
+                snapshot[self.questions[digest_index[digest]][0]] = entry
+        history = self._default_history()
+        for text, entry in snapshot.items():
+            correct, attempts = entry[0], entry[1]
+            recent = entry[2] if len(entry) > 2 else 0
+            # Synthetic attempt list that reproduces the logged recent-miss mask (oldest first)
+            recent_attempts = [{"correct": not recent >> bit & 1} for bit in range(min(attempts, WEAK_SPOT_MASK_BITS) - 1, -1, -1)]
+            history["questions"][text] = {"correct": correct, "attempts": attempts, "history": recent_attempts}
+        self.release_history()
+        self.study_history = history
+        own_weak_settings = (self.weak_spots.accuracy, self.weak_spots.recent_attempts)
+        weak_settings = record.get("weak")
+        if isinstance(weak_settings, dict): # Thresholds the session ran with, not this run's --weak-* flags
+            self.weak_spots.accuracy = weak_settings.get("accuracy", self.weak_spots.accuracy)
+            self.weak_spots.recent_attempts = weak_settings.get("recent_attempts", self.weak_spots.recent_attempts)
+        self.answered_indices_session = []
+        self.session_rng = random.Random(record["session_seed"])
+        self.selection_mode = record.get("mode", QUIZ_MODE_STANDARD)
+        replayed = 0
+        start = time.perf_counter()
+        for _, answer_index, digest in record["steps"]:
+            question_data, index = self.select_question(category_filter)
+            if question_data is None or replay_digest(question_data[0]) != digest:
+                break
+            replayed += 1
+            if answer_index >= 0:
+                self.update_history(question_data[0], question_data[3], answer_index == question_data[2])
+        elapsed = time.perf_counter() - start
+        self.session_rng = self.rng
+        self.selection_mode = QUIZ_MODE_STANDARD
+        self.weak_spots.accuracy, self.weak_spots.recent_attempts = own_weak_settings
+        return replayed, len(record["steps"]) - replayed, elapsed
+
+    # --- Next-Question Prefetch ---
+    def prefetch(self, category_filter=None, question_num=None, total_questions=None, token=None):
+        """Pick the next question now (the current answer is already in history) and keep it, pre-rendered for the CLI.
+
+        The pick goes through select_question, so it is added to the session's answered set exactly as a
+        normal selection would be, and consumes the session RNG in the same order (replays stay identical).
+        """
+        if token is not None and token != self.session_token:
+            return # Scheduled by a session that has since ended
+        token = self.session_token
+        question_data, index = self.select_question(category_filter)
+        rendered = None
+        if question_data is not None and question_num is not None:
+            rendered = self.render_question(question_data, question_num, total_questions)
+        self.prefetched = (token, category_filter, question_data, index, rendered)
+
+    def start_prefetch(self, category_filter, question_num, total_questions):
+        """CLI: pick the next question now and render it on a background thread while feedback is on screen.
+
+        Only rendering leaves the main thread: selection changes engine state (session RNG, answered set,
+        loaded categories, weak-spot/attempted indexes, profiler and stall-monitor timers).
+        """
+        self.discard_prefetch()
+        self.prefetch(category_filter)
+        question_data = self.prefetched[2]
+        if question_data is None:
+            return
+        self.prefetch_thread = threading.Thread(target=self._render_prefetched, args=(question_data, question_num, total_questions),
+                                                name="question-prefetch", daemon=True)
+        self.prefetch_thread.start()
+
+    def _render_prefetched(self, question_data, question_num, total_questions):
+        rendered = self.render_question(question_data, question_num, total_questions)
+        self.prefetched = self.prefetched[:4] + (rendered,) # take_prefetched joins this thread before reading
+
+    def take_prefetched(self, category_filter=None):
+        """(question_data, index, rendered) picked for this session and filter, or None if there is none."""
+        if self.prefetch_thread is not None:
+            self.prefetch_thread.join()
+            self.prefetch_thread = None
+        prefetched, self.prefetched = self.prefetched, None
+        if prefetched is None or prefetched[0] != self.session_token or prefetched[1] != category_filter:
+            return None
+        return prefetched[2:]
+
+    def discard_prefetch(self):
+        """Drop any pending prefetch, returning its unseen question to the session's pool."""
+        prefetched = self.take_prefetched()
+        if prefetched is not None and prefetched[1] in self.answered_indices_session:
+            self.answered_indices_session.remove(prefetched[1])
+
+    def render_question(self, question_data, question_num=None, total_questions=None):
+        """Build the CLI question block (as printed by display_question) as one string."""
         question_text, options, _, category, _ = question_data
-        cli_print_separator(char='~', color=COLOR_CATEGORY)
+        layout = self.layout
+        lines = [cli_separator(char='~', length=layout.rule(), color=COLOR_CATEGORY)]
         header_info = f"Category: {COLOR_OPTIONS}{category}{COLOR_RESET}" # Apply color to category name
         if question_num is not None and total_questions is not None:
              # Display like "Question: 5 / 12"
              header_info += f"{COLOR_CATEGORY}  |  Question: {COLOR_STATS_VALUE}{question_num}{COLOR_CATEGORY} / {COLOR_STATS_VALUE}{total_questions}{COLOR_RESET}"
-        print(f"{COLOR_CATEGORY}{header_info}{COLOR_RESET}")
-        cli_print_separator(char='~', color=COLOR_CATEGORY)
+        lines.append(f"{COLOR_CATEGORY}{header_info}{COLOR_RESET}")
+        lines.append(cli_separator(char='~', length=layout.rule(), color=COLOR_CATEGORY))
 
-        print(f"\n{COLOR_QUESTION}Q: {question_text}{COLOR_RESET}\n")
-        cli_print_separator(length=40, color=COLOR_BORDER + C["dim"])
+        lines.append(f"\n{layout.paint(question_text, COLOR_QUESTION, prefix='Q: ')}\n")
+        lines.append(cli_separator(length=layout.rule(2 / 3), color=COLOR_BORDER + C["dim"]))
         for i, option in enumerate(options):
-            print(f"  {COLOR_OPTION_NUM}{i + 1}.{COLOR_RESET} {COLOR_OPTIONS}{option}{COLOR_RESET}")
-        cli_print_separator(length=40, color=COLOR_BORDER + C["dim"])
-        print() # Add a blank line for spacing
+            lines.append(layout.paint(option, COLOR_OPTIONS, prefix=f"  {i + 1}. ", prefix_color=COLOR_OPTION_NUM))
+        lines.append(cli_separator(length=layout.rule(2 / 3), color=COLOR_BORDER + C["dim"]))
+        lines.append("") # Add a blank line for spacing
+        return "\n".join(lines)
+
+    def display_question(self, question_data, question_num=None, total_questions=None, rendered=None):
+        """Display the question and options with enhanced CLI formatting (rendered = prefetched block)."""
+        if len(question_data) < 5: # Basic validation
+             print(f"{COLOR_ERROR} Error: Invalid question data format. {COLOR_RESET}")
+             return
+        print(rendered if rendered is not None else self.render_question(question_data, question_num, total_questions))
+
+    def pause_for_key(self, message="Press Enter to continue..."):
+        """Wait before moving on: any key in single-keypress mode, otherwise Enter. Interrupts just continue."""
+        try:
+            if self.raw_keys and raw_keys_supported():
+                sys.stdout.write(f"{COLOR_PROMPT}Press any key to continue...{COLOR_RESET}")
+                sys.stdout.flush()
+                read_keypress()
+                sys.stdout.write("\r\x1b[2K") # Clear the prompt line in place
+                sys.stdout.flush()
+            else:
+                input(f"{COLOR_PROMPT}{message}{COLOR_RESET}")
+        except EOFError:
+            print(f"\n{COLOR_ERROR} Input interrupted. Continuing... {COLOR_RESET}")
+        except KeyboardInterrupt:
+             print(f"\n{COLOR_WARNING} Interrupted. Continuing... {COLOR_RESET}")
+
+    def get_user_answer_key(self, num_options):
+        """Single-keypress variant of get_user_answer: 1-9, 's' or 'q' take effect without Enter."""
+        prompt = (f"{COLOR_PROMPT}Your choice ({COLOR_OPTION_NUM}1-{num_options}{COLOR_PROMPT}), "
+                  f"'{COLOR_INFO}s{COLOR_PROMPT}' to skip, "
+                  f"'{COLOR_INFO}q{COLOR_PROMPT}' to quit session: {COLOR_RESET}")
+        prompt_shown_at = time.perf_counter()
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        while True:
+            try:
+                key = read_keypress()
+            except EOFError:
+                 print(f"\n{COLOR_ERROR} Input interrupted. Exiting session. {COLOR_RESET}")
+                 return 'q' # Treat EOF as quit
+            except KeyboardInterrupt:
+                 print(f"\n{COLOR_WARNING} Session interrupted by user. Quitting session. {COLOR_RESET}")
+                 return 'q' # Treat Ctrl+C as quit
+            if key in ('q', 's'):
+                print(f"{COLOR_INPUT}{key}{COLOR_RESET}")
+                return key
+            if key.isdigit() and 1 <= int(key) <= num_options:
+                self.last_answer_time = time.perf_counter() - prompt_shown_at
+                print(f"{COLOR_INPUT}{key}{COLOR_RESET}")
+                return int(key) - 1 # Return 0-based index
+            # Invalid key: redraw just the prompt line rather than scrolling out a new message
+            sys.stdout.write(f"\r\x1b[2K{COLOR_INFO}[1-{num_options}, s or q]{COLOR_RESET} {prompt}")
+            sys.stdout.flush()
 
     def get_user_answer(self, num_options):
-        """Get and validate user input for CLI with better prompting."""
+        """Get and validate user input for CLI with better prompting. Stores the time taken in self.last_answer_time."""
+        self.last_answer_time = None
+        if self.raw_keys and num_options <= 9 and raw_keys_supported():
+            return self.get_user_answer_key(num_options)
+        prompt_shown_at = time.perf_counter()
         while True:
             try:
                 prompt = (f"{COLOR_PROMPT}Your choice ({COLOR_OPTION_NUM}1-{num_options}{COLOR_PROMPT}), "
@@ -4572,6 +7603,7 @@ class LinuxPlusStudyGame:
                 if answer == 's': return 's'
                 choice = int(answer)
                 if 1 <= choice <= num_options:
+                    self.last_answer_time = time.perf_counter() - prompt_shown_at
                     return choice - 1  # Return 0-based index
                 else:
                     # Use COLOR_INFO for user guidance
@@ -4587,8 +7619,11 @@ class LinuxPlusStudyGame:
                  print(f"\n{COLOR_WARNING} Session interrupted by user. Quitting session. {COLOR_RESET}")
                  return 'q' # Treat Ctrl+C as quit
 
-    def show_feedback(self, question_data, user_answer_index, original_index):
-        """Show feedback based on the user's answer with enhanced CLI formatting."""
+    def show_feedback(self, question_data, user_answer_index, original_index, answer_time=None, prefetch=None):
+        """Show feedback based on the user's answer with enhanced CLI formatting.
+
+        prefetch: optional (category_filter, next question number, total) to pick the next question in the background.
+        """
         if len(question_data) < 5:
              print(f"{COLOR_ERROR} Error: Invalid question data format for feedback. {COLOR_RESET}")
              return
@@ -4613,29 +7648,35 @@ class LinuxPlusStudyGame:
                 correct_option_text = options[correct_answer_index]
                 user_option_text = options[user_answer_index]
                 print(f"{COLOR_INCORRECT}>>> Incorrect! \U0001F61E <<<")
-                print(f"{COLOR_INCORRECT}    Your answer:      {COLOR_OPTION_NUM}{user_answer_index + 1}.{COLOR_RESET} {COLOR_OPTIONS}{user_option_text}{COLOR_RESET}")
-                print(f"{COLOR_CORRECT}    Correct answer was: {COLOR_OPTION_NUM}{correct_answer_index + 1}.{COLOR_RESET} {COLOR_OPTIONS}{correct_option_text}{COLOR_RESET}")
+                print(self.layout.paint(user_option_text, COLOR_OPTIONS, prefix=f"    Your answer:      {user_answer_index + 1}. ", prefix_color=COLOR_INCORRECT))
+                print(self.layout.paint(correct_option_text, COLOR_OPTIONS, prefix=f"    Correct answer was: {correct_answer_index + 1}. ", prefix_color=COLOR_CORRECT))
                 if explanation:
                      print(f"\n{C['bold']}Explanation:{COLOR_RESET}")
-                     # Indent explanation for clarity
-                     explanation_lines = explanation.split('\n')
-                     for line in explanation_lines:
-                         print(f"  {COLOR_EXPLANATION}{line}{COLOR_RESET}")
+                     # Indent explanation for clarity; wrapped to the terminal width
+                     print(self.layout.paint(explanation, COLOR_EXPLANATION, indent="  "))
             else:
                 print(f"{COLOR_ERROR} Error displaying feedback: Invalid answer index. {COLOR_RESET}")
 
 
         # Update history using the original question text key
-        self.update_history(original_question_text, category, is_correct)
+        self.update_history(original_question_text, category, is_correct, answer_time=answer_time)
         self.total_questions_session += 1
+        if prefetch is not None:
+            self.start_prefetch(*prefetch) # History is updated, so the next pick sees this answer
         print()
-        try:
-            input(f"{COLOR_PROMPT}Press Enter to continue...{COLOR_RESET}")
-        except EOFError:
-            print(f"\n{COLOR_ERROR} Input interrupted. Continuing... {COLOR_RESET}")
-        except KeyboardInterrupt:
-             print(f"\n{COLOR_WARNING} Interrupted. Continuing... {COLOR_RESET}")
+        self.pause_for_key()
+
 
+    def response_time_summary(self):
+        """Return [(category, timed_answers, avg_seconds, histogram)] from the incrementally kept category stats."""
+        rows = []
+        for category, stats in sorted(self.study_history.get("categories", {}).items()):
+            if not isinstance(stats, dict) or not isinstance(stats.get("time_hist"), list):
+                continue
+            timed = sum(stats["time_hist"])
+            if timed > 0:
+                rows.append((category, timed, stats.get("time_total", 0) / timed, stats["time_hist"]))
+        return rows
 
     def show_stats(self):
         """Display overall and category-specific statistics with enhanced CLI formatting."""
@@ -4679,6 +7720,40 @@ class LinuxPlusStudyGame:
                 acc_color = COLOR_STATS_ACC_GOOD if cat_accuracy >= 75 else (COLOR_STATS_ACC_AVG if cat_accuracy >= 50 else COLOR_STATS_ACC_BAD)
                 print(f"  {category.ljust(max_len)} │ {COLOR_STATS_VALUE}{str(cat_correct).rjust(7)}{COLOR_RESET} │ {COLOR_STATS_VALUE}{str(cat_attempts).rjust(8)}{COLOR_RESET} │ {acc_color}{f'{cat_accuracy:.1f}%'.rjust(9)}{COLOR_RESET}")
 
+        # Coverage (popcounts over the attempted-question bitset)
+        print(f"\n{COLOR_SUBHEADER}Question Coverage (attempted at least once):{COLOR_RESET}")
+        coverage_rows, seen_total, bank_total = self.coverage.coverage()
+        if bank_total:
+            max_len = max(len(cat) for cat, _, _ in coverage_rows + [("All Categories", 0, 0)])
+            print(f"  {COLOR_STATS_LABEL}{'Category'.ljust(max_len)} │ {'Seen'.rjust(6)} │ {'Total'.rjust(6)} │ {'Coverage'.rjust(9)}{COLOR_RESET}")
+            for category, seen, total in coverage_rows + [("All Categories", seen_total, bank_total)]:
+                print(f"  {category.ljust(max_len)} │ {COLOR_STATS_VALUE}{str(seen).rjust(6)}{COLOR_RESET} │ {COLOR_STATS_VALUE}{str(total).rjust(6)}{COLOR_RESET} │ {COLOR_STATS_VALUE}{f'{seen / total * 100:.1f}%'.rjust(9)}{COLOR_RESET}")
+
+        # Response Times (histograms are maintained by update_history)
+        print(f"\n{COLOR_SUBHEADER}Response Times by Category (answers per time bucket):{COLOR_RESET}")
+        time_rows = self.response_time_summary()
+        if not time_rows:
+            print(f"  {COLOR_EXPLANATION}No timed answers recorded yet.{COLOR_RESET}")
+        else:
+            max_len = max(len(cat) for cat, _, _, _ in time_rows)
+            bucket_header = " ".join(label.rjust(6) for label in ANSWER_TIME_BUCKET_LABELS)
+            print(f"  {COLOR_STATS_LABEL}{'Category'.ljust(max_len)} │ {'Avg'.rjust(6)} │ {bucket_header}{COLOR_RESET}")
+            for category, _, avg_time, time_hist in time_rows:
+                counts = " ".join(str(count).rjust(6) for count in time_hist)
+                print(f"  {category.ljust(max_len)} │ {COLOR_STATS_VALUE}{f'{avg_time:.1f}s'.rjust(6)}{COLOR_RESET} │ {COLOR_STATS_VALUE}{counts}{COLOR_RESET}")
+
+        # Trends (vectorized over every timestamped attempt)
+        print(f"\n{COLOR_SUBHEADER}Trends & Exam Readiness:{COLOR_RESET}")
+        tag_colors = {"label": COLOR_STATS_LABEL, "value": COLOR_STATS_VALUE, "dim": COLOR_EXPLANATION,
+                      "correct": COLOR_STATS_ACC_GOOD, "neutral": COLOR_STATS_ACC_AVG, "incorrect": COLOR_STATS_ACC_BAD}
+        for text, tag in self.analytics.report_lines():
+            print(f"{tag_colors.get(tag, '')}{text}{COLOR_RESET}")
+
+        # Session History (aggregated from the session columns)
+        print(f"\n{COLOR_SUBHEADER}Session History:{COLOR_RESET}")
+        for text, tag in session_report_lines(history["sessions"]):
+            print(f"{tag_colors.get(tag, '')}{text}{COLOR_RESET}")
+
         # Performance on Specific Questions
         print(f"\n{COLOR_SUBHEADER}Performance on Specific Questions (All History):{COLOR_RESET}")
         question_stats = history.get("questions", {})
@@ -4716,9 +7791,13 @@ class LinuxPlusStudyGame:
                         last_result = "Correct" if last_correct else "Incorrect"
                         last_color = COLOR_CORRECT if last_correct else COLOR_INCORRECT
 
+                avg_time_text = ""
+                if stats.get("timed_attempts", 0) > 0:
+                    avg_time_text = f", avg {stats.get('time_total', 0) / stats['timed_attempts']:.1f}s"
+
                 display_text = (q_text[:75] + '...') if len(q_text) > 75 else q_text
                 print(f"\n  {COLOR_QUESTION}{i+1}. \"{display_text}\"{COLOR_RESET}")
-                print(f"     {C['dim']}({COLOR_STATS_VALUE}{attempts}{C['dim']} attempts, {acc_color}{accuracy:.1f}%{C['dim']} acc.) Last: {last_color}{last_result}{C['dim']}){COLOR_RESET}")
+                print(f"     {C['dim']}({COLOR_STATS_VALUE}{attempts}{C['dim']} attempts, {acc_color}{accuracy:.1f}%{C['dim']} acc.{avg_time_text}) Last: {last_color}{last_result}{C['dim']}){COLOR_RESET}")
 
         print()
         cli_print_separator(color=COLOR_BORDER)
@@ -4731,20 +7810,26 @@ class LinuxPlusStudyGame:
 
     def select_category(self):
         """Allow the user to select a category to focus on, using enhanced CLI."""
-        self.clear_screen()
-        cli_print_header("Select a Category")
         # Convert set to list for reliable sorting
         sorted_categories = sorted(list(self.categories))
         if not sorted_categories:
+            self.clear_screen()
+            cli_print_header("Select a Category")
             print(f"{COLOR_ERROR} No categories found! {COLOR_RESET}")
-            time.sleep(2)
+            self.pacer.wait("error")
             return None # Indicate no category selected
 
-        print(f"\n{COLOR_OPTIONS}Available Categories:{COLOR_RESET}")
-        print(f"  {COLOR_OPTION_NUM}0.{COLOR_RESET} {COLOR_OPTIONS}All Categories{COLOR_RESET}")
-        for i, category in enumerate(sorted_categories):
-            print(f"  {COLOR_OPTION_NUM}{i + 1}.{COLOR_RESET} {COLOR_OPTIONS}{category}{COLOR_RESET}")
-        print()
+        def render_category_menu():
+            lines = [cli_header("Select a Category"),
+                     f"\n{COLOR_OPTIONS}Available Categories:{COLOR_RESET}",
+                     f"  {COLOR_OPTION_NUM}0.{COLOR_RESET} {COLOR_OPTIONS}All Categories{COLOR_RESET}"]
+            for i, category in enumerate(sorted_categories):
+                lines.append(f"  {COLOR_OPTION_NUM}{i + 1}.{COLOR_RESET} {COLOR_OPTIONS}{category}{COLOR_RESET}")
+            lines.append("")
+            return "\n".join(lines)
+
+        # Packs can add categories, so the list itself is part of the frame key
+        self.frame_cache.show(("category_menu", tuple(sorted_categories)), render_category_menu, clear_screen=self.clear_screen)
 
         while True:
             try:
@@ -4783,11 +7868,7 @@ class LinuxPlusStudyGame:
              confirm = 'no' # Treat interrupt as 'no'
 
         if confirm == 'yes':
-            self.study_history = self._default_history()
-            # Re-populate categories with 0 stats
-            for category in self.categories:
-                 self.study_history["categories"].setdefault(category, {"correct": 0, "attempts": 0})
-            self.save_history() # Save the cleared history
+            self.reset_history() # Saves the cleared history
             print(f"\n{COLOR_CORRECT}>>> Study history has been cleared. <<<{COLOR_RESET}")
         else:
             print(f"\n{COLOR_INFO}Operation cancelled. History not cleared.{COLOR_RESET}")
@@ -4803,7 +7884,7 @@ class LinuxPlusStudyGame:
         self.score = 0
         self.total_questions_session = 0 # Reset session counter
         self.answered_indices_session = []
-        self.verify_session_answers = [] # Clear verify answers for new session
+        self.verify_session_answers = VerifyResults() # Clear verify answers for new session
 
         quiz_title = "Quiz Mode"
         if mode == QUIZ_MODE_VERIFY:
@@ -4823,51 +7904,67 @@ class LinuxPlusStudyGame:
             except (EOFError, KeyboardInterrupt):
                  print(f"\n{COLOR_WARNING} Quiz cancelled. Returning to menu. {COLOR_RESET}")
                  return # Exit if interrupted before starting
+        elif mode == QUIZ_MODE_WEAK:
+            quiz_title = "Weak Spots Mode"
+        elif mode == QUIZ_MODE_UNSEEN:
+            quiz_title = "Never Attempted Mode"
 
 
         # --- Calculate total questions for the current filter ---
-        if category_filter is None:
-            # If no filter, total is all questions
-            total_questions_in_filter = len(self.questions)
-        else:
-            # Count questions matching the filter
-            total_questions_in_filter = sum(1 for q in self.questions if len(q) > 3 and q[3] == category_filter) # Check length
+        total_questions_in_filter = self.count_session_questions(category_filter, mode)
 
+        if total_questions_in_filter == 0 and mode == QUIZ_MODE_WEAK:
+             print(f"{COLOR_INFO} No weak spots right now: every answered question is at or above {self.weak_spots.accuracy * 100:.0f}% with no recent misses. {COLOR_RESET}")
+             self.pacer.wait("session_end")
+             return
+        if total_questions_in_filter == 0 and mode == QUIZ_MODE_UNSEEN:
+             print(f"{COLOR_INFO} Every question in this filter has been attempted at least once. {COLOR_RESET}")
+             self.pacer.wait("session_end")
+             return
         if total_questions_in_filter == 0:
              print(f"{COLOR_WARNING}Warning: No questions found for the selected filter: {category_filter}. Returning to menu.{COLOR_RESET}")
-             time.sleep(3)
+             self.pacer.wait("session_end")
              # No need to proceed if there are no questions
              self.save_history() # Save history before returning
              return # Exit run_quiz function
 
+        self.start_replay_session(category_filter, mode)
         question_count = 0 # Tracks the number displayed (1-based)
         while True:
             self.clear_screen()
             category_display = category_filter if category_filter else "All Categories"
             session_header = f"{quiz_title}: {category_display}"
-            cli_print_header(session_header)
+            cli_print_header(session_header, length=self.layout.rule())
 
             # Display score differently based on mode
-            if mode == QUIZ_MODE_STANDARD:
+            if mode != QUIZ_MODE_VERIFY:
                 # Show score based on questions *answered* so far
                 print(f"{COLOR_STATS_LABEL}Session Score: {COLOR_STATS_VALUE}{self.score} / {self.total_questions_session}{COLOR_RESET}\n")
             else: # Verify mode
                 # Show number of questions *answered* so far
                 print(f"{COLOR_STATS_LABEL}Questions Answered: {COLOR_STATS_VALUE}{self.total_questions_session}{COLOR_RESET}\n")
 
-            question_data, original_index = self.select_question(category_filter)
+            # Normally already picked (and rendered) in the background while the last feedback was shown
+            prefetched = self.take_prefetched(category_filter)
+            if prefetched is not None:
+                question_data, original_index, rendered = prefetched
+            else:
+                question_data, original_index = self.select_question(category_filter)
+                rendered = None
 
             if question_data is None:
                  # This now correctly indicates no more *available* questions for this filter/session
                  print(f"{COLOR_INFO} No more questions available in this filter for this session. Ending session. {COLOR_RESET}")
-                 time.sleep(3)
+                 self.pacer.wait("session_end")
                  break # Exit the while loop
 
             question_count += 1 # Increment display count only if a question was successfully selected
             # --- Pass the calculated total ---
-            self.display_question(question_data, question_num=question_count, total_questions=total_questions_in_filter)
+            self.display_question(question_data, question_num=question_count, total_questions=total_questions_in_filter, rendered=rendered)
 
             user_answer = self.get_user_answer(len(question_data[1])) # question_data[1] is the options list
+            if user_answer != 'q':
+                self.record_replay_step(original_index, user_answer)
 
             if user_answer == 'q':
                 print(f"\n{COLOR_INFO} Quitting quiz session. {COLOR_RESET}")
@@ -4876,10 +7973,9 @@ class LinuxPlusStudyGame:
                 print(f"\n{COLOR_INFO}Skipping question...{COLOR_RESET}")
                 # Skipping does NOT increment total_questions_session (answered count)
                 # It also doesn't update history
-                try:
-                    input(f"\n{COLOR_PROMPT}Press Enter to continue...{COLOR_RESET}")
-                except (EOFError, KeyboardInterrupt):
-                    print(f"\n{COLOR_WARNING} Interrupted. Continuing... {COLOR_RESET}")
+                self.start_prefetch(category_filter, question_count + 1, total_questions_in_filter)
+                print()
+                self.pause_for_key()
                 continue # Go to next iteration of the while loop
 
             # --- Process Answer (Only if not skipped or quit) ---
@@ -4899,23 +7995,25 @@ class LinuxPlusStudyGame:
 
             # Update history and session *answered* count (Done inside show_feedback/manually for verify)
 
-            if mode == QUIZ_MODE_STANDARD:
+            if mode != QUIZ_MODE_VERIFY:
                 # show_feedback updates total_questions_session internally and calls update_history
-                self.show_feedback(question_data, user_answer, original_index) # Shows feedback immediately
+                self.show_feedback(question_data, user_answer, original_index, answer_time=self.last_answer_time,
+                                   prefetch=(category_filter, question_count + 1, total_questions_in_filter)) # Shows feedback immediately
             else: # QUIZ_MODE_VERIFY
                 # Store the result, don't show feedback yet
                 self.verify_session_answers.append((question_data, user_answer, is_correct))
                 # Manually update session answered count for verify mode
                 self.total_questions_session += 1
                 # Update history for verify mode here
-                self.update_history(original_question_text, category, is_correct)
+                self.update_history(original_question_text, category, is_correct, answer_time=self.last_answer_time)
+                self.start_prefetch(category_filter, question_count + 1, total_questions_in_filter)
                 print(f"\n{COLOR_INFO}Answer recorded. Next question...{COLOR_RESET}")
-                time.sleep(1) # Brief pause before clearing screen
+                self.pacer.wait("verify_next") # Brief pause before clearing screen
 
         # --- End of Session ---
         print(f"\n{COLOR_HEADER}Quiz session finished.{COLOR_RESET}")
 
-        if mode == QUIZ_MODE_STANDARD:
+        if mode != QUIZ_MODE_VERIFY:
              if self.total_questions_session > 0: # Avoid division by zero if no questions were answered
                  accuracy = (self.score / self.total_questions_session * 100)
                  acc_color = COLOR_STATS_ACC_GOOD if accuracy >= 75 else (COLOR_STATS_ACC_AVG if accuracy >= 50 else COLOR_STATS_ACC_BAD)
@@ -4925,6 +8023,7 @@ class LinuxPlusStudyGame:
         elif mode == QUIZ_MODE_VERIFY:
             self.show_verify_results() # This displays the results
 
+        self.finish_replay_session()
         self.save_history() # Save history at the end of the session
         try:
             input(f"\n{COLOR_PROMPT}Press Enter to return to the main menu...{COLOR_RESET}")
@@ -4932,50 +8031,81 @@ class LinuxPlusStudyGame:
             print(f"\n{COLOR_WARNING} Returning to menu... {COLOR_RESET}")
 
 
-    def show_verify_results(self):
-        """Displays the results after a 'Verify Knowledge' session."""
-        self.clear_screen()
-        cli_print_header("Verification Results")
+    def _print_verify_entry(self, number, entry):
+        """Print one answered question of the verify results (question, answers, explanation)."""
+        q_data, user_answer_idx, is_correct = entry
+        if len(q_data) < 5: return # Safety skip
+        q_text, options, correct_idx, _, explanation = q_data
+        print(f"\n{self.layout.paint(q_text, COLOR_QUESTION, prefix=f'{number}. ')}")
 
-        if not self.verify_session_answers:
-            print(f"{COLOR_INFO}No questions were answered in this verification session.{COLOR_RESET}")
-            return
+        # Validate indices before accessing options
+        if 0 <= user_answer_idx < len(options) and 0 <= correct_idx < len(options):
+            user_choice_text = options[user_answer_idx]
+            correct_choice_text = options[correct_idx]
 
-        num_correct = sum(1 for _, _, is_correct in self.verify_session_answers if is_correct)
-        total_answered = len(self.verify_session_answers)
-        accuracy = (num_correct / total_answered * 100) if total_answered > 0 else 0
-        acc_color = COLOR_STATS_ACC_GOOD if accuracy >= 75 else (COLOR_STATS_ACC_AVG if accuracy >= 50 else COLOR_STATS_ACC_BAD)
-
-        print(f"\n{COLOR_SUBHEADER}Session Summary:{COLOR_RESET}")
-        print(f"  {COLOR_STATS_LABEL}Total Questions Answered:{COLOR_RESET} {COLOR_STATS_VALUE}{total_answered}{COLOR_RESET}")
-        print(f"  {COLOR_STATS_LABEL}Correct Answers:         {COLOR_RESET} {COLOR_STATS_VALUE}{num_correct}{COLOR_RESET}")
-        print(f"  {COLOR_STATS_LABEL}Accuracy:                {COLOR_RESET} {acc_color}{accuracy:.2f}%{COLOR_RESET}\n")
-        cli_print_separator()
-
-        print(f"\n{COLOR_SUBHEADER}Detailed Review:{COLOR_RESET}")
-        for i, (q_data, user_answer_idx, is_correct) in enumerate(self.verify_session_answers):
-            if len(q_data) < 5: continue # Safety skip
-            q_text, options, correct_idx, _, explanation = q_data
-            print(f"\n{COLOR_QUESTION}{i+1}. {q_text}{COLOR_RESET}")
-
-            # Validate indices before accessing options
-            if 0 <= user_answer_idx < len(options) and 0 <= correct_idx < len(options):
-                user_choice_text = options[user_answer_idx]
-                correct_choice_text = options[correct_idx]
-
-                if is_correct:
-                    print(f"  {COLOR_CORRECT}Your answer: {user_answer_idx+1}. {user_choice_text} (Correct! \U0001F389){COLOR_RESET}")
-                else:
-                    print(f"  {COLOR_INCORRECT}Your answer: {user_answer_idx+1}. {user_choice_text} (Incorrect \U0001F61E){COLOR_RESET}")
-                    print(f"  {COLOR_CORRECT}Correct answer: {correct_idx+1}. {correct_choice_text}{COLOR_RESET}")
-                    if explanation:
-                        print(f"  {C['bold']}Explanation:{COLOR_RESET}")
-                        explanation_lines = explanation.split('\n')
-                        for line in explanation_lines:
-                            print(f"    {COLOR_EXPLANATION}{line}{COLOR_RESET}")
-                cli_print_separator(char='.', length=50, color=COLOR_BORDER + C["dim"])
+            if is_correct:
+                print(self.layout.paint(f"{user_choice_text} (Correct! \U0001F389)", COLOR_CORRECT, prefix=f"  Your answer: {user_answer_idx+1}. "))
             else:
-                print(f"  {COLOR_ERROR} Error displaying details for this question: Invalid index. {COLOR_RESET}")
+                print(self.layout.paint(f"{user_choice_text} (Incorrect \U0001F61E)", COLOR_INCORRECT, prefix=f"  Your answer: {user_answer_idx+1}. "))
+                print(self.layout.paint(correct_choice_text, COLOR_CORRECT, prefix=f"  Correct answer: {correct_idx+1}. "))
+                if explanation:
+                    print(f"  {C['bold']}Explanation:{COLOR_RESET}")
+                    print(self.layout.paint(explanation, COLOR_EXPLANATION, indent="    "))
+            cli_print_separator(char='.', length=self.layout.rule(5 / 6), color=COLOR_BORDER + C["dim"])
+        else:
+            print(f"  {COLOR_ERROR} Error displaying details for this question: Invalid index. {COLOR_RESET}")
+
+    def show_verify_results(self):
+        """Displays the results after a 'Verify Knowledge' session, one page at a time."""
+        results = self.verify_session_answers
+        page_index = 0
+        incorrect_only = False
+        while True:
+            self.clear_screen()
+            cli_print_header("Verification Results", length=self.layout.rule())
+
+            if not results:
+                print(f"{COLOR_INFO}No questions were answered in this verification session.{COLOR_RESET}")
+                return
+
+            # Summary straight from the running tally
+            accuracy = results.accuracy()
+            acc_color = COLOR_STATS_ACC_GOOD if accuracy >= 75 else (COLOR_STATS_ACC_AVG if accuracy >= 50 else COLOR_STATS_ACC_BAD)
+            print(f"\n{COLOR_SUBHEADER}Session Summary:{COLOR_RESET}")
+            print(f"  {COLOR_STATS_LABEL}Total Questions Answered:{COLOR_RESET} {COLOR_STATS_VALUE}{len(results)}{COLOR_RESET}")
+            print(f"  {COLOR_STATS_LABEL}Correct Answers:         {COLOR_RESET} {COLOR_STATS_VALUE}{results.correct}{COLOR_RESET}")
+            print(f"  {COLOR_STATS_LABEL}Accuracy:                {COLOR_RESET} {acc_color}{accuracy:.2f}%{COLOR_RESET}\n")
+            cli_print_separator(length=self.layout.rule())
+
+            page_total = results.page_count(incorrect_only=incorrect_only)
+            page_index = min(page_index, page_total - 1)
+            view = "Incorrect Answers" if incorrect_only else "Detailed Review"
+            print(f"\n{COLOR_SUBHEADER}{view} (page {page_index + 1} of {page_total}):{COLOR_RESET}")
+            page = results.page(page_index, incorrect_only=incorrect_only)
+            if not page:
+                print(f"\n{COLOR_CORRECT}No incorrect answers in this session!{COLOR_RESET}")
+            for number, entry in page:
+                self._print_verify_entry(number, entry)
+
+            options = []
+            if page_index + 1 < page_total: options.append(f"'{COLOR_INFO}n{COLOR_PROMPT}' next")
+            if page_index > 0: options.append(f"'{COLOR_INFO}p{COLOR_PROMPT}' previous")
+            options.append(f"'{COLOR_INFO}i{COLOR_PROMPT}' {'show all' if incorrect_only else 'incorrect only'}")
+            try:
+                choice = input(f"\n{COLOR_PROMPT}{', '.join(options)}, Enter when done: {COLOR_INPUT}").lower().strip()
+                print(COLOR_RESET, end='')
+            except (EOFError, KeyboardInterrupt):
+                print(COLOR_RESET)
+                return
+            if choice == 'n' and page_index + 1 < page_total:
+                page_index += 1
+            elif choice == 'p' and page_index > 0:
+                page_index -= 1
+            elif choice == 'i':
+                incorrect_only = not incorrect_only
+                page_index = 0
+            elif choice in ('', 'q', 'b'):
+                return
 
 
     def review_incorrect_answers(self):
@@ -4998,6 +8128,7 @@ class LinuxPlusStudyGame:
             return
 
         # Find the full question data based on the text stored in incorrect_review
+        self.ensure_category_loaded(None) # Review entries can come from any category
         questions_to_review = []
         not_found_questions = []
         # Create a temporary copy to iterate over, allowing removal from original
@@ -5049,7 +8180,7 @@ class LinuxPlusStudyGame:
             print(f"\n{COLOR_OPTIONS}Select a question to review (displays info):{COLOR_RESET}")
             if not questions_to_review: # Check if list became empty during loop
                  print(f"\n{COLOR_INFO}All incorrect questions cleared from review.{COLOR_RESET}")
-                 time.sleep(2)
+                 self.pacer.wait("error")
                  break # Exit loop if list is now empty
 
             for i, q_data in enumerate(questions_to_review):
@@ -5080,11 +8211,11 @@ class LinuxPlusStudyGame:
                             clear_mode = True
                         else:
                             print(f"{COLOR_INFO} Invalid number after 'c'. {COLOR_RESET}")
-                            time.sleep(1.5)
+                            self.pacer.wait("notice")
                             continue
                     except ValueError:
                         print(f"{COLOR_INFO} Invalid format for clear. Use 'c' followed by the number (e.g., c3). {COLOR_RESET}")
-                        time.sleep(1.5)
+                        self.pacer.wait("notice")
                         continue
 
                 if clear_mode:
@@ -5100,7 +8231,7 @@ class LinuxPlusStudyGame:
                                  print(f"{COLOR_CORRECT}Question removed from review list.{COLOR_RESET}")
                                  # Remove from the current display list as well
                                  del questions_to_review[item_to_clear]
-                                 time.sleep(1.5)
+                                 self.pacer.wait("notice")
                             else:
                                  print(f"{COLOR_ERROR}Error: Question text not found in history's incorrect list anymore?{COLOR_RESET}")
                                  # Also remove from display list if it's somehow missing from history
@@ -5108,13 +8239,13 @@ class LinuxPlusStudyGame:
                                       del questions_to_review[item_to_clear]
                                  except IndexError:
                                       pass # Ignore if index already invalid
-                                 time.sleep(2)
+                                 self.pacer.wait("error")
                         else:
                             print(f"{COLOR_INFO}Clear cancelled.{COLOR_RESET}")
-                            time.sleep(1)
+                            self.pacer.wait("short")
                     else:
                          print(f"{COLOR_ERROR} Cannot clear invalid question data. {COLOR_RESET}")
-                         time.sleep(2)
+                         self.pacer.wait("error")
                     continue # Go back to list display
 
 
@@ -5126,7 +8257,7 @@ class LinuxPlusStudyGame:
                     selected_q_data = questions_to_review[num_choice-1]
                     if len(selected_q_data) < 5: # Validation
                          print(f"{COLOR_ERROR} Error: Invalid data for selected question. {COLOR_RESET}")
-                         time.sleep(2)
+                         self.pacer.wait("error")
                          continue
 
                     q_text, options, correct_idx, category, explanation = selected_q_data
@@ -5152,11 +8283,11 @@ class LinuxPlusStudyGame:
 
                 else:
                     print(f"{COLOR_INFO} Invalid choice. {COLOR_RESET}")
-                    time.sleep(1.5)
+                    self.pacer.wait("notice")
 
             except ValueError:
                 print(f"{COLOR_INFO} Invalid input. Please enter a number, 'c[num]', or 'b'. {COLOR_RESET}")
-                time.sleep(1.5)
+                self.pacer.wait("notice")
             except EOFError:
                 print(f"\n{COLOR_ERROR} Input interrupted. Returning to main menu. {COLOR_RESET}")
                 current_choice = 'b' # Treat EOF as back
@@ -5171,12 +8302,35 @@ class LinuxPlusStudyGame:
              self.save_history()
 
 
+    def export_attempt_log(self, path):
+        """Write every recorded attempt as one flat row (CSV or the columnar log, by extension); returns the row count."""
+        self.ensure_category_loaded(None) # Categories come from the question bank
+        text_to_category = {q[0]: q[3] for q in self.questions if len(q) > 3}
+        return write_attempt_export(path, self.study_history, text_to_category)
+
     def export_study_data(self):
-        """Exports study history data (JSON export)."""
+        """Exports study history data (JSON export, or a flat CSV / columnar attempt log)."""
         self.clear_screen()
         cli_print_header("Export Study Data (History)")
 
-        default_filename = f"linux_plus_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        print(f"\n{COLOR_OPTIONS}Export format:{COLOR_RESET}")
+        print(f"  {COLOR_OPTION_NUM}1.{COLOR_RESET} {COLOR_OPTIONS}Full history (JSON){COLOR_RESET}")
+        print(f"  {COLOR_OPTION_NUM}2.{COLOR_RESET} {COLOR_OPTIONS}Attempt log (CSV, one row per answer){COLOR_RESET}")
+        print(f"  {COLOR_OPTION_NUM}3.{COLOR_RESET} {COLOR_OPTIONS}Attempt log (columnar binary, {ATTEMPT_LOG_EXTENSION}){COLOR_RESET}")
+        try:
+            format_choice = input(f"{COLOR_PROMPT}Choose a format ({COLOR_INFO}default: 1{COLOR_PROMPT}): {COLOR_INPUT}").strip() or "1"
+            print(COLOR_RESET, end='')
+        except (EOFError, KeyboardInterrupt):
+            format_choice = None
+        extension = {"1": ".json", "2": ".csv", "3": ATTEMPT_LOG_EXTENSION}.get(format_choice)
+        if extension is None:
+             print(f"\n{COLOR_WARNING} Export cancelled. {COLOR_RESET}")
+             try: input(f"\n{COLOR_PROMPT}Press Enter to return to the main menu...{COLOR_RESET}")
+             except: pass
+             return
+
+        prefix = "linux_plus_export" if extension == ".json" else "linux_plus_attempts"
+        default_filename = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
         export_filename = default_filename # Default value
         try:
             prompt = f"{COLOR_PROMPT}Enter filename for export ({COLOR_INFO}default: {default_filename}{COLOR_PROMPT}): {COLOR_INPUT}"
@@ -5190,16 +8344,23 @@ class LinuxPlusStudyGame:
              return
 
 
-        # Basic validation
-        if not export_filename.lower().endswith(".json"):
+        # Basic validation (.json.gz / .json.xz / .csv.gz / .csv.xz exports are written compressed)
+        if extension == ".json" and not export_filename.lower().endswith((".json", ".json.gz", ".json.xz")):
              export_filename += ".json"
+        elif extension == ".csv" and not export_filename.lower().endswith((".csv", ".csv.gz", ".csv.xz")):
+             export_filename += ".csv"
+        elif extension == ATTEMPT_LOG_EXTENSION and not export_filename.lower().endswith(ATTEMPT_LOG_EXTENSION):
+             export_filename += ATTEMPT_LOG_EXTENSION
 
         try:
             export_path = os.path.abspath(export_filename) # Get full path
             print(f"\n{COLOR_INFO}Attempting to export history data to: {COLOR_STATS_VALUE}{export_path}{COLOR_RESET}")
-            with open(export_filename, 'w', encoding='utf-8') as f: # Use encoding
-                json.dump(self.study_history, f, indent=2)
-            print(f"\n{COLOR_CORRECT}>>> Study history successfully exported to {export_filename} <<<{COLOR_RESET}")
+            if extension == ".json":
+                write_history_export(export_filename, self.study_history)
+                print(f"\n{COLOR_CORRECT}>>> Study history successfully exported to {export_filename} <<<{COLOR_RESET}")
+            else:
+                rows = self.export_attempt_log(export_filename)
+                print(f"\n{COLOR_CORRECT}>>> {rows} attempts successfully exported to {export_filename} <<<{COLOR_RESET}")
         except IOError as e:
             print(f"\n{COLOR_ERROR}Error exporting history: {e}{COLOR_RESET}")
             print(f"{COLOR_ERROR}Please check permissions and filename.{COLOR_RESET}")
@@ -5218,6 +8379,7 @@ class LinuxPlusStudyGame:
         cli_print_header("Export Questions & Answers to Markdown")
 
         # Check if there are questions loaded
+        self.ensure_category_loaded(None)
         if not self.questions:
              print(f"\n{COLOR_WARNING}No questions are currently loaded to export.{COLOR_RESET}")
              try: input(f"\n{COLOR_PROMPT}Press Enter to return to the main menu...{COLOR_RESET}")
@@ -5246,45 +8408,7 @@ class LinuxPlusStudyGame:
             print(f"\n{COLOR_INFO}Attempting to export Q&A to: {COLOR_STATS_VALUE}{export_path}{COLOR_RESET}")
 
             with open(export_filename, 'w', encoding='utf-8') as f:
-                # --- Write Questions Section ---
-                f.write("# Questions\n\n")
-                for i, q_data in enumerate(self.questions):
-                    if len(q_data) < 5: continue # Safety skip malformed data
-                    question_text, options, _, category, _ = q_data
-                    f.write(f"**Q{i+1}.** ({category})\n") # Add category like in the example
-                    f.write(f"{question_text}\n")
-                    # Add options with letters
-                    for j, option in enumerate(options):
-                        f.write(f"   {chr(ord('A') + j)}. {option}\n")
-                    f.write("\n") # Blank line after each question
-
-                f.write("---\n\n") # Separator
-
-                # --- Write Answers Section ---
-                f.write("# Answers\n\n")
-                for i, q_data in enumerate(self.questions):
-                    if len(q_data) < 5: continue # Safety skip malformed data
-                    _, options, correct_answer_index, _, explanation = q_data
-                    # Validate index before using
-                    if 0 <= correct_answer_index < len(options):
-                        correct_option_letter = chr(ord('A') + correct_answer_index)
-                        correct_option_text = options[correct_answer_index]
-
-                        f.write(f"**A{i+1}.** {correct_option_letter}. {correct_option_text}\n")
-                        if explanation:
-                            # Indent explanation slightly for readability in Markdown
-                            explanation_lines = explanation.split('\n')
-                            f.write("   *Explanation:*")
-                            first_line = True
-                            for line in explanation_lines:
-                               if not first_line:
-                                    f.write("   ") # Indent subsequent lines
-                               f.write(f" {line.strip()}\n") # Add space before each line, strip extra whitespace
-                               first_line = False
-                        f.write("\n\n") # Blank line after each answer block
-                    else:
-                         f.write(f"**A{i+1}.** Error: Invalid correct answer index.\n\n")
-
+                write_questions_answers_md(f, self.questions)
 
             print(f"{COLOR_CORRECT}>>> Questions & Answers successfully exported to {export_filename} <<<{COLOR_RESET}")
 
@@ -5300,9 +8424,7 @@ class LinuxPlusStudyGame:
             print(f"\n{COLOR_WARNING} Returning to menu... {COLOR_RESET}")
     # --- END NEW METHOD ---
 
-    def display_welcome_message(self):
-        """Displays the initial welcome screen for the CLI."""
-        self.clear_screen()
+    def _render_welcome(self):
         title = "LINUX+ STUDY GAME"
         welcome_lines = [
             "",
@@ -5316,7 +8438,11 @@ class LinuxPlusStudyGame:
             "Track your progress with statistics and review incorrect answers.",
             ""
         ]
-        cli_print_box(welcome_lines, title=title, width=60, border_color=COLOR_WELCOME_BORDER, title_color=COLOR_WELCOME_TITLE, text_color=COLOR_WELCOME_TEXT)
+        return cli_box(welcome_lines, title=title, width=60, border_color=COLOR_WELCOME_BORDER, title_color=COLOR_WELCOME_TITLE, text_color=COLOR_WELCOME_TEXT)
+
+    def display_welcome_message(self):
+        """Displays the initial welcome screen for the CLI."""
+        self.frame_cache.show("welcome", self._render_welcome, clear_screen=self.clear_screen)
         try:
             input(f"{COLOR_PROMPT}Press Enter to continue...{COLOR_RESET}")
         except (EOFError, KeyboardInterrupt):
@@ -5326,24 +8452,28 @@ class LinuxPlusStudyGame:
 
 
     # --- MODIFIED main_menu ---
+    def _render_main_menu(self):
+        return "\n".join([
+            cli_header("MAIN MENU", char='*', length=60),
+            f"\n{COLOR_OPTIONS}Please choose an option:{COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}1.{COLOR_RESET} {COLOR_OPTIONS}Start Quiz (Standard){COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}2.{COLOR_RESET} {COLOR_OPTIONS}Quiz by Category (Standard){COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}3.{COLOR_RESET} {COLOR_OPTIONS}Verify Knowledge (Category/All){COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}4.{COLOR_RESET} {COLOR_OPTIONS}Review Incorrect Answers{COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}5.{COLOR_RESET} {COLOR_OPTIONS}View Statistics{COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}6.{COLOR_RESET} {COLOR_OPTIONS}Export Study Data (History){COLOR_RESET}", # Renamed
+            f"  {COLOR_OPTION_NUM}7.{COLOR_RESET} {COLOR_OPTIONS}Export Questions & Answers (MD){COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}8.{COLOR_RESET} {COLOR_OPTIONS}Exit{COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}9.{COLOR_RESET} {COLOR_WARNING}Clear All Statistics{COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}10.{COLOR_RESET} {COLOR_OPTIONS}Weak Spots Quiz{COLOR_RESET}",
+            f"  {COLOR_OPTION_NUM}11.{COLOR_RESET} {COLOR_OPTIONS}Never Attempted Questions (Category/All){COLOR_RESET}",
+            cli_separator(color=COLOR_BORDER),
+        ])
+
     def main_menu(self):
         """Display the main menu and handle user choices for CLI."""
         while True:
-            self.clear_screen()
-            cli_print_header("MAIN MENU", char='*', length=60)
-            print(f"\n{COLOR_OPTIONS}Please choose an option:{COLOR_RESET}")
-            print(f"  {COLOR_OPTION_NUM}1.{COLOR_RESET} {COLOR_OPTIONS}Start Quiz (Standard){COLOR_RESET}")
-            print(f"  {COLOR_OPTION_NUM}2.{COLOR_RESET} {COLOR_OPTIONS}Quiz by Category (Standard){COLOR_RESET}")
-            print(f"  {COLOR_OPTION_NUM}3.{COLOR_RESET} {COLOR_OPTIONS}Verify Knowledge (Category/All){COLOR_RESET}")
-            print(f"  {COLOR_OPTION_NUM}4.{COLOR_RESET} {COLOR_OPTIONS}Review Incorrect Answers{COLOR_RESET}")
-            print(f"  {COLOR_OPTION_NUM}5.{COLOR_RESET} {COLOR_OPTIONS}View Statistics{COLOR_RESET}")
-            print(f"  {COLOR_OPTION_NUM}6.{COLOR_RESET} {COLOR_OPTIONS}Export Study Data (History){COLOR_RESET}") # Renamed
-            # --- New Option ---
-            print(f"  {COLOR_OPTION_NUM}7.{COLOR_RESET} {COLOR_OPTIONS}Export Questions & Answers (MD){COLOR_RESET}")
-            # --- Renumber subsequent options ---
-            print(f"  {COLOR_OPTION_NUM}8.{COLOR_RESET} {COLOR_OPTIONS}Exit{COLOR_RESET}")
-            print(f"  {COLOR_OPTION_NUM}9.{COLOR_RESET} {COLOR_WARNING}Clear All Statistics{COLOR_RESET}")
-            cli_print_separator(color=COLOR_BORDER)
+            self.frame_cache.show("main_menu", self._render_main_menu, clear_screen=self.clear_screen)
 
             choice = ''
             try:
@@ -5354,52 +8484,133 @@ class LinuxPlusStudyGame:
                 choice = '8' # Treat interrupt as exit
 
             if choice == '1':
-                self.run_quiz(category_filter=None, mode=QUIZ_MODE_STANDARD)
+                with self.profiler.track("menu:standard_quiz"):
+                    self.run_quiz(category_filter=None, mode=QUIZ_MODE_STANDARD)
             elif choice == '2':
                 selected_category = self.select_category()
                 if selected_category != 'b': # Proceed if not 'back'
-                    self.run_quiz(category_filter=selected_category, mode=QUIZ_MODE_STANDARD)
+                    with self.profiler.track("menu:category_quiz"):
+                        self.run_quiz(category_filter=selected_category, mode=QUIZ_MODE_STANDARD)
             elif choice == '3':
                 # Verify knowledge mode - ask for category or all
                 selected_category = self.select_category() # Reuse category selection
                 if selected_category != 'b':
-                    self.run_quiz(category_filter=selected_category, mode=QUIZ_MODE_VERIFY)
+                    with self.profiler.track("menu:verify_quiz"):
+                        self.run_quiz(category_filter=selected_category, mode=QUIZ_MODE_VERIFY)
             elif choice == '4':
-                self.review_incorrect_answers() # Call the review function
+                with self.profiler.track("menu:review_incorrect"):
+                    self.review_incorrect_answers() # Call the review function
             elif choice == '5':
-                self.show_stats()
+                with self.profiler.track("menu:show_stats"):
+                    self.show_stats()
             elif choice == '6':
-                self.export_study_data() # Call the history export function
-            # --- Handle New Option ---
+                with self.profiler.track("menu:export_study_data"):
+                    self.export_study_data() # Call the history export function
             elif choice == '7':
-                self.export_questions_answers_md() # Call the new Q&A export method
-            # --- Handle Renumbered Options ---
+                with self.profiler.track("menu:export_questions_answers_md"):
+                    self.export_questions_answers_md() # Call the new Q&A export method
             elif choice == '8':
                 print(f"\n{COLOR_INFO}Saving history and quitting. Goodbye!{COLOR_RESET}")
                 self.save_history()
                 sys.exit()
             elif choice == '9':
-                self.clear_stats()
+                with self.profiler.track("menu:clear_stats"):
+                    self.clear_stats()
+            elif choice == '10':
+                with self.profiler.track("menu:weak_spots_quiz"):
+                    self.run_quiz(category_filter=None, mode=QUIZ_MODE_WEAK)
+            elif choice == '11':
+                selected_category = self.select_category()
+                if selected_category != 'b':
+                    with self.profiler.track("menu:unseen_quiz"):
+                        self.run_quiz(category_filter=selected_category, mode=QUIZ_MODE_UNSEEN)
             else:
                 print(f"{COLOR_INFO} Invalid choice. Please try again. {COLOR_RESET}")
-                time.sleep(1.5)
+                self.pacer.wait("notice")
+
+# --- GUI Window Manager ---
+class WindowManager:
+    """Keeps the GUI's secondary Toplevel windows alive between uses.
+
+    Each window is built once, the first time it is opened. Closing a window withdraws it instead of
+    destroying it, so reopening only refreshes its data. The shared palette is applied once, with the
+    first window, rather than on every open.
+    """
+    def __init__(self, root, colors):
+        self.root = root
+        self.colors = colors
+        self.windows = {} # name -> {"window": Toplevel, "widgets": dict returned by the builder}
+        self.palette_applied = False
+
+    def get(self, name, build, title, geometry, minsize=None, resizable=True):
+        """Return (window, widgets) for name, creating the window with build(window) on first use."""
+        entry = self.windows.get(name)
+        if entry is not None and entry["window"].winfo_exists():
+            return entry["window"], entry["widgets"]
+
+        window = tk.Toplevel(self.root)
+        window.withdraw() # Stay hidden while the widgets are created
+        window.title(title)
+        window.geometry(geometry)
+        window.transient(self.root)
+        window.configure(bg=self.colors["bg"])
+        window.resizable(resizable, resizable)
+        if minsize:
+            window.minsize(*minsize)
+        if not self.palette_applied:
+            try:
+                window.tk_setPalette(background=self.colors["bg"], foreground=self.colors["fg"])
+            except tk.TclError:
+                print("Warning: Could not set Toplevel palette (might be OS dependent).")
+            self.palette_applied = True
+        window.protocol("WM_DELETE_WINDOW", lambda: self.hide(name)) # Builders may override this
+
+        entry = {"window": window, "widgets": build(window)}
+        self.windows[name] = entry
+        return window, entry["widgets"]
+
+    def show(self, name, focus=None):
+        """Map a built window again and make it modal."""
+        window = self.windows[name]["window"]
+        window.deiconify()
+        window.lift()
+        try:
+            window.grab_set()
+        except tk.TclError:
+            pass # Another window still holds the grab; the window is usable anyway
+        (focus or window).focus_set()
+
+    def hide(self, name):
+        """Withdraw a window (keeping its widgets) and release its grab."""
+        entry = self.windows.get(name)
+        if entry is None or not entry["window"].winfo_exists():
+            return
+        entry["window"].grab_release()
+        entry["window"].withdraw()
 
 # --- GUI Game Class ---
 class LinuxPlusStudyGUI:
     """Handles the Tkinter Graphical User Interface for the study game with improved styling."""
-    def __init__(self, root, game_logic):
+    def __init__(self, root, game_logic, stall_monitor=None):
         self.root = root
         self.game_logic = game_logic
+        # Stall monitor is a no-op unless --stall-monitor was given
+        self.stall_monitor = stall_monitor if stall_monitor is not None else StallMonitor()
 
         self.current_question_index = -1
         self.current_question_data = None
         self.selected_answer_var = tk.IntVar(value=-1)
         self.quiz_active = False
+        self.pending_advance = None # Tk after() id of a scheduled verify-mode auto-advance
         self.current_category_filter = None
         self.current_quiz_mode = QUIZ_MODE_STANDARD # Default mode
-        self.gui_verify_session_answers = [] # For storing answers in GUI verify mode
+        self.gui_verify_session_answers = VerifyResults() # For storing answers in GUI verify mode
         self.total_questions_in_filter_gui = 0 # Store total for GUI display
+        self.question_shown_at = None # perf_counter() when the current question was displayed
         self.questions_answered_in_session_gui = 0 # Track answered count for GUI status
+        self.review_questions = [] # Question data listed in the review window
+        self.review_not_found = [] # Review entries whose questions no longer exist
+        self.review_history_changed = False # Save history when the review window closes
 
         # --- Enhanced Styling ---
         self.colors = {
@@ -5439,9 +8650,15 @@ class LinuxPlusStudyGUI:
             "welcome_title": tkFont.Font(family="Segoe UI", size=14, weight="bold"),
             "welcome_text": tkFont.Font(family="Segoe UI", size=11),
         }
+        self.windows = WindowManager(root, self.colors) # Stats, review, results and start dialogs
+        # Wrap command handlers with timers before widgets bind them (no-op without --profile)
+        self.game_logic.profiler.instrument(self, GUI_PROFILED_COMMANDS, prefix="gui")
+        self.stall_monitor.instrument(self, STALL_MONITORED_COMMANDS, prefix="gui")
+        self.stall_monitor.instrument(self.game_logic, STALL_MONITORED_ENGINE_METHODS, prefix="engine")
         self._setup_styles()
         self._setup_ui()
         self._load_initial_state() # Display welcome message
+        self.stall_monitor.start(root)
 
     def _setup_styles(self):
         """Configure ttk styles for a modern dark theme."""
@@ -5507,6 +8724,14 @@ class LinuxPlusStudyGUI:
         self.style.configure("Incorrect.Feedback.TLabel", foreground=self.colors["incorrect"])
         self.style.configure("Info.Feedback.TLabel", foreground=self.colors["status_fg"]) # For verify mode
 
+        # --- Notebook (Tabs) Styling ---
+        self.style.configure("TNotebook", background=self.colors["bg"], borderwidth=0)
+        self.style.configure("TNotebook.Tab", background=self.colors["button"], foreground=self.colors["button_fg"],
+                             font=self.fonts["base"], padding=(12, 4))
+        self.style.map("TNotebook.Tab",
+                       background=[('selected', self.colors["bg_widget"]), ('active', self.colors["button_hover"])],
+                       foreground=[('selected', self.colors["accent"])])
+
         # --- Scrollbar Styling (Subtle) ---
         self.style.configure("Vertical.TScrollbar",
                              background=self.colors["bg_widget"],
@@ -5648,6 +8873,8 @@ class LinuxPlusStudyGUI:
         main_actions.grid(row=0, column=2, sticky="e") # Use column 2
         ttk.Button(main_actions, text="Start Quiz", command=lambda: self._start_quiz_dialog(QUIZ_MODE_STANDARD), style="TButton").pack(side=tk.LEFT, padx=5)
         ttk.Button(main_actions, text="Verify Knowledge", command=lambda: self._start_quiz_dialog(QUIZ_MODE_VERIFY), style="TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(main_actions, text="Weak Spots", command=self._start_weak_spots_gui, style="TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(main_actions, text="Never Attempted", command=lambda: self._start_quiz_dialog(QUIZ_MODE_UNSEEN), style="TButton").pack(side=tk.LEFT, padx=5)
         # Enable Review Incorrect button (basic functionality added)
         self.review_button = ttk.Button(main_actions, text="Review Incorrect", command=self._review_incorrect_gui, style="TButton")
         self.review_button.pack(side=tk.LEFT, padx=5)
@@ -5697,7 +8924,7 @@ class LinuxPlusStudyGUI:
         # History export can always be enabled
         self.export_history_button.config(state=tk.NORMAL)
         # Q&A export enabled if questions are loaded
-        self.export_qa_button.config(state=tk.NORMAL if self.game_logic.questions else tk.DISABLED)
+        self.export_qa_button.config(state=tk.NORMAL if self.game_logic.categories else tk.DISABLED)
 
 
     def _clear_quiz_area(self, clear_question=True, clear_options=True, clear_feedback=True, clear_explanation=True):
@@ -5733,37 +8960,13 @@ class LinuxPlusStudyGUI:
         else:
              self.question_count_label.config(text="") # Clear if no quiz active
 
-    def _start_quiz_dialog(self, mode):
-        """Show dialog to select category and start quiz in the specified mode."""
-        self.current_quiz_mode = mode # Set the mode for the upcoming session
-
-        dialog_title = "Start Quiz"
-        prompt_text = "Select Category for Standard Quiz:"
-        if mode == QUIZ_MODE_VERIFY:
-             dialog_title = "Verify Knowledge"
-             prompt_text = "Select Category to Verify:"
-
-
-        dialog = tk.Toplevel(self.root)
-        dialog.title(dialog_title)
-        dialog.geometry("450x250")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        dialog.resizable(False, False)
-        dialog.configure(bg=self.colors["bg"])
-
-        try:
-            dialog.tk_setPalette(background=self.colors["bg"], foreground=self.colors["fg"])
-        except tk.TclError:
-            print("Warning: Could not set Toplevel palette (might be OS dependent).")
+    def _build_start_dialog(self, dialog):
+        """Create the start-quiz dialog's widgets once; _start_quiz_dialog refreshes them per mode."""
+        prompt_label = ttk.Label(dialog, text="", font=self.fonts["subheader"],
+                                 background=self.colors["bg"], foreground=self.colors["fg_header"])
+        prompt_label.pack(pady=(25, 10))
 
-
-        ttk.Label(dialog, text=prompt_text, font=self.fonts["subheader"],
-                  background=self.colors["bg"], foreground=self.colors["fg_header"])\
-            .pack(pady=(25, 10))
-
-        categories = ["All Categories"] + sorted(list(self.game_logic.categories))
-        category_var = tk.StringVar(value=categories[0])
+        category_var = tk.StringVar(value="All Categories")
 
         menu_style = {"background": self.colors["button"],
                       "foreground": self.colors["button_fg"],
@@ -5772,9 +8975,9 @@ class LinuxPlusStudyGUI:
                       "font": self.fonts["base"],
                       "relief": "flat", "bd": 0}
 
-        option_menu = ttk.OptionMenu(dialog, category_var, categories[0], *categories, style="TMenubutton")
+        option_menu = ttk.OptionMenu(dialog, category_var, "All Categories", style="TMenubutton")
         option_menu.config(width=35)
-        # Apply style to the dropdown menu itself
+        # Apply style to the dropdown menu itself (set_menu keeps the same menu widget)
         try:
              menu = option_menu["menu"]
              menu.config(**menu_style)
@@ -5783,30 +8986,68 @@ class LinuxPlusStudyGUI:
 
         option_menu.pack(pady=15, padx=30)
 
-        def on_start():
-            selected = category_var.get()
-            self.current_category_filter = None if selected == "All Categories" else selected
+        button_frame = ttk.Frame(dialog, style="TFrame")
+        button_frame.pack(pady=(20, 25))
+        start_button = ttk.Button(button_frame, text="Start", command=self._start_from_dialog_gui, style="Accent.TButton", width=12)
+        start_button.pack(side=tk.LEFT, padx=15)
+        ttk.Button(button_frame, text="Cancel", command=lambda: self.windows.hide("start_dialog"), style="TButton", width=12).pack(side=tk.LEFT, padx=15)
 
-            # --- Calculate total questions for the filter (GUI) ---
-            if self.current_category_filter is None:
-                self.total_questions_in_filter_gui = len(self.game_logic.questions)
-            else:
-                self.total_questions_in_filter_gui = sum(1 for q in self.game_logic.questions if len(q)>3 and q[3] == self.current_category_filter) # Check length
+        return {"prompt_label": prompt_label, "category_var": category_var, "option_menu": option_menu,
+                "start_button": start_button, "categories": None}
+
+    def _start_quiz_dialog(self, mode):
+        """Show dialog to select category and start quiz in the specified mode."""
+        self.current_quiz_mode = mode # Set the mode for the upcoming session
+
+        dialog_title = "Start Quiz"
+        prompt_text = "Select Category for Standard Quiz:"
+        if mode == QUIZ_MODE_VERIFY:
+             dialog_title = "Verify Knowledge"
+             prompt_text = "Select Category to Verify:"
+        elif mode == QUIZ_MODE_UNSEEN:
+             dialog_title = "Never Attempted"
+             prompt_text = "Select Category (unseen questions only):"
 
-            if self.total_questions_in_filter_gui == 0:
-                 messagebox.showwarning("No Questions", f"No questions found for the selected filter: {self.current_category_filter}.\nPlease select another category or add questions.", parent=self.root) # Show warning in main window
-                 dialog.destroy() # Close dialog, but don't start quiz
-                 return
+        dialog, widgets = self.windows.get("start_dialog", self._build_start_dialog, dialog_title, "450x250", resizable=False)
+        dialog.title(dialog_title)
+        widgets["prompt_label"].config(text=prompt_text)
 
-            dialog.destroy()
-            self._start_quiz_session() # Calls the session starter which knows the mode
+        categories = ["All Categories"] + sorted(list(self.game_logic.categories))
+        if widgets["categories"] != categories: # Rebuild the menu entries only when the categories changed
+            widgets["option_menu"].set_menu(categories[0], *categories)
+            widgets["categories"] = categories
+        widgets["category_var"].set(categories[0])
 
-        button_frame = ttk.Frame(dialog, style="TFrame")
-        button_frame.pack(pady=(20, 25))
-        ttk.Button(button_frame, text="Start", command=on_start, style="Accent.TButton", width=12).pack(side=tk.LEFT, padx=15)
-        ttk.Button(button_frame, text="Cancel", command=dialog.destroy, style="TButton", width=12).pack(side=tk.LEFT, padx=15)
+        self.windows.show("start_dialog", focus=widgets["start_button"])
+
+    def _start_from_dialog_gui(self):
+        """Start button of the start-quiz dialog."""
+        self.windows.hide("start_dialog")
+        selected = self.windows.windows["start_dialog"]["widgets"]["category_var"].get()
+        self.current_category_filter = None if selected == "All Categories" else selected
+
+        # --- Calculate total questions for the filter (GUI) ---
+        self.total_questions_in_filter_gui = self.game_logic.count_session_questions(self.current_category_filter, self.current_quiz_mode)
 
-        self.root.wait_window(dialog)
+        if self.total_questions_in_filter_gui == 0 and self.current_quiz_mode == QUIZ_MODE_UNSEEN:
+             messagebox.showinfo("No Unseen Questions", "Every question in this filter has been attempted at least once.", parent=self.root)
+             return
+        if self.total_questions_in_filter_gui == 0:
+             messagebox.showwarning("No Questions", f"No questions found for the selected filter: {self.current_category_filter}.\nPlease select another category or add questions.", parent=self.root) # Show warning in main window
+             return # Don't start the quiz
+
+        self._start_quiz_session() # Calls the session starter which knows the mode
+
+    def _start_weak_spots_gui(self):
+        """Weak Spots button: start a session over the weak-spot index straight away (no category dialog)."""
+        self.current_quiz_mode = QUIZ_MODE_WEAK
+        self.current_category_filter = None
+        self.total_questions_in_filter_gui = self.game_logic.count_session_questions(None, QUIZ_MODE_WEAK)
+        if self.total_questions_in_filter_gui == 0:
+            accuracy = self.game_logic.weak_spots.accuracy * 100
+            messagebox.showinfo("No Weak Spots", f"Every answered question is at or above {accuracy:.0f}% accuracy with no recent misses.", parent=self.root)
+            return
+        self._start_quiz_session()
 
     def _start_quiz_session(self):
         """Begin a new quiz session based on self.current_quiz_mode."""
@@ -5815,11 +9056,12 @@ class LinuxPlusStudyGUI:
         self.game_logic.total_questions_session = 0 # Reset answered count (logic)
         self.questions_answered_in_session_gui = 0 # Reset answered count (GUI)
         self.game_logic.answered_indices_session = []
-        self.gui_verify_session_answers = [] # Clear verify answers
+        self.gui_verify_session_answers = VerifyResults() # Clear verify answers
         self.current_question_index = -1
+        self.game_logic.start_replay_session(self.current_category_filter, self.current_quiz_mode)
 
         cat_display = self.current_category_filter or 'All Categories'
-        mode_display = "Quiz" if self.current_quiz_mode == QUIZ_MODE_STANDARD else "Verify"
+        mode_display = {QUIZ_MODE_VERIFY: "Verify", QUIZ_MODE_WEAK: "Weak spots quiz", QUIZ_MODE_UNSEEN: "Never-attempted quiz"}.get(self.current_quiz_mode, "Quiz")
         self._update_status(f"{mode_display} started.")
         self._update_question_count_label(current=0, total=self.total_questions_in_filter_gui) # Show 0 / total
 
@@ -5859,7 +9101,7 @@ class LinuxPlusStudyGUI:
             self.question_text.insert(tk.END, "Session Complete!\n\n", ("welcome_title",)) # Reuse title tag
             self.question_text.insert(tk.END, "You've answered all available questions in this category/filter for this session.", "welcome_body")
 
-            if self.current_quiz_mode == QUIZ_MODE_STANDARD:
+            if self.current_quiz_mode != QUIZ_MODE_VERIFY:
                  final_score_msg = ""
                  if self.game_logic.total_questions_session > 0:
                      accuracy = (self.game_logic.score / self.game_logic.total_questions_session * 100)
@@ -5884,6 +9126,7 @@ class LinuxPlusStudyGUI:
             self.question_text.config(state=tk.DISABLED)
             self.quiz_active = False
             # self._update_question_count_label() # Clear count label after session ends? No, keep final.
+            self.game_logic.finish_replay_session()
             self.game_logic.save_history() # Save history at the end
             # Update button states for Review/Export if history changed
             incorrect_list = self.game_logic.study_history.get("incorrect_review", [])
@@ -5905,6 +9148,7 @@ class LinuxPlusStudyGUI:
         self.question_text.config(state=tk.DISABLED)
 
         self.selected_answer_var.set(-1) # Reset selection
+        self.question_shown_at = time.perf_counter() # Start the response-time clock
         for i, option in enumerate(options):
             rb = ttk.Radiobutton(self.options_frame, text=option, variable=self.selected_answer_var,
                                  value=i, style="TRadiobutton", takefocus=False, command=lambda: self.submit_button.config(state=tk.NORMAL)) # Enable submit on selection
@@ -5925,6 +9169,9 @@ class LinuxPlusStudyGUI:
 
     def _next_question_gui(self):
         """Select and display the next question."""
+        if self.pending_advance is not None:
+            self.root.after_cancel(self.pending_advance) # Clicked Next before the verify auto-advance
+            self.pending_advance = None
         if not self.quiz_active:
              # This might happen if user clicks Next after session ended but before results shown
              if self.current_quiz_mode == QUIZ_MODE_VERIFY and self.gui_verify_session_answers:
@@ -5936,7 +9183,12 @@ class LinuxPlusStudyGUI:
                   self._load_initial_state() # Reset to welcome screen
              return
 
-        question_data, original_index = self.game_logic.select_question(self.current_category_filter)
+        # Usually picked already by the idle-time prefetch scheduled when the last answer was submitted
+        prefetched = self.game_logic.take_prefetched(self.current_category_filter)
+        if prefetched is not None:
+            question_data, original_index, _ = prefetched
+        else:
+            question_data, original_index = self.game_logic.select_question(self.current_category_filter)
 
         if question_data is None:
             # No more questions available
@@ -5985,9 +9237,12 @@ class LinuxPlusStudyGUI:
              original_question_text = self.game_logic.questions[self.current_question_index][0]
 
         is_correct = (user_answer_index == correct_answer_index)
+        answer_time = (time.perf_counter() - self.question_shown_at) if self.question_shown_at is not None else None
+        self.question_shown_at = None
 
         # --- Update History (Common to both modes) ---
-        self.game_logic.update_history(original_question_text, category, is_correct)
+        self.game_logic.record_replay_step(self.current_question_index, user_answer_index)
+        self.game_logic.update_history(original_question_text, category, is_correct, answer_time=answer_time)
         # Update review button state immediately after history update
         incorrect_list = self.game_logic.study_history.get("incorrect_review", [])
         self.review_button.config(state=tk.NORMAL if isinstance(incorrect_list, list) and incorrect_list else tk.DISABLED)
@@ -5995,9 +9250,11 @@ class LinuxPlusStudyGUI:
         self.game_logic.total_questions_session += 1 # Increment logic counter
         self.questions_answered_in_session_gui += 1 # Increment GUI counter
         # Saving history now happens at end of session or explicit actions
+        # Pick the next question while the user reads the feedback
+        self.root.after_idle(self.game_logic.prefetch, self.current_category_filter, None, None, self.game_logic.session_token)
 
         # --- Mode-Specific Actions ---
-        if self.current_quiz_mode == QUIZ_MODE_STANDARD:
+        if self.current_quiz_mode != QUIZ_MODE_VERIFY:
             # Show immediate feedback
             if is_correct:
                 self.feedback_label.config(text="Correct! \U0001F389", style="Correct.Feedback.TLabel")
@@ -6048,55 +9305,82 @@ class LinuxPlusStudyGUI:
                  if isinstance(widget, ttk.Radiobutton):
                      widget.config(state=tk.DISABLED) # Disable options temporarily
             self._update_status(f"Answer {self.questions_answered_in_session_gui} recorded.")
-            # Automatically trigger next question after a short delay? Or require click? Let's require click.
+            # Move on by itself after the paced delay (like the CLI), unless Next is clicked first
             self.next_button.focus_set()
+            self.pending_advance = self.game_logic.pacer.schedule(self.root, "verify_next", self._auto_advance_gui)
 
+    def _auto_advance_gui(self):
+        """Pacer callback: advance a verify session that is still waiting on the recorded answer."""
+        self.pending_advance = None
+        if self.quiz_active and self.current_quiz_mode == QUIZ_MODE_VERIFY and str(self.next_button.cget("state")) == tk.NORMAL:
+            self._next_question_gui()
 
-    def _show_stats_gui(self):
-        """Display statistics in a Toplevel window with improved styling."""
-        stats_win = tk.Toplevel(self.root)
-        stats_win.title("Study Statistics")
-        stats_win.geometry("900x650")
-        stats_win.transient(self.root)
-        stats_win.grab_set()
-        stats_win.configure(bg=self.colors["bg"])
-        stats_win.minsize(700, 500)
-
-        try:
-            stats_win.tk_setPalette(background=self.colors["bg"], foreground=self.colors["fg"])
-        except tk.TclError:
-            print("Warning: Could not set Toplevel palette for stats window.")
-
-        stats_frame = ttk.Frame(stats_win, padding="15")
-        stats_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Use ScrolledText for the stats display
-        stats_text_widget = scrolledtext.ScrolledText(stats_frame, wrap=tk.WORD, font=self.fonts["stats"],
+    def _make_stats_text(self, tab, label):
+        """Create one statistics tab's ScrolledText, with the tags every stats text uses for coloring/styling."""
+        text_widget = scrolledtext.ScrolledText(tab, wrap=tk.WORD, font=self.fonts["stats"],
                              relief="solid", bd=1, borderwidth=1,
                              bg=self.colors["explanation_bg"], fg=self.colors["fg"],
                              padx=15, pady=15,
                              selectbackground=self.colors["accent"],
                              selectforeground=self.colors["bg"])
-        stats_text_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        text_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         try:
-            stats_text_widget.vbar.configure(style="Vertical.TScrollbar")
+            text_widget.vbar.configure(style="Vertical.TScrollbar")
         except tk.TclError:
-             print("Note: Could not apply custom style to ScrolledText scrollbar in stats.")
-
+             print(f"Note: Could not apply custom style to ScrolledText scrollbar in {label}.")
 
         # --- Define tags for coloring/styling in the Text widget ---
-        stats_text_widget.tag_configure("header", font=self.fonts["subheader"], foreground=self.colors["fg_header"], spacing1=10, spacing3=10)
-        stats_text_widget.tag_configure("subheader", font=self.fonts["bold"], foreground=self.colors["accent"], spacing1=8, spacing3=5)
-        stats_text_widget.tag_configure("label", foreground=self.colors["status_fg"])
-        stats_text_widget.tag_configure("value", foreground=self.colors["fg"])
-        stats_text_widget.tag_configure("correct", foreground=self.colors["correct"])
-        stats_text_widget.tag_configure("incorrect", foreground=self.colors["incorrect"])
-        stats_text_widget.tag_configure("neutral", foreground=self.colors["accent_dark"])
-        stats_text_widget.tag_configure("dim", foreground=self.colors["dim"])
-        stats_text_widget.tag_configure("q_text", foreground=self.colors["fg"], spacing1=5)
-        stats_text_widget.tag_configure("q_details", foreground=self.colors["dim"], spacing3=10) # Details tag
-
-        # --- Populate Stats Text ---
+        text_widget.tag_configure("header", font=self.fonts["subheader"], foreground=self.colors["fg_header"], spacing1=10, spacing3=10)
+        text_widget.tag_configure("subheader", font=self.fonts["bold"], foreground=self.colors["accent"], spacing1=8, spacing3=5)
+        text_widget.tag_configure("label", foreground=self.colors["status_fg"])
+        text_widget.tag_configure("value", foreground=self.colors["fg"])
+        text_widget.tag_configure("correct", foreground=self.colors["correct"])
+        text_widget.tag_configure("incorrect", foreground=self.colors["incorrect"])
+        text_widget.tag_configure("neutral", foreground=self.colors["accent_dark"])
+        text_widget.tag_configure("dim", foreground=self.colors["dim"])
+        text_widget.tag_configure("q_text", foreground=self.colors["fg"], spacing1=5)
+        text_widget.tag_configure("q_details", foreground=self.colors["dim"], spacing3=10) # Details tag
+        return text_widget
+
+    def _build_stats_window(self, stats_win):
+        """Create the statistics window's widgets once; _show_stats_gui refreshes their contents."""
+        stats_frame = ttk.Frame(stats_win, padding="15")
+        stats_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Tabs: all-time overview plus NumPy trend analytics
+        notebook = ttk.Notebook(stats_frame, style="TNotebook")
+        notebook.pack(fill=tk.BOTH, expand=True)
+        overview_tab = ttk.Frame(notebook, style="TFrame")
+        trends_tab = ttk.Frame(notebook, style="TFrame")
+        sessions_tab = ttk.Frame(notebook, style="TFrame")
+        notebook.add(overview_tab, text="Overview")
+        notebook.add(trends_tab, text="Trends")
+        notebook.add(sessions_tab, text="Sessions")
+
+        stats_text_widget = self._make_stats_text(overview_tab, "stats")
+        # --- Trends Tab (filled the first time it is selected after a refresh) ---
+        trends_text = self._make_stats_text(trends_tab, "trends")
+        # --- Sessions Tab (same lazy fill as the trends tab) ---
+        sessions_text = self._make_stats_text(sessions_tab, "sessions")
+
+        # Close button frame
+        button_frame = ttk.Frame(stats_win, style="TFrame")
+        button_frame.pack(pady=(10, 15))
+        close_button = ttk.Button(button_frame, text="Close", command=lambda: self.windows.hide("stats"), style="TButton", width=12)
+        close_button.pack()
+
+        widgets = {"notebook": notebook, "stats_text": stats_text_widget, "trends_text": trends_text,
+                   "sessions_text": sessions_text, "close_button": close_button, "history_key": None,
+                   "trends_ready": False, "sessions_ready": False}
+        notebook.bind("<<NotebookTabChanged>>", lambda event: self._populate_stats_tab_gui(widgets))
+        return widgets
+
+    def _populate_stats_text(self, stats_text_widget):
+        """Fill the overview tab of the statistics window from the study history."""
+        stats_text_widget.config(state=tk.NORMAL)
+        stats_text_widget.delete(1.0, tk.END)
+
         stats_text_widget.insert(tk.END, "--- Study Statistics ---\n", "header")
 
         # Overall Performance
@@ -6144,6 +9428,33 @@ class LinuxPlusStudyGUI:
                 stats_text_widget.insert(tk.END, f"{f'{cat_accuracy:.1f}%'.rjust(9)}\n", acc_tag)
         stats_text_widget.insert(tk.END, "\n")
 
+        # Coverage (popcounts over the attempted-question bitset)
+        stats_text_widget.insert(tk.END, "Question Coverage (attempted at least once):\n", "subheader")
+        coverage_rows, seen_total, bank_total = self.game_logic.coverage.coverage()
+        if bank_total:
+            max_len = max(len(cat) for cat, _, _ in coverage_rows + [("All Categories", 0, 0)])
+            stats_text_widget.insert(tk.END, f"  {'Category'.ljust(max_len)} | {'Seen'.rjust(6)} | {'Total'.rjust(6)} | {'Coverage'.rjust(9)}\n", "label")
+            for category, seen, total in coverage_rows + [("All Categories", seen_total, bank_total)]:
+                stats_text_widget.insert(tk.END, f"  {category.ljust(max_len)} | ")
+                stats_text_widget.insert(tk.END, f"{str(seen).rjust(6)} | {str(total).rjust(6)} | {f'{seen / total * 100:.1f}%'.rjust(9)}\n", "value")
+        stats_text_widget.insert(tk.END, "\n")
+
+        # Response Times (histograms are maintained by update_history)
+        stats_text_widget.insert(tk.END, "Response Times by Category (answers per time bucket):\n", "subheader")
+        time_rows = self.game_logic.response_time_summary()
+        if not time_rows:
+            stats_text_widget.insert(tk.END, "  No timed answers recorded yet.\n", "dim")
+        else:
+            max_len = max(len(cat) for cat, _, _, _ in time_rows)
+            bucket_header = " ".join(label.rjust(6) for label in ANSWER_TIME_BUCKET_LABELS)
+            stats_text_widget.insert(tk.END, f"  {'Category'.ljust(max_len)} | {'Avg'.rjust(6)} | {bucket_header}\n", "label")
+            for category, _, avg_time, time_hist in time_rows:
+                stats_text_widget.insert(tk.END, f"  {category.ljust(max_len)} | ")
+                stats_text_widget.insert(tk.END, f"{f'{avg_time:.1f}s'.rjust(6)}", "value")
+                stats_text_widget.insert(tk.END, " | ")
+                stats_text_widget.insert(tk.END, " ".join(str(count).rjust(6) for count in time_hist) + "\n", "value")
+        stats_text_widget.insert(tk.END, "\n")
+
         # Performance on Specific Questions
         stats_text_widget.insert(tk.END, "Performance on Specific Questions (All History):\n", "subheader")
         question_stats = history.get("questions", {})
@@ -6179,40 +9490,103 @@ class LinuxPlusStudyGUI:
                         last_result = "Correct" if last_correct else "Incorrect"
                         last_tag = "correct" if last_correct else "incorrect"
 
+                avg_time_text = ""
+                if stats.get("timed_attempts", 0) > 0:
+                    avg_time_text = f", avg {stats.get('time_total', 0) / stats['timed_attempts']:.1f}s"
+
                 display_text = (q_text[:100] + '...') if len(q_text) > 100 else q_text
                 stats_text_widget.insert(tk.END, f"{i+1}. \"{display_text}\"\n", "q_text")
                 # Use the q_details tag
                 stats_text_widget.insert(tk.END, f"      ({attempts} attempts, ", "q_details")
                 stats_text_widget.insert(tk.END, f"{accuracy:.1f}%", acc_tag)
-                stats_text_widget.insert(tk.END, " acc.) Last: ", "q_details")
+                stats_text_widget.insert(tk.END, f" acc.{avg_time_text}) Last: ", "q_details")
                 stats_text_widget.insert(tk.END, f"{last_result}\n\n", last_tag)
-        # --- End Populate ---
-
         stats_text_widget.config(state=tk.DISABLED) # Make text read-only
 
-        # Close button frame
-        button_frame = ttk.Frame(stats_win, style="TFrame")
-        button_frame.pack(pady=(10, 15))
-        close_button = ttk.Button(button_frame, text="Close", command=stats_win.destroy, style="TButton", width=12)
-        close_button.pack()
-
-        self.root.wait_window(stats_win)
+    def _populate_stats_tab_gui(self, widgets):
+        """Tab switch in the statistics window: fill the trends or sessions tab on first view."""
+        tab = widgets["notebook"].index(widgets["notebook"].select())
+        if tab == 1:
+            self._populate_trends_gui(widgets)
+        elif tab == 2:
+            self._populate_sessions_gui(widgets)
+
+    def _populate_trends_gui(self, widgets):
+        """Fill the trends tab the first time it is selected after the stats were refreshed."""
+        if widgets["trends_ready"]:
+            return
+        trends_text = widgets["trends_text"]
+        trends_text.config(state=tk.NORMAL)
+        trends_text.delete(1.0, tk.END)
+        trends_text.insert(tk.END, "--- Trends & Exam Readiness ---\n", "header")
+        for text, tag in self.game_logic.analytics.report_lines():
+            trends_text.insert(tk.END, text + "\n", tag)
+        trends_text.config(state=tk.DISABLED)
+        widgets["trends_ready"] = True
+
+    def _populate_sessions_gui(self, widgets):
+        """Fill the sessions tab the first time it is selected after the stats were refreshed."""
+        if widgets["sessions_ready"]:
+            return
+        sessions_text = widgets["sessions_text"]
+        sessions_text.config(state=tk.NORMAL)
+        sessions_text.delete(1.0, tk.END)
+        sessions_text.insert(tk.END, "--- Session History ---\n", "header")
+        for text, tag in session_report_lines(self.game_logic.study_history["sessions"]):
+            sessions_text.insert(tk.END, text + "\n", tag)
+        sessions_text.config(state=tk.DISABLED)
+        widgets["sessions_ready"] = True
 
-    def _show_verify_results_gui(self):
-        """Displays the results after a 'Verify Knowledge' session in a Toplevel window."""
-        results_win = tk.Toplevel(self.root)
-        results_win.title("Verification Results")
-        results_win.geometry("900x700") # Make it a bit taller for results
-        results_win.transient(self.root)
-        results_win.grab_set()
-        results_win.configure(bg=self.colors["bg"])
-        results_win.minsize(700, 550)
+    def _show_stats_gui(self):
+        """Display statistics in the (reused) statistics window."""
+        stats_win, widgets = self.windows.get("stats", self._build_stats_window, "Study Statistics", "900x650", minsize=(700, 500))
 
-        try:
-            results_win.tk_setPalette(background=self.colors["bg"], foreground=self.colors["fg"])
-        except tk.TclError:
-            print("Warning: Could not set Toplevel palette for results window.")
+        # Only re-render when the history changed since the window was last filled
+        history = self.game_logic.study_history
+        history_key = (id(history), history.get("total_attempts", 0), len(history.get("questions", {})),
+                       len(history["sessions"]["started"]))
+        if widgets["history_key"] != history_key:
+            self._populate_stats_text(widgets["stats_text"])
+            widgets["history_key"] = history_key
+            widgets["trends_ready"] = False
+            widgets["sessions_ready"] = False
+
+        widgets["notebook"].select(0)
+        widgets["stats_text"].yview_moveto(0)
+        self.windows.show("stats", focus=widgets["close_button"])
+
+    def _insert_verify_entry(self, results_text, number, entry):
+        """Insert one answered question of the verify results into the results text widget."""
+        q_data, user_answer_idx, is_correct = entry
+        if len(q_data) < 5: return # Safety skip
+        q_text, options, correct_idx, _, explanation = q_data
+        results_text.insert(tk.END, f"{number}. {q_text}\n", "q_text")
+
+         # Validate indices before accessing options
+        if 0 <= user_answer_idx < len(options) and 0 <= correct_idx < len(options):
+            user_choice_text = options[user_answer_idx]
+            correct_choice_text = options[correct_idx]
+
+            # Display user's answer with feedback
+            user_tag = "correct" if is_correct else "incorrect"
+            feedback_icon = "\U0001F389" if is_correct else "\U0001F61E"
+            results_text.insert(tk.END, f"Your answer: {user_answer_idx+1}. {user_choice_text} ({feedback_icon})\n", ("option", user_tag))
+
+            # Display correct answer only if incorrect
+            if not is_correct:
+                results_text.insert(tk.END, f"Correct answer: {correct_idx+1}. {correct_choice_text}\n", ("option", "correct"))
+
+            # Display explanation if available
+            if explanation:
+                results_text.insert(tk.END, f"Explanation: {explanation}\n", "explanation")
+
+            results_text.insert(tk.END, f"{'.'*50}\n", "separator") # Separator after each question
+        else:
+             results_text.insert(tk.END, f"Error displaying details: Invalid index.\n", "incorrect")
+             results_text.insert(tk.END, f"{'.'*50}\n", "separator")
 
+    def _build_verify_results_window(self, results_win):
+        """Create the verify results window's widgets once; _show_verify_results_gui refreshes them."""
         results_frame = ttk.Frame(results_win, padding="15")
         results_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -6243,73 +9617,107 @@ class LinuxPlusStudyGUI:
         results_text.tag_configure("separator", foreground=self.colors["border"], justify='center', spacing1=10, spacing3=10)
 
 
+        # Paging controls (packed only when there are answers to page through)
+        pager_frame = ttk.Frame(results_win, style="TFrame")
+        prev_button = ttk.Button(pager_frame, text="< Previous", style="TButton", width=12)
+        page_label = ttk.Label(pager_frame, text="", style="TLabel")
+        next_button = ttk.Button(pager_frame, text="Next >", style="TButton", width=12)
+        incorrect_only = tk.BooleanVar(value=False)
+        incorrect_check = ttk.Checkbutton(pager_frame, text="Incorrect only", variable=incorrect_only)
+        prev_button.pack(side=tk.LEFT, padx=5)
+        page_label.pack(side=tk.LEFT, padx=10)
+        next_button.pack(side=tk.LEFT, padx=5)
+        incorrect_check.pack(side=tk.LEFT, padx=(20, 0))
+
+        # Close button
+        button_frame = ttk.Frame(results_win, style="TFrame")
+        button_frame.pack(side=tk.BOTTOM, pady=(10, 15))
+        close_button = ttk.Button(button_frame, text="Close", command=self._close_verify_results_gui, style="TButton", width=12)
+        close_button.pack()
+        results_win.protocol("WM_DELETE_WINDOW", self._close_verify_results_gui) # Handle window close button
+
+        widgets = {"text": results_text, "pager_frame": pager_frame, "button_frame": button_frame,
+                   "prev_button": prev_button, "page_label": page_label, "next_button": next_button,
+                   "close_button": close_button, "incorrect_only": incorrect_only, "page": 0}
+        prev_button.config(command=lambda: self._change_verify_page_gui(widgets, -1))
+        next_button.config(command=lambda: self._change_verify_page_gui(widgets, 1))
+        incorrect_check.config(command=lambda: self._change_verify_page_gui(widgets, None))
+        return widgets
+
+    def _render_verify_page_gui(self, widgets):
+        """Replace the detailed-review area of the results window with the current page."""
+        results = self.gui_verify_session_answers
+        results_text = widgets["text"]
+        incorrect_only = widgets["incorrect_only"].get()
+        page_total = results.page_count(incorrect_only=incorrect_only)
+        widgets["page"] = min(widgets["page"], page_total - 1)
+        results_text.config(state=tk.NORMAL)
+        results_text.delete("page_start", tk.END)
+        view = "Incorrect Answers" if incorrect_only else "Detailed Review"
+        results_text.insert(tk.END, f"{view} (page {widgets['page'] + 1} of {page_total}):\n", "subheader")
+        page = results.page(widgets["page"], incorrect_only=incorrect_only)
+        if not page:
+            results_text.insert(tk.END, "No incorrect answers in this session!\n", "correct")
+        for number, entry in page:
+            self._insert_verify_entry(results_text, number, entry)
+        results_text.config(state=tk.DISABLED)
+        results_text.yview_moveto(0)
+        widgets["page_label"].config(text=f"Page {widgets['page'] + 1} / {page_total}")
+        widgets["prev_button"].config(state=tk.NORMAL if widgets["page"] > 0 else tk.DISABLED)
+        widgets["next_button"].config(state=tk.NORMAL if widgets["page"] + 1 < page_total else tk.DISABLED)
+
+    def _change_verify_page_gui(self, widgets, step):
+        """Move step pages through the results, or back to the first page when step is None (filter toggled)."""
+        widgets["page"] = 0 if step is None else widgets["page"] + step
+        self._render_verify_page_gui(widgets)
+
+    def _close_verify_results_gui(self):
+        """Hide the results window and reset main window state."""
+        self.windows.hide("verify_results")
+        self._load_initial_state() # Go back to welcome screen
+
+    def _show_verify_results_gui(self):
+        """Displays the results after a 'Verify Knowledge' session in the (reused) results window."""
+        results_win, widgets = self.windows.get("verify_results", self._build_verify_results_window,
+                                                "Verification Results", "900x700", minsize=(700, 550))
+        results_text = widgets["text"]
+
         # --- Populate Results ---
-        results_text.insert(tk.END, "--- Verification Results ---\n", "header")
+        # Summary comes from the running tally; the detailed review is rendered one page at a time
+        results = self.gui_verify_session_answers
+        results_text.config(state=tk.NORMAL)
+        results_text.delete(1.0, tk.END)
 
-        if not self.gui_verify_session_answers:
+        results_text.insert(tk.END, "--- Verification Results ---\n", "header")
+        if not results:
             results_text.insert(tk.END, "No questions were answered in this verification session.\n", "dim")
         else:
-            num_correct = sum(1 for _, _, is_correct in self.gui_verify_session_answers if is_correct)
-            total_answered = len(self.gui_verify_session_answers)
-            accuracy = (num_correct / total_answered * 100) if total_answered > 0 else 0
+            accuracy = results.accuracy()
             acc_tag = "correct" if accuracy >= 75 else ("neutral" if accuracy >= 50 else "incorrect")
 
             results_text.insert(tk.END, "Session Summary:\n", "subheader")
             results_text.insert(tk.END, f"  Total Questions Answered: ", "label")
-            results_text.insert(tk.END, f"{total_answered}\n", "value")
+            results_text.insert(tk.END, f"{len(results)}\n", "value")
             results_text.insert(tk.END, f"  Correct Answers:         ", "label")
-            results_text.insert(tk.END, f"{num_correct}\n", "value")
+            results_text.insert(tk.END, f"{results.correct}\n", "value")
             results_text.insert(tk.END, f"  Accuracy:                ", "label")
             results_text.insert(tk.END, f"{accuracy:.2f}%\n\n", acc_tag)
             results_text.insert(tk.END, f"{'-'*50}\n", "separator")
-
-            results_text.insert(tk.END, "Detailed Review:\n", "subheader")
-            for i, (q_data, user_answer_idx, is_correct) in enumerate(self.gui_verify_session_answers):
-                if len(q_data) < 5: continue # Safety skip
-                q_text, options, correct_idx, _, explanation = q_data
-                results_text.insert(tk.END, f"{i+1}. {q_text}\n", "q_text")
-
-                 # Validate indices before accessing options
-                if 0 <= user_answer_idx < len(options) and 0 <= correct_idx < len(options):
-                    user_choice_text = options[user_answer_idx]
-                    correct_choice_text = options[correct_idx]
-
-                    # Display user's answer with feedback
-                    user_tag = "correct" if is_correct else "incorrect"
-                    feedback_icon = "\U0001F389" if is_correct else "\U0001F61E"
-                    results_text.insert(tk.END, f"Your answer: {user_answer_idx+1}. {user_choice_text} ({feedback_icon})\n", ("option", user_tag))
-
-                    # Display correct answer only if incorrect
-                    if not is_correct:
-                        results_text.insert(tk.END, f"Correct answer: {correct_idx+1}. {correct_choice_text}\n", ("option", "correct"))
-
-                    # Display explanation if available
-                    if explanation:
-                        results_text.insert(tk.END, f"Explanation: {explanation}\n", "explanation")
-
-                    results_text.insert(tk.END, f"{'.'*50}\n", "separator") # Separator after each question
-                else:
-                     results_text.insert(tk.END, f"Error displaying details: Invalid index.\n", "incorrect")
-                     results_text.insert(tk.END, f"{'.'*50}\n", "separator")
-
+            results_text.mark_set("page_start", tk.END + "-1c") # Page content goes after this mark
+            results_text.mark_gravity("page_start", tk.LEFT)
 
         results_text.config(state=tk.DISABLED) # Make read-only
+        results_text.yview_moveto(0)
 
-        # Close button
-        button_frame = ttk.Frame(results_win, style="TFrame")
-        button_frame.pack(pady=(10, 15))
-        close_button = ttk.Button(button_frame, text="Close", style="TButton", width=12)
-        close_button.pack()
-
-        # Reset main window state after closing results
-        def on_close():
-            results_win.destroy()
-            self._load_initial_state() # Go back to welcome screen
-
-        results_win.protocol("WM_DELETE_WINDOW", on_close) # Handle window close button
-        close_button.config(command=on_close) # Also handle button click
+        widgets["page"] = 0
+        widgets["incorrect_only"].set(False)
+        if results:
+            widgets["pager_frame"].pack(side=tk.BOTTOM, pady=(10, 0), after=widgets["button_frame"]) # Just above the Close button
+            self._render_verify_page_gui(widgets)
+        else:
+            widgets["pager_frame"].pack_forget()
 
-        self.root.wait_window(results_win)
+        self.windows.show("verify_results", focus=widgets["close_button"])
 
 
     def _clear_stats_gui(self):
@@ -6319,19 +9727,138 @@ class LinuxPlusStudyGUI:
                                "This includes all performance statistics and the list of incorrect answers.\n\n"
                                "This action cannot be undone.",
                                parent=self.root, icon='warning'):
-            self.game_logic.study_history = self.game_logic._default_history()
-            # Re-populate categories with 0 stats just in case logic changes
-            for category in self.game_logic.categories:
-                 self.game_logic.study_history["categories"].setdefault(category, {"correct": 0, "attempts": 0})
-            self.game_logic.save_history()
+            self.game_logic.reset_history()
             messagebox.showinfo("Stats Cleared", "Study history has been cleared.", parent=self.root)
             self._update_status("Study history cleared.")
             # Disable review button as list is now empty
             self.review_button.config(state=tk.DISABLED)
 
+    def _build_review_window(self, review_win):
+        """Create the review window's widgets once; _review_incorrect_gui refreshes their contents."""
+        # Main content frame using pack
+        review_frame = ttk.Frame(review_win, padding="15")
+        review_frame.pack(fill=tk.BOTH, expand=True, side=tk.TOP) # Pack this first
+        review_frame.rowconfigure(1, weight=1) # Make text area expand within grid
+        review_frame.columnconfigure(0, weight=1)
+
+        # Header (using grid inside review_frame)
+        ttk.Label(review_frame, text="Incorrectly Answered Questions", style="Header.TLabel").grid(row=0, column=0, pady=(0,15), sticky="w")
+
+        # Display Area (ScrolledText using grid inside review_frame)
+        review_text = scrolledtext.ScrolledText(review_frame, wrap=tk.WORD, font=self.fonts["base"], # Use base font
+                                                 relief="solid", bd=1, borderwidth=1,
+                                                 bg=self.colors["explanation_bg"], fg=self.colors["fg"],
+                                                 padx=15, pady=15,
+                                                 selectbackground=self.colors["accent"],
+                                                 selectforeground=self.colors["bg"])
+        review_text.grid(row=1, column=0, sticky="nsew", pady=5)
+        try:
+             review_text.vbar.configure(style="Vertical.TScrollbar")
+        except tk.TclError:
+             print("Note: Could not apply custom style to ScrolledText scrollbar in review.")
+
+        # --- Define tags ---
+        review_text.tag_configure("q_text", font=self.fonts["question"], foreground=self.colors["fg"], spacing1=8, spacing3=5)
+        review_text.tag_configure("option", font=self.fonts["option"], foreground=self.colors["fg"], lmargin1=20, lmargin2=20)
+        review_text.tag_configure("correct_option", font=self.fonts["option"], foreground=self.colors["correct"], lmargin1=20, lmargin2=20)
+        review_text.tag_configure("explanation", font=self.fonts["explanation"], foreground=self.colors["dim"], lmargin1=20, lmargin2=20, spacing1=5, spacing3=10)
+        review_text.tag_configure("category", font=self.fonts["italic"], foreground=self.colors["category_fg"], spacing1=5)
+        review_text.tag_configure("separator", foreground=self.colors["border"], justify='center', spacing1=10, spacing3=10)
+        review_text.tag_configure("warning", foreground=self.colors["incorrect"], font=self.fonts["italic"])
+
+
+        # --- Action Buttons Frame (using pack inside review_win) ---
+        button_frame = ttk.Frame(review_win, style="TFrame")
+        button_frame.pack(pady=(10, 15), fill='x', side=tk.BOTTOM) # Pack this at the bottom
+
+        clear_button = ttk.Button(button_frame, text="Clear Item from List", command=self._clear_review_item_gui, style="TButton", width=20)
+        clear_button.pack(side=tk.LEFT, padx=(15, 5)) # Add padding
+
+        close_button = ttk.Button(button_frame, text="Close", command=self._close_review_gui, style="TButton", width=12)
+        close_button.pack(side=tk.RIGHT, padx=(5, 15)) # Add padding
+
+        # Save history when closing the window if changes were made
+        review_win.protocol("WM_DELETE_WINDOW", self._close_review_gui)
+        return {"text": review_text, "clear_button": clear_button, "close_button": close_button}
+
+    def _populate_review_text(self, review_text):
+        """Fill the review window from self.review_questions and self.review_not_found."""
+        review_text.config(state=tk.NORMAL)
+        review_text.delete(1.0, tk.END)
+        for i, q_data in enumerate(self.review_questions):
+             if len(q_data) < 5: continue # Safety skip malformed
+             q_text, options, correct_idx, category, explanation = q_data
+             review_text.insert(tk.END, f"{i+1}. {q_text}\n", "q_text")
+             review_text.insert(tk.END, f"Category: {category}\n", "category")
+
+             for j, option in enumerate(options):
+                 # Validate index
+                 if 0 <= correct_idx < len(options):
+                     if j == correct_idx:
+                         review_text.insert(tk.END, f"   \u2714 {option} (Correct Answer)\n", "correct_option") # Checkmark
+                     else:
+                         review_text.insert(tk.END, f"   \u2022 {option}\n", "option") # Bullet
+                 else: # Handle invalid correct_idx case if needed
+                      review_text.insert(tk.END, f"   \u2022 {option}\n", "option") # Default display
+
+             if explanation:
+                 review_text.insert(tk.END, f"Explanation: {explanation}\n", "explanation")
+
+             review_text.insert(tk.END, f"{'-'*50}\n", "separator")
+
+        if self.review_not_found:
+             review_text.insert(tk.END, "\nWarning: Some questions previously marked incorrect could not be found (they might have been removed from the source data and were removed from this list):\n", "warning")
+             for nf_text in self.review_not_found:
+                 review_text.insert(tk.END, f"- {nf_text[:80]}...\n", "warning")
+        review_text.config(state=tk.DISABLED) # Make read-only
+
+    def _clear_review_item_gui(self):
+        """Clear Item button of the review window: drop one question from the incorrect list."""
+        review_win = self.windows.windows["review"]["window"]
+        widgets = self.windows.windows["review"]["widgets"]
+        questions_to_review = self.review_questions
+        # Simple approach: Ask user which number to clear
+        num_str = simpledialog.askstring("Clear Item", "Enter the number of the question to remove from this review list:", parent=review_win)
+        if num_str:
+            try:
+                num_to_clear = int(num_str) - 1 # Convert to 0-based index
+                if 0 <= num_to_clear < len(questions_to_review):
+                    # Check if question data is valid before accessing text
+                    if isinstance(questions_to_review[num_to_clear], (list, tuple)) and len(questions_to_review[num_to_clear]) > 0:
+                        question_to_clear_text = questions_to_review[num_to_clear][0]
+                        if messagebox.askyesno("Confirm Clear", f"Remove question {num_to_clear+1} from the review list?", parent=review_win):
+                             # Ensure list exists and is a list before removing
+                            if isinstance(self.game_logic.study_history.get("incorrect_review"), list) and question_to_clear_text in self.game_logic.study_history["incorrect_review"]:
+                                self.game_logic.study_history["incorrect_review"].remove(question_to_clear_text)
+                                self.review_history_changed = True
+                                messagebox.showinfo("Cleared", "Question removed from review list.", parent=review_win)
+                                # Remove from the list used by this window and refresh display
+                                del questions_to_review[num_to_clear]
+                                self._populate_review_text(widgets["text"]) # Refresh the text widget
+                                # Update main window button state if list becomes empty
+                                if not self.game_logic.study_history.get("incorrect_review", []):
+                                     self.review_button.config(state=tk.DISABLED)
+                                     # Disable clear button if list is now empty
+                                     widgets["clear_button"].config(state=tk.DISABLED)
+                            else:
+                                 messagebox.showerror("Error", "Question not found in history list.", parent=review_win)
+                    else:
+                         messagebox.showerror("Error", "Cannot clear invalid question data.", parent=review_win)
+                else:
+                    messagebox.showwarning("Invalid Number", f"Please enter a number between 1 and {len(questions_to_review)}.", parent=review_win)
+            except ValueError:
+                messagebox.showerror("Invalid Input", "Please enter a valid number.", parent=review_win)
+
+    def _close_review_gui(self):
+        """Hide the review window, saving history if items were removed while it was open."""
+        if self.review_history_changed:
+             self.game_logic.save_history()
+             self.review_history_changed = False
+        self.windows.hide("review")
+
     # --- MODIFIED _review_incorrect_gui ---
     def _review_incorrect_gui(self):
-        """Allows reviewing incorrect answers in the GUI (Basic View)."""
+        """Allows reviewing incorrect answers in the GUI (Basic View) using the reused review window."""
         incorrect_list = self.game_logic.study_history.get("incorrect_review", [])
         # Ensure it's a list
         if not isinstance(incorrect_list, list):
@@ -6343,6 +9870,7 @@ class LinuxPlusStudyGUI:
             return
 
         # Find the full question data
+        self.game_logic.ensure_category_loaded(None) # Review entries can come from any category
         questions_to_review = []
         not_found_questions = []
         questions_to_remove_from_history = []
@@ -6389,144 +9917,48 @@ class LinuxPlusStudyGUI:
              return
 
 
-        # --- Create Review Window ---
-        review_win = tk.Toplevel(self.root)
-        review_win.title("Review Incorrect Answers")
-        review_win.geometry("900x700")
-        review_win.transient(self.root)
-        review_win.grab_set()
-        review_win.configure(bg=self.colors["bg"])
-        review_win.minsize(700, 550)
-
-        try:
-            review_win.tk_setPalette(background=self.colors["bg"], foreground=self.colors["fg"])
-        except tk.TclError:
-            print("Warning: Could not set Toplevel palette for review window.")
-
-        # Main content frame using pack
-        review_frame = ttk.Frame(review_win, padding="15")
-        review_frame.pack(fill=tk.BOTH, expand=True, side=tk.TOP) # Pack this first
-        review_frame.rowconfigure(1, weight=1) # Make text area expand within grid
-        review_frame.columnconfigure(0, weight=1)
-
-        # Header (using grid inside review_frame)
-        ttk.Label(review_frame, text="Incorrectly Answered Questions", style="Header.TLabel").grid(row=0, column=0, pady=(0,15), sticky="w")
-
-        # Display Area (ScrolledText using grid inside review_frame)
-        review_text = scrolledtext.ScrolledText(review_frame, wrap=tk.WORD, font=self.fonts["base"], # Use base font
-                                                 relief="solid", bd=1, borderwidth=1,
-                                                 bg=self.colors["explanation_bg"], fg=self.colors["fg"],
-                                                 padx=15, pady=15,
-                                                 selectbackground=self.colors["accent"],
-                                                 selectforeground=self.colors["bg"])
-        review_text.grid(row=1, column=0, sticky="nsew", pady=5)
-        try:
-             review_text.vbar.configure(style="Vertical.TScrollbar")
-        except tk.TclError:
-             print("Note: Could not apply custom style to ScrolledText scrollbar in review.")
-
-        # --- Define tags ---
-        review_text.tag_configure("q_text", font=self.fonts["question"], foreground=self.colors["fg"], spacing1=8, spacing3=5)
-        review_text.tag_configure("option", font=self.fonts["option"], foreground=self.colors["fg"], lmargin1=20, lmargin2=20)
-        review_text.tag_configure("correct_option", font=self.fonts["option"], foreground=self.colors["correct"], lmargin1=20, lmargin2=20)
-        review_text.tag_configure("explanation", font=self.fonts["explanation"], foreground=self.colors["dim"], lmargin1=20, lmargin2=20, spacing1=5, spacing3=10)
-        review_text.tag_configure("category", font=self.fonts["italic"], foreground=self.colors["category_fg"], spacing1=5)
-        review_text.tag_configure("separator", foreground=self.colors["border"], justify='center', spacing1=10, spacing3=10)
-        review_text.tag_configure("warning", foreground=self.colors["incorrect"], font=self.fonts["italic"])
-
-
-        # --- Populate Review Text ---
-        def populate_review_text():
-            review_text.config(state=tk.NORMAL)
-            review_text.delete(1.0, tk.END)
-            for i, q_data in enumerate(questions_to_review):
-                 if len(q_data) < 5: continue # Safety skip malformed
-                 q_text, options, correct_idx, category, explanation = q_data
-                 review_text.insert(tk.END, f"{i+1}. {q_text}\n", "q_text")
-                 review_text.insert(tk.END, f"Category: {category}\n", "category")
-
-                 for j, option in enumerate(options):
-                     # Validate index
-                     if 0 <= correct_idx < len(options):
-                         if j == correct_idx:
-                             review_text.insert(tk.END, f"   \u2714 {option} (Correct Answer)\n", "correct_option") # Checkmark
-                         else:
-                             review_text.insert(tk.END, f"   \u2022 {option}\n", "option") # Bullet
-                     else: # Handle invalid correct_idx case if needed
-                          review_text.insert(tk.END, f"   \u2022 {option}\n", "option") # Default display
-
-                 if explanation:
-                     review_text.insert(tk.END, f"Explanation: {explanation}\n", "explanation")
-
-                 review_text.insert(tk.END, f"{'-'*50}\n", "separator")
-
-            if not_found_questions:
-                 review_text.insert(tk.END, "\nWarning: Some questions previously marked incorrect could not be found (they might have been removed from the source data and were removed from this list):\n", "warning")
-                 for nf_text in not_found_questions:
-                     review_text.insert(tk.END, f"- {nf_text[:80]}...\n", "warning")
-            review_text.config(state=tk.DISABLED) # Make read-only
-
-        populate_review_text() # Initial population
-
-        # --- Action Buttons Frame (using pack inside review_win) ---
-        button_frame = ttk.Frame(review_win, style="TFrame")
-        button_frame.pack(pady=(10, 15), fill='x', side=tk.BOTTOM) # Pack this at the bottom
-
-        # --- Buttons (using pack inside button_frame) ---
-        # nonlocal history_changed # <<< REMOVED from here
-
-        def clear_item_from_review_list():
-            nonlocal history_changed # <<< MOVED here, start of function scope
-            # Simple approach: Ask user which number to clear
-            num_str = simpledialog.askstring("Clear Item", "Enter the number of the question to remove from this review list:", parent=review_win)
-            if num_str:
-                try:
-                    num_to_clear = int(num_str) - 1 # Convert to 0-based index
-                    if 0 <= num_to_clear < len(questions_to_review):
-                        # Check if question data is valid before accessing text
-                        if isinstance(questions_to_review[num_to_clear], (list, tuple)) and len(questions_to_review[num_to_clear]) > 0:
-                            question_to_clear_text = questions_to_review[num_to_clear][0]
-                            if messagebox.askyesno("Confirm Clear", f"Remove question {num_to_clear+1} from the review list?", parent=review_win):
-                                 # Ensure list exists and is a list before removing
-                                if isinstance(self.game_logic.study_history.get("incorrect_review"), list) and question_to_clear_text in self.game_logic.study_history["incorrect_review"]:
-                                    self.game_logic.study_history["incorrect_review"].remove(question_to_clear_text)
-                                    history_changed = True # Assign *after* nonlocal declaration
-                                    messagebox.showinfo("Cleared", "Question removed from review list.", parent=review_win)
-                                    # Remove from the list used by this window and refresh display
-                                    del questions_to_review[num_to_clear]
-                                    populate_review_text() # Refresh the text widget
-                                    # Update main window button state if list becomes empty
-                                    if not self.game_logic.study_history.get("incorrect_review", []):
-                                         self.review_button.config(state=tk.DISABLED)
-                                         # Disable clear button if list is now empty
-                                         clear_button.config(state=tk.DISABLED)
-                                else:
-                                     messagebox.showerror("Error", "Question not found in history list.", parent=review_win)
-                        else:
-                             messagebox.showerror("Error", "Cannot clear invalid question data.", parent=review_win)
-                    else:
-                        messagebox.showwarning("Invalid Number", f"Please enter a number between 1 and {len(questions_to_review)}.", parent=review_win)
-                except ValueError:
-                    messagebox.showerror("Invalid Input", "Please enter a valid number.", parent=review_win)
-
-        clear_button_state = tk.NORMAL if questions_to_review else tk.DISABLED
-        clear_button = ttk.Button(button_frame, text="Clear Item from List", command=clear_item_from_review_list, style="TButton", width=20, state=clear_button_state)
-        clear_button.pack(side=tk.LEFT, padx=(15, 5)) # Add padding
-
-        close_button = ttk.Button(button_frame, text="Close", style="TButton", width=12)
-        close_button.pack(side=tk.RIGHT, padx=(5, 15)) # Add padding
-
-        # Save history when closing the window if changes were made
-        def on_close():
-             if history_changed:
-                  self.game_logic.save_history()
-             review_win.destroy()
-        review_win.protocol("WM_DELETE_WINDOW", on_close)
-        # Also assign the command to the button
-        close_button.config(command=on_close)
-
-
-        self.root.wait_window(review_win)
+        # --- Show Review Window ---
+        self.review_questions = questions_to_review
+        self.review_not_found = not_found_questions
+        self.review_history_changed = history_changed
+        review_win, widgets = self.windows.get("review", self._build_review_window, "Review Incorrect Answers", "900x700", minsize=(700, 550))
+        self._populate_review_text(widgets["text"])
+        widgets["text"].yview_moveto(0)
+        widgets["clear_button"].config(state=tk.NORMAL if questions_to_review else tk.DISABLED)
+        self.windows.show("review", focus=widgets["close_button"])
+
+    def check_windows(self):
+        """Open, close and reopen every reused window (--gui-check). Returns [(window name, problem or None)].
+
+        Review and verify results need content: an incorrect_review entry and verify answers.
+        """
+        openers = {
+            "start_dialog": (lambda: self._start_quiz_dialog(QUIZ_MODE_STANDARD), lambda: self.windows.hide("start_dialog")),
+            "stats": (self._show_stats_gui, lambda: self.windows.hide("stats")),
+            "review": (self._review_incorrect_gui, self._close_review_gui),
+            "verify_results": (self._show_verify_results_gui, self._close_verify_results_gui),
+        }
+        results = []
+        for name, (open_window, close_window) in openers.items():
+            try:
+                opened = []
+                for _ in range(2): # The second open must reuse the withdrawn window
+                    open_window()
+                    self.root.update()
+                    entry = self.windows.windows.get(name)
+                    if entry is None or entry["window"].state() == "withdrawn":
+                        raise RuntimeError("not shown after opening")
+                    opened.append(entry["window"])
+                    close_window()
+                    self.root.update()
+                    if entry["window"].state() != "withdrawn":
+                        raise RuntimeError("still shown after closing")
+                if opened[0] is not opened[1]:
+                    raise RuntimeError("rebuilt instead of reused on reopen")
+                results.append((name, None))
+            except Exception as e:
+                results.append((name, f"{type(e).__name__}: {e}"))
+        return results
 
     def _export_data_gui(self):
         """Exports study history data via GUI using asksaveasfilename."""
@@ -6536,7 +9968,10 @@ class LinuxPlusStudyGUI:
             title="Export Study History", # Updated title
             initialfile=initial_filename,
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[("JSON files", "*.json"), ("Compressed JSON (gzip)", "*.json.gz"),
+                       ("Compressed JSON (xz)", "*.json.xz"), ("Attempt log (CSV)", "*.csv"),
+                       ("Attempt log (CSV, gzip)", "*.csv.gz"), ("Attempt log (columnar binary)", f"*{ATTEMPT_LOG_EXTENSION}"),
+                       ("All files", "*.*")]
         )
 
         if not export_filename:
@@ -6548,10 +9983,12 @@ class LinuxPlusStudyGUI:
             self._update_status(f"Exporting history to {os.path.basename(export_path)}...")
             self.root.update_idletasks() # Update status label before potential delay
 
-            with open(export_filename, 'w', encoding='utf-8') as f: # Use encoding
-                json.dump(self.game_logic.study_history, f, indent=2)
-
-            messagebox.showinfo("Export Successful", f"Study history successfully exported to:\n{export_path}", parent=self.root)
+            if is_attempt_export_path(export_filename):
+                rows = self.game_logic.export_attempt_log(export_filename) # Streamed, one question record at a time
+                messagebox.showinfo("Export Successful", f"{rows} attempts successfully exported to:\n{export_path}", parent=self.root)
+            else:
+                write_history_export(export_filename, self.game_logic.study_history)
+                messagebox.showinfo("Export Successful", f"Study history successfully exported to:\n{export_path}", parent=self.root)
             self._update_status("History export successful.")
 
         except IOError as e:
@@ -6564,6 +10001,7 @@ class LinuxPlusStudyGUI:
     def _export_questions_answers_gui(self):
         """Exports loaded questions and answers via GUI using asksaveasfilename."""
         # Check if there are questions loaded
+        self.game_logic.ensure_category_loaded(None)
         if not self.game_logic.questions:
              messagebox.showwarning("Export Q&A", "No questions are currently loaded to export.", parent=self.root)
              # Disable button if no questions? Update state maybe.
@@ -6589,41 +10027,7 @@ class LinuxPlusStudyGUI:
             self.root.update_idletasks()
 
             with open(export_filename, 'w', encoding='utf-8') as f:
-                # --- Write Questions Section (Same logic as CLI method) ---
-                f.write("# Questions\n\n")
-                for i, q_data in enumerate(self.game_logic.questions):
-                    if len(q_data) < 5: continue # Safety skip
-                    question_text, options, _, category, _ = q_data
-                    f.write(f"**Q{i+1}.** ({category})\n")
-                    f.write(f"{question_text}\n")
-                    for j, option in enumerate(options):
-                        f.write(f"   {chr(ord('A') + j)}. {option}\n")
-                    f.write("\n")
-
-                f.write("---\n\n")
-
-                # --- Write Answers Section (Same logic as CLI method) ---
-                f.write("# Answers\n\n")
-                for i, q_data in enumerate(self.game_logic.questions):
-                     if len(q_data) < 5: continue # Safety skip
-                     _, options, correct_answer_index, _, explanation = q_data
-                     # Validate index before using
-                     if 0 <= correct_answer_index < len(options):
-                         correct_option_letter = chr(ord('A') + correct_answer_index)
-                         correct_option_text = options[correct_answer_index]
-                         f.write(f"**A{i+1}.** {correct_option_letter}. {correct_option_text}\n")
-                         if explanation:
-                             explanation_lines = explanation.split('\n')
-                             f.write("   *Explanation:*")
-                             first_line = True
-                             for line in explanation_lines:
-                                 if not first_line:
-                                      f.write("   ") # Indent subsequent lines
-                                 f.write(f" {line.strip()}\n") # Add space before each line, strip extra whitespace
-                                 first_line = False
-                         f.write("\n\n") # Blank line after each answer block
-                     else:
-                          f.write(f"**A{i+1}.** Error: Invalid correct answer index.\n\n")
+                write_questions_answers_md(f, self.game_logic.questions) # Same layout as the CLI export
 
             messagebox.showinfo("Export Successful", f"Questions & Answers successfully exported to:\n{export_path}", parent=self.root)
             self._update_status("Q&A export successful.")
@@ -6647,12 +10051,307 @@ class LinuxPlusStudyGUI:
 
         if quit_confirmed:
              print("Attempting to save history before quitting...") # Add console log
+             self.game_logic.finish_replay_session()
              self.game_logic.save_history()
              print("History saved (or attempted). Quitting GUI.")
+             self.stall_monitor.stop() # Report is written once the main loop has returned
              self.root.quit()
              self.root.destroy() # Ensure window closes fully
 
 
+# --- Curses Front-End ---
+class CursesQuizFrontend:
+    """Full-screen CLI built on curses with a fixed pane layout.
+
+    Each pane remembers what it last drew and is only repainted when its content changes, so moving
+    between questions sends just the changed panes instead of clearing and reprinting the screen.
+    """
+
+    def __init__(self, game_logic):
+        self.game_logic = game_logic
+        self.stdscr = None
+        self.windows = {} # Pane name -> curses window
+        self.pane_content = {} # Pane name -> lines last drawn there
+        self.attrs = {}
+
+    def run(self, stdscr):
+        """Entry point for curses.wrapper: category menu, then quiz sessions until the user quits."""
+        self.stdscr = stdscr
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass # Some terminals cannot hide the cursor
+        self._init_attrs()
+        self._layout()
+        while True:
+            category = self._choose_category()
+            if category is False:
+                break
+            self._run_session(category)
+        self.game_logic.save_history()
+
+    def _init_attrs(self):
+        self.attrs = {"normal": curses.A_NORMAL, "bold": curses.A_BOLD, "dim": curses.A_DIM, "select": curses.A_REVERSE}
+        if curses.has_colors():
+            curses.start_color()
+            try:
+                curses.use_default_colors()
+                background = -1
+            except curses.error:
+                background = curses.COLOR_BLACK
+            for number, (name, color) in enumerate([("header", curses.COLOR_CYAN), ("correct", curses.COLOR_GREEN),
+                                                    ("incorrect", curses.COLOR_RED), ("number", curses.COLOR_YELLOW),
+                                                    ("info", curses.COLOR_BLUE)], start=1):
+                curses.init_pair(number, color, background)
+                self.attrs[name] = curses.color_pair(number) | (curses.A_BOLD if name != "info" else 0)
+        else:
+            for name in ("header", "correct", "incorrect", "number", "info"):
+                self.attrs[name] = curses.A_BOLD
+
+    def _layout(self):
+        """(Re)create the pane windows for the current terminal size and forget what they showed."""
+        height, width = self.stdscr.getmaxyx()
+        self.stdscr.erase()
+        self.stdscr.noutrefresh()
+        question_height = max(3, height // 5)
+        options_height = max(4, height // 4)
+        feedback_top = 3 + question_height + options_height
+        feedback_height = max(1, height - feedback_top - 1)
+        spec = {
+            "header": (1, 0), "score": (1, 1),
+            "question": (question_height, 2), "options": (options_height, 2 + question_height + 1),
+            "feedback": (feedback_height, feedback_top), "prompt": (1, height - 1),
+        }
+        self.windows = {}
+        for name, (lines, top) in spec.items():
+            top = min(top, height - 1)
+            lines = max(1, min(lines, height - top))
+            self.windows[name] = curses.newwin(lines, width, top, 0)
+        self.windows["prompt"].keypad(True)
+        self.pane_content = {}
+
+    def _set_pane(self, name, lines):
+        """Draw [(text, attr name)] into a pane, word-wrapped; skipped entirely if nothing changed."""
+        window = self.windows[name]
+        pane_height, pane_width = window.getmaxyx()
+        wrapped = []
+        for text, attr in lines:
+            for row in (textwrap.wrap(text, max(10, pane_width - 2)) or [""]):
+                wrapped.append((row, attr))
+        wrapped = wrapped[:pane_height]
+        if self.pane_content.get(name) == wrapped:
+            return
+        self.pane_content[name] = wrapped
+        window.erase()
+        for row_number, (row, attr) in enumerate(wrapped):
+            try:
+                window.addnstr(row_number, 1, row, pane_width - 2, self.attrs.get(attr, curses.A_NORMAL))
+            except curses.error:
+                pass # Writing the bottom-right cell raises; the text is still drawn
+        window.noutrefresh()
+
+    def _read_key(self):
+        """Flush pending pane updates in one write, then wait for a key. Handles terminal resizes.
+
+        Letter keys come back lowercase, so Q/S work like q/s everywhere.
+        """
+        curses.doupdate()
+        while True:
+            key = self.windows["prompt"].getch()
+            if key == curses.KEY_RESIZE:
+                # Panes get new geometry; repaint the remembered content into them
+                previous = self.pane_content
+                self._layout()
+                for name, lines in previous.items():
+                    self._set_pane(name, lines)
+                curses.doupdate()
+                continue
+            if ord('A') <= key <= ord('Z'):
+                key += ord('a') - ord('A')
+            return key
+
+    def _choose_category(self):
+        """Arrow-key category list. Returns a category, None for all categories, or False to quit."""
+        categories = [None] + sorted(self.game_logic.categories)
+        selected = 0
+        self._set_pane("header", [("CompTIA Linux+ Study Game", "header")])
+        self._set_pane("score", [(f"Questions loaded: {self.game_logic.count_questions()}", "dim")])
+        self._set_pane("question", [("Choose a category", "bold"), ("Up/Down to move, Enter to start, q to quit.", "dim")])
+        self._set_pane("options", [])
+        while True:
+            rows = self.windows["feedback"].getmaxyx()[0]
+            first = max(0, min(selected - rows // 2, len(categories) - rows))
+            lines = []
+            for position in range(first, min(first + rows, len(categories))):
+                label = categories[position] or "All Categories"
+                lines.append((f"{'>' if position == selected else ' '} {label}", "select" if position == selected else "normal"))
+            self._set_pane("feedback", lines)
+            self._set_pane("prompt", [("Enter: start quiz   q: quit", "info")])
+            key = self._read_key()
+            if key == ord('q'):
+                return False
+            if key in (curses.KEY_UP, ord('k')):
+                selected = (selected - 1) % len(categories)
+            elif key in (curses.KEY_DOWN, ord('j')):
+                selected = (selected + 1) % len(categories)
+            elif key in (curses.KEY_ENTER, 10, 13):
+                return categories[selected]
+
+    def _show_score(self):
+        game = self.game_logic
+        accuracy = f"  ({game.score / game.total_questions_session * 100:.0f}%)" if game.total_questions_session else ""
+        self._set_pane("score", [(f"Score: {game.score} / {game.total_questions_session}{accuracy}", "bold")])
+
+    def _run_session(self, category_filter):
+        """One standard-mode quiz session: immediate feedback, history and replay log as in run_quiz."""
+        game = self.game_logic
+        game.score = 0
+        game.total_questions_session = 0
+        game.answered_indices_session = []
+        total = game.count_questions(category_filter)
+        game.start_replay_session(category_filter, QUIZ_MODE_STANDARD)
+        category_display = category_filter or "All Categories"
+        question_number = 0
+        while True:
+            question_data, original_index = game.select_question(category_filter)
+            if question_data is None or len(question_data) < 5:
+                break
+            question_number += 1
+            question_text, options, correct_index, category, explanation = question_data
+            self._set_pane("header", [(f"Quiz: {category_display}  |  Question {question_number} / {total}", "header")])
+            self._show_score()
+            self._set_pane("question", [(f"[{category}]", "dim"), (question_text, "bold")])
+            self._set_pane("options", [(f"{number}. {option}", "normal") for number, option in enumerate(options, start=1)])
+            self._set_pane("feedback", [])
+            self._set_pane("prompt", [(f"1-{len(options)}: answer   s: skip   q: end session", "info")])
+            shown_at = time.perf_counter()
+            while True:
+                key = self._read_key()
+                if key in (ord('q'), ord('s')) or ord('1') <= key < ord('1') + len(options):
+                    break
+            if key == ord('q'):
+                break
+            if key == ord('s'):
+                game.record_replay_step(original_index, 's')
+                continue
+            answer_index = key - ord('1')
+            answer_time = time.perf_counter() - shown_at
+            is_correct = answer_index == correct_index
+            game.record_replay_step(original_index, answer_index)
+            game.update_history(game.questions[original_index][0], category, is_correct, answer_time=answer_time)
+            game.total_questions_session += 1
+            if is_correct:
+                game.score += 1
+            # Mark the chosen/correct options in place; only the options, score and feedback panes change
+            option_lines = []
+            for number, option in enumerate(options, start=1):
+                attr = "correct" if number - 1 == correct_index else ("incorrect" if number - 1 == answer_index else "normal")
+                option_lines.append((f"{number}. {option}", attr))
+            self._set_pane("options", option_lines)
+            self._show_score()
+            if is_correct:
+                feedback = [("Correct!", "correct")]
+            else:
+                feedback = [(f"Incorrect. Correct answer: {correct_index + 1}. {options[correct_index]}", "incorrect")]
+            if explanation:
+                feedback += [("", "normal"), ("Explanation:", "bold")] + [(line, "dim") for line in explanation.split("\n")]
+            self._set_pane("feedback", feedback)
+            self._set_pane("prompt", [("Any key: next question   q: end session", "info")])
+            if self._read_key() == ord('q'):
+                break
+        game.finish_replay_session()
+        game.save_history()
+        summary = f"Session finished: {game.score} / {game.total_questions_session} correct." if game.total_questions_session else "Session finished: no questions answered."
+        self._set_pane("feedback", [(summary, "bold")])
+        self._set_pane("prompt", [("Any key: back to categories", "info")])
+        self._read_key()
+
+
+# --- Command-Line Options ---
+def parse_command_line(argv=None):
+    """Parse the optional interface choice and tooling flags."""
+    parser = argparse.ArgumentParser(description="CompTIA Linux+ Study Game")
+    parser.add_argument("interface", nargs="?", type=str.lower, choices=["cli", "gui", "curses"],
+                        help="Interface to launch: cli, gui or curses (full-screen CLI); asks interactively if omitted")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_REPORT_FILE, default=None, metavar="REPORT_FILE",
+                        help=f"Time every menu action / GUI command and write a report on exit (default: {PROFILE_REPORT_FILE})")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="With --profile, also capture cProfile data and list the top functions")
+    parser.add_argument("--stall-monitor", nargs="?", const=STALL_REPORT_FILE, default=None, metavar="REPORT_FILE",
+                        help=f"GUI: record event-loop stalls per command handler and write a report on quit (default: {STALL_REPORT_FILE})")
+    parser.add_argument("--stall-threshold", type=float, default=STALL_THRESHOLD_MS, metavar="MS",
+                        help=f"With --stall-monitor, how late a heartbeat must be to count as a stall (default: {STALL_THRESHOLD_MS})")
+    parser.add_argument("--max-block", type=float, default=None, metavar="MS",
+                        help="With --stall-monitor, list every handler call that blocked the event loop longer than MS")
+    parser.add_argument("--packs", default=QUESTION_PACKS_DIR, metavar="DIR",
+                        help=f"Directory of extra question pack files to merge in (default: {QUESTION_PACKS_DIR})")
+    parser.add_argument("--bank", default=QUESTION_BANK_DIR, metavar="DIR",
+                        help=f"Segmented question bank loaded per category on demand, if present (default: {QUESTION_BANK_DIR})")
+    parser.add_argument("--history", default=HISTORY_FILE, metavar="FILE",
+                        help=f"Study history file; a .gz/.xz name is stored compressed (default: {HISTORY_FILE}; "
+                             f"an older version's {LEGACY_HISTORY_FILE} is imported and left unchanged)")
+    parser.add_argument("--history-codec", choices=list(HISTORY_CODECS), default=None,
+                        help="Compression for saving the history regardless of its extension (reading detects it)")
+    parser.add_argument("--codec-benchmark", nargs="?", type=int, const=CODEC_BENCHMARK_QUESTIONS, default=None, metavar="QUESTIONS",
+                        help=f"Compare history size and save/load time per codec on a synthetic history and exit "
+                             f"(default: {CODEC_BENCHMARK_QUESTIONS} questions)")
+    parser.add_argument("--migrate-history", default=None, metavar="SOURCE",
+                        help="Convert a history file from any earlier version (d.py, d2.py, dV3-dV8) in one streaming pass and exit")
+    parser.add_argument("--migrate-output", default=None, metavar="FILE",
+                        help="Output of --migrate-history; .gz/.xz names are compressed (default: SOURCE name + .migrated.jsonl / .ids.jsonl)")
+    parser.add_argument("--migrate-schema", choices=MIGRATE_SCHEMAS, default="current",
+                        help="current: the layout this version loads; ids: records keyed by a question-text hash ID")
+    parser.add_argument("--weak-accuracy", type=float, default=WEAK_SPOT_ACCURACY * 100, metavar="PERCENT",
+                        help=f"Weak spots: questions below this accuracy are weak (default: {WEAK_SPOT_ACCURACY * 100:.0f})")
+    parser.add_argument("--weak-recent", type=int, default=WEAK_SPOT_RECENT_ATTEMPTS, metavar="N",
+                        help=f"Weak spots: a miss within the last N answers also makes a question weak, 0 disables; "
+                             f"at most {WEAK_SPOT_MASK_BITS} (default: {WEAK_SPOT_RECENT_ATTEMPTS})")
+    parser.add_argument("--keys", action="store_true",
+                        help="CLI single-keypress mode: answer with 1-9/s/q and continue with any key, no Enter needed")
+    parser.add_argument("--pace", type=float, default=1.0, metavar="SCALE",
+                        help="Scale the pauses after messages and verify answers (0 = none; CLI pauses end on any key)")
+    parser.add_argument("--fast", action="store_true",
+                        help="Never pause between questions or after messages (same as --pace 0)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed the question shuffle and selection RNG for a reproducible run")
+    parser.add_argument("--replay-log", default=REPLAY_LOG_FILE, metavar="FILE",
+                        help=f"Append a replay record for every quiz session to FILE, rotated to FILE.1 past "
+                             f"{REPLAY_LOG_MAX_BYTES // (1024 * 1024)} MB; '' disables (default: {REPLAY_LOG_FILE})")
+    parser.add_argument("--replay", default=None, metavar="FILE",
+                        help="Re-run the sessions in a replay log through the engine without UI, then exit")
+    parser.add_argument("--exam-forms", type=int, default=None, metavar="COUNT",
+                        help="Write COUNT stratified mock exam forms (with answer keys) and exit")
+    parser.add_argument("--exam-dir", default=EXAM_FORMS_DIR, metavar="DIR",
+                        help=f"Output directory for --exam-forms (default: {EXAM_FORMS_DIR})")
+    parser.add_argument("--exam-size", type=int, default=EXAM_FORM_SIZE, metavar="N",
+                        help=f"Questions per exam form (default: {EXAM_FORM_SIZE})")
+    parser.add_argument("--exam-seed", type=int, default=None, metavar="SEED",
+                        help="Base seed for --exam-forms so the same forms can be regenerated")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="Worker processes for parallel tooling (default: CPU count)")
+    parser.add_argument("--compiled-bank", default=COMPILED_BANK_FILE, metavar="FILE",
+                        help=f"Compiled question bank loaded at startup when present; '' disables (default: {COMPILED_BANK_FILE})")
+    parser.add_argument("--compile-bank", nargs="?", const=COMPILED_BANK_FILE, default=None, metavar="FILE",
+                        help="Lint and deduplicate the built-in questions, packs and --compile-source files, "
+                             "write a compiled bank to FILE and exit (status 1 if any entry was rejected)")
+    parser.add_argument("--compile-source", action="append", default=[], metavar="FILE",
+                        help="Extra JSON question file for --compile-bank (same layout as a pack; repeatable)")
+    parser.add_argument("--search", default=None, metavar="QUERY",
+                        help="List the questions whose text or options contain every word of QUERY and exit "
+                             "(uses the compiled bank's search index when one is loaded)")
+    parser.add_argument("--extract-questions", nargs="?", const=EXTRACT_OUTPUT_FILE, default=None, metavar="FILE",
+                        help="Harvest the literal question lists of every game version next to this script (d.py, d2.py, "
+                             f"dV*.py, testd*.py) without importing them, merge them into FILE and exit (default: {EXTRACT_OUTPUT_FILE})")
+    parser.add_argument("--extract-from", action="append", default=[], metavar="FILE",
+                        help="With --extract-questions, read these files (in this priority order) instead (repeatable)")
+    parser.add_argument("--build-bank", nargs="?", const=QUESTION_BANK_DIR, default=None, metavar="DIR",
+                        help="Write all loaded questions as a segmented bank to DIR and exit")
+    parser.add_argument("--gui-check", action="store_true",
+                        help="Open, close and reopen each GUI window (start dialog, stats, review, verify results) "
+                             "against a throwaway history, report problems and exit (needs a display, e.g. xvfb-run)")
+    return parser.parse_args(argv)
+
+
 # --- Main Execution Block ---
 if __name__ == "__main__":
     # --- Keep colorama init ---
@@ -6662,18 +10361,173 @@ if __name__ == "__main__":
         except Exception as e:
              print(f"Warning: Failed to initialize colorama: {e}")
 
+    cli_args = parse_command_line()
+    profiler = PerformanceProfiler(enabled=cli_args.profile is not None, use_cprofile=cli_args.cprofile,
+                                   report_file=cli_args.profile or PROFILE_REPORT_FILE)
+    atexit.register(profiler.write_report) # Runs on sys.exit() from the CLI and after the GUI main loop
+
+    if cli_args.replay:
+        # One engine per logged engine seed, so question order matches the recorded run
+        replay_engines = {}
+        session_total = step_total = diverged_sessions = 0
+        try:
+            for session_number, record in enumerate(read_replay_log(cli_args.replay), 1):
+                engine_seed = record.get("engine_seed")
+                if engine_seed not in replay_engines:
+                    replay_engines[engine_seed] = LinuxPlusStudyGame(profiler=profiler, packs_dir=cli_args.packs,
+                                                                     bank_dir=cli_args.bank, seed=engine_seed, replay_log_file=None,
+                                                                     compiled_bank_file=cli_args.compiled_bank or None)
+                replayed, diverged, elapsed = replay_engines[engine_seed].replay_session_record(record)
+                label = f"Session {session_number} ({record.get('category') or 'All Categories'}, {record.get('mode')})"
+                if diverged:
+                    # Not counted as a run: its timing does not cover the logged workload
+                    print(f"{COLOR_ERROR} {label}: selection diverged at step {replayed + 1} of {replayed + diverged}; "
+                          f"replay stopped, timing not comparable. {COLOR_RESET}")
+                    diverged_sessions += 1
+                    continue
+                per_step = (elapsed / replayed * 1e6) if replayed else 0.0
+                print(f"{label}: {replayed} steps, {COLOR_STATS_ACC_GOOD}identical{COLOR_RESET}, "
+                      f"{elapsed * 1000:.2f} ms ({per_step:.1f} us/step)")
+                session_total += 1
+                step_total += replayed
+        except IOError as e:
+            print(f"{COLOR_ERROR} Error reading replay log '{cli_args.replay}': {e} {COLOR_RESET}")
+            sys.exit(1)
+        print(f"Replayed {session_total} sessions, {step_total} steps; {diverged_sessions} sessions diverged.")
+        sys.exit(1 if diverged_sessions else 0) # A diverging replay is a failed check, whatever the mode
+
+    if cli_args.extract_questions:
+        start = time.perf_counter()
+        source_files = cli_args.extract_from or extract_source_files(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            summary = extract_question_banks(source_files, cli_args.extract_questions, max_workers=cli_args.workers)
+        except IOError as e:
+            print(f"{COLOR_ERROR} Error writing '{cli_args.extract_questions}': {e} {COLOR_RESET}")
+            sys.exit(1)
+        for error in summary["errors"]:
+            print(f"{COLOR_WARNING} Skipped: {error} {COLOR_RESET}")
+        for file_path, counts in summary["files"].items():
+            print(f"  {counts['found']:>5} questions, {counts['new']:>5} new  {file_path}")
+        print(f"Wrote {summary['questions']} unique questions ({summary['variants']} with edited variants in other versions) "
+              f"from {len(summary['files'])} files to {os.path.abspath(cli_args.extract_questions)} in {time.perf_counter() - start:.2f}s")
+        sys.exit(0)
+
     # --- Keep game_engine creation ---
-    game_engine = LinuxPlusStudyGame()
+    game_engine = LinuxPlusStudyGame(profiler=profiler, packs_dir=cli_args.packs, bank_dir=cli_args.bank,
+                                     seed=cli_args.seed, replay_log_file=cli_args.replay_log or None,
+                                     history_file=cli_args.history, history_codec=cli_args.history_codec,
+                                     compiled_bank_file=cli_args.compiled_bank or None,
+                                     weak_accuracy=cli_args.weak_accuracy / 100, weak_recent_attempts=cli_args.weak_recent)
+    game_engine.raw_keys = game_engine.pacer.keep_keys = cli_args.keys
+    game_engine.pacer.scale = 0.0 if cli_args.fast else max(0.0, cli_args.pace)
+
+    if cli_args.migrate_history:
+        output_path = cli_args.migrate_output
+        if not output_path:
+            base = cli_args.migrate_history
+            for extension in list(HISTORY_CODEC_EXTENSIONS) + [".jsonl", ".json"]:
+                if base.lower().endswith(extension):
+                    base = base[:-len(extension)]
+            output_path = base + (".ids.jsonl" if cli_args.migrate_schema == "ids" else ".migrated.jsonl")
+        game_engine.ensure_category_loaded(None) # Full question texts for matching d.py's abbreviated ones
+        start = time.perf_counter()
+        try:
+            summary = migrate_history(cli_args.migrate_history, output_path, schema=cli_args.migrate_schema,
+                                      question_texts=[q[0] for q in game_engine.questions])
+        except (IOError, ValueError, EOFError, lzma.LZMAError) as e: # JSONDecodeError is a ValueError
+            print(f"{COLOR_ERROR} Could not migrate '{cli_args.migrate_history}': {e} {COLOR_RESET}")
+            sys.exit(1)
+        print(f"Detected {summary['format']}: {summary['questions']} questions, {summary['attempts']} attempts, "
+              f"{summary['sessions']} sessions.")
+        if not summary["questions"]:
+            print(f"{COLOR_WARNING} '{cli_args.migrate_history}' holds no question records; the output is an empty history. {COLOR_RESET}")
+        if summary["unmatched"] or summary["ambiguous"]:
+            print(f"{COLOR_WARNING} {summary['unmatched']} d.py records matched no known question and "
+                  f"{summary['ambiguous']} matched several; they were kept under their abbreviated text. {COLOR_RESET}")
+        print(f"Wrote {cli_args.migrate_schema} schema to {os.path.abspath(output_path)} in {time.perf_counter() - start:.2f}s")
+        sys.exit(0)
+
+    if cli_args.codec_benchmark:
+        print(f"History codec benchmark: {cli_args.codec_benchmark} questions x {CODEC_BENCHMARK_ATTEMPTS} attempts")
+        print(f"{'Codec':<8} {'Size (MB)':>10} {'Save (s)':>9} {'Startup (s)':>12} {'Full load (s)':>14}")
+        for codec, size, save_seconds, startup_seconds, full_seconds in game_engine.benchmark_history_codecs(cli_args.codec_benchmark):
+            print(f"{codec:<8} {size / 1e6:>10.2f} {save_seconds:>9.3f} {startup_seconds:>12.3f} {full_seconds:>14.3f}")
+        sys.exit(0)
+
+    if cli_args.gui_check:
+        # Throwaway history and no replay log, so the check never touches the real files
+        check_dir = tempfile.mkdtemp()
+        game_engine.release_history()
+        game_engine.history_file = os.path.join(check_dir, HISTORY_FILE)
+        game_engine.replay_log_file = None
+        game_engine.study_history = game_engine._default_history()
+        game_engine.ensure_category_loaded(None)
+        question = game_engine.questions[0]
+        game_engine.update_history(question[0], question[3], False) # Gives the review window an entry
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            print(f"{COLOR_ERROR} Cannot open a display for the GUI check: {e} {COLOR_RESET}")
+            sys.exit(1)
+        app = LinuxPlusStudyGUI(root, game_engine)
+        app.gui_verify_session_answers.append((question, question[2], True))
+        app.gui_verify_session_answers.append((question, (question[2] + 1) % len(question[1]), False))
+        results = app.check_windows()
+        root.destroy()
+        shutil.rmtree(check_dir, ignore_errors=True)
+        for name, problem in results:
+            print(f"  {name:<16} {problem or 'opened, closed and reopened'}")
+        sys.exit(1 if any(problem for _, problem in results) else 0)
+
+    if cli_args.compile_bank:
+        start = time.perf_counter()
+        summary = game_engine.compile_question_bank(cli_args.compile_bank, cli_args.compile_source, max_workers=cli_args.workers)
+        for error in summary["errors"]:
+            print(f"{COLOR_WARNING} Rejected: {error} {COLOR_RESET}")
+        for text, kept, dropped in summary["duplicates"]:
+            print(f"{COLOR_INFO} Duplicate dropped: {dropped} repeats {kept} (\"{text[:60]}\") {COLOR_RESET}")
+        source_text = ", ".join(f"{source}: {count}" for source, count in summary["sources"].items())
+        print(f"Read {summary['read']} entries ({source_text}); rejected {len(summary['errors'])}, "
+              f"dropped {len(summary['duplicates'])} duplicates.")
+        print(f"Wrote {summary['questions']} questions in {summary['categories']} categories ({summary['tokens']} search terms, "
+              f"{summary['bytes'] / 1024:.0f} KiB) to {os.path.abspath(cli_args.compile_bank)} in {time.perf_counter() - start:.2f}s")
+        sys.exit(1 if summary["errors"] else 0)
+
+    if cli_args.search:
+        start = time.perf_counter()
+        matches = game_engine.search_questions(cli_args.search)
+        elapsed = time.perf_counter() - start
+        for number, (question_text, options, correct_index, category, _) in enumerate(matches, start=1):
+            print(f"{COLOR_OPTION_NUM}{number:>4}.{COLOR_RESET} {COLOR_CATEGORY}[{category}]{COLOR_RESET} {question_text}")
+            print(f"       {COLOR_EXPLANATION}Answer: {options[correct_index]}{COLOR_RESET}")
+        source = "compiled bank index" if game_engine.compiled_bank is not None else "loaded questions"
+        print(f"{len(matches)} questions match '{cli_args.search}' (searched the {source} in {elapsed:.3f}s)")
+        sys.exit(0)
+
+    if cli_args.build_bank:
+        question_count, category_count = game_engine.write_question_bank(cli_args.build_bank)
+        print(f"Wrote {question_count} questions in {category_count} category segments to {os.path.abspath(cli_args.build_bank)}")
+        sys.exit(0)
+
+    if cli_args.exam_forms:
+        start = time.perf_counter()
+        form_total, quotas, seed = game_engine.generate_exam_forms(cli_args.exam_forms, output_dir=cli_args.exam_dir,
+                                                                   seed=cli_args.exam_seed, form_size=cli_args.exam_size,
+                                                                   max_workers=cli_args.workers)
+        quota_text = ", ".join(f"{domain}: {count}" for domain, count in quotas.items())
+        print(f"Wrote {form_total} exam forms to {os.path.abspath(cli_args.exam_dir)} in {time.perf_counter() - start:.2f}s (seed {seed})")
+        print(f"Questions per domain: {quota_text}")
+        sys.exit(0)
 
     # --- Keep interface choice logic ---
     interface_choice = ""
     # Detect if running in a non-interactive environment (e.g., pipe, redirect, some IDEs)
-    # Also check if arguments were passed (e.g., `python script.py cli`)
-    force_cli = not sys.stdin.isatty() or len(sys.argv) > 1
+    # Also check if an interface was passed (e.g., `python script.py cli`)
+    force_cli = not sys.stdin.isatty() or cli_args.interface is not None
 
     if force_cli:
-         if len(sys.argv) > 1 and sys.argv[1].lower() == 'gui':
-              interface_choice = 'gui' # Allow forcing GUI via arg
+         if cli_args.interface in ('gui', 'curses'):
+              interface_choice = cli_args.interface # Allow forcing GUI / curses via arg
          else:
               # print("Non-interactive environment or arguments detected. Defaulting to CLI.") # Optional print
               interface_choice = 'cli'
@@ -6710,7 +10564,10 @@ if __name__ == "__main__":
     if interface_choice == 'gui':
         try:
             root = tk.Tk()
-            app = LinuxPlusStudyGUI(root, game_engine)
+            stall_monitor = StallMonitor(enabled=cli_args.stall_monitor is not None, threshold_ms=cli_args.stall_threshold,
+                                         report_file=cli_args.stall_monitor or STALL_REPORT_FILE, max_block_ms=cli_args.max_block)
+            atexit.register(stall_monitor.write_report) # Also written when the GUI exits through sys.exit() or an error
+            app = LinuxPlusStudyGUI(root, game_engine, stall_monitor=stall_monitor)
             # Ensure quit command saves history
             root.protocol("WM_DELETE_WINDOW", app._quit_app)
             root.mainloop()
@@ -6730,7 +10587,19 @@ if __name__ == "__main__":
             print("Attempting to save history...")
             game_engine.save_history()
             sys.exit(1)
+    elif interface_choice == 'curses' and curses is not None and sys.stdin.isatty():
+        try:
+            curses.wrapper(CursesQuizFrontend(game_engine).run)
+        except KeyboardInterrupt:
+            game_engine.finish_replay_session()
+            game_engine.save_history()
+        except curses.error as e:
+            print(f"{COLOR_ERROR} Curses interface failed ({e}); try the 'cli' interface. {COLOR_RESET}")
+            game_engine.save_history()
+            sys.exit(1)
     else: # CLI Mode
+        if interface_choice == 'curses':
+            print(f"{COLOR_WARNING} Curses is unavailable (no terminal or module); using the standard CLI. {COLOR_RESET}")
         try:
             game_engine.display_welcome_message()
             game_engine.main_menu()